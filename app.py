@@ -1,77 +1,98 @@
 import streamlit as st
 import pandas as pd
-import json
-import requests
-from streamlit_lottie import st_lottie
-import os
-from io import BytesIO
 
-# Page configuration
-st.set_page_config(
+from core import app_data
+from core.app_data import filter_positions, find_duplicates, get_all_categories, search_positions
+from core.assets import ASSETS
+from core.cards import build_cards_html, page_bounds
+from core.export import XLSX_MIME, deferred_download, write_excel
+from core.notify import watch
+from core.profiling import render_sidebar, start_run
+
+# Page configuration (applied in main, so importing this module has no side effects)
+PAGE_CONFIG = dict(
     page_title="AI Tool Dashboard",
     page_icon="🤖",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
-# Function to load Lottie animations
-def load_lottie_url(url):
-    try:
-        r = requests.get(url)
-        if r.status_code != 200:
-            return None
-        return r.json()
-    except:
-        return None
+# Storage backend for the tool list (AI_TOOLS_BACKEND=csv|sqlite); data functions live in core.app_data
+STORE = app_data.open_tool_store()
+SEARCH = app_data.open_search(STORE) # Full-text index over name and categories, persisted next to the data
+LINKS = app_data.open_link_health(STORE) # Website checks, run in a background thread
+
+# Function to load Lottie animations (loaded once per process, URL assets cached on disk)
+def load_lottie_url(url, fallback=None):
+    return ASSETS.load_url(url, fallback, block=False)
 
 def load_lottie_file(filepath):
+    animation = ASSETS.load_file(filepath)
+    if animation is None:
+        st.error(f"Error loading animation: {filepath}")
+    return animation
+
+# Function to load data; served from memory until the store's data version changes
+def load_data(version):
     try:
-        with open(filepath, "r") as f:
-            return json.load(f)
+        return app_data.load_data(STORE, version)
     except Exception as e:
-        st.error(f"Error loading animation: {e}")
+        st.error(f"Error loading data: {e}")
+        return pd.DataFrame(columns=app_data.COLUMNS)
+
+# Function to add or update a single tool; the read-modify-write runs under the store's write lock
+def upsert_tool(name, website, categories):
+    # The UpsertResult (result.updated: an existing tool was edited), or None on failure
+    try:
+        return app_data.upsert_tool(STORE, name, website, categories, search=SEARCH) # Also patches the indexes in place
+    except Exception as e:
+        st.error(f"Error saving data: {e}")
         return None
 
-# Function to load data
-@st.cache_data(ttl=5)  # Cache with 5 second time-to-live for auto refresh
-def load_data():
+# Function to rebuild the catalog as of a past day from the change log
+def catalog_as_of(day):
     try:
-        df = pd.read_csv("data/ai_tools.csv")
-        return df
+        return app_data.catalog_as_of(STORE, day)
     except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return pd.DataFrame(columns=["name", "website", "categories"])
+        st.error(f"Error loading history: {e}")
+        return pd.DataFrame(columns=app_data.COLUMNS)
 
-# Function to save data
-def save_data(df):
+# Function to get the first day the change log covers
+def history_start():
     try:
-        df.to_csv("data/ai_tools.csv", index=False)
-        # Clear the cache to force a reload of the data
-        load_data.clear()
-        return True
+        return app_data.history_start(STORE)
     except Exception as e:
-        st.error(f"Error saving data: {e}")
-        return False
+        st.error(f"Error loading history: {e}")
+        return None
+
+# Function to list a tool's logged adds and updates
+def tool_changes(name):
+    try:
+        return app_data.tool_changes(STORE, name)
+    except Exception as e:
+        st.error(f"Error loading history: {e}")
+        return pd.DataFrame(columns=["When", "Change", "Fields"])
+
+# Function to get the category index, built once per data version
+def get_category_index(version, df):
+    return app_data.get_category_index(STORE, version, df)
 
-# Function to get all unique categories
-@st.cache_data
-def get_all_categories(df):
-    all_categories = []
-    for cats in df["categories"].dropna():
-        categories = cats.split("|")
-        all_categories.extend(categories)
-    return sorted(list(set(all_categories)))
+# Function to get the duplicate index (normalized names, canonical URLs, name trigrams), built once per data version
+def get_duplicate_index(version, df):
+    return app_data.get_duplicate_index(STORE, version, df)
 
-# Function to convert dataframe to Excel
-def to_excel(df):
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='AI Tools')
-    processed_data = output.getvalue()
-    return processed_data
+# Function to convert dataframe to Excel; built only when Download is clicked, once per data version
+def to_excel(df, version):
+    return deferred_download("app.excel", version, lambda f: write_excel(df, f, sheet_name="AI Tools"), ".xlsx")
 
 # Main app
 def main():
+    st.set_page_config(**PAGE_CONFIG)
+    from streamlit_lottie import st_lottie # Component registration deferred until the page is built
+
+    # Render profiling (AI_TOOLS_PROFILE=1 or ?profile=1); a no-op stand-in when off
+    profile = start_run("app", force=st.query_params.get("profile") == "1")
+
     # Custom CSS
     st.markdown("""
     <style>
@@ -94,10 +115,21 @@ def main():
         margin-bottom: 1rem;
         transition: transform 0.3s ease, box-shadow 0.3s ease;
     }
+    .card-grid {
+        display: grid;
+        gap: 1rem;
+    }
+    @media (max-width: 768px) {
+        .card-grid { grid-template-columns: 1fr !important; }
+    }
     .card:hover {
         transform: translateY(-5px);
         box-shadow: 0 0.5rem 1rem rgba(0, 0, 0, 0.15);
     }
+    .dead-link {
+        color: #C62828;
+        font-size: 0.9rem;
+    }
     .success-message {
         padding: 1rem;
         border-radius: 0.5rem;
@@ -126,9 +158,13 @@ def main():
     """, unsafe_allow_html=True)
     
     # Load Lottie animations
-    lottie_robot = load_lottie_file('assets/lottie/robot.json')
-    lottie_loading = load_lottie_file('assets/lottie/loading.json')
-    lottie_success = load_lottie_file('assets/lottie/success.json')
+    # Writes by other replicas refresh this process' data once per change, off the render path
+    watch(STORE).subscribe("app", lambda before, after: app_data.load_data(STORE, after))
+    with profile.phase("assets"):
+        ASSETS.prefetch()  # No-op after the first run in this process
+        lottie_robot = load_lottie_file('assets/lottie/robot.json')
+        lottie_loading = load_lottie_file('assets/lottie/loading.json')
+        lottie_success = load_lottie_file('assets/lottie/success.json')
     
     # Header with title and animation
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -142,16 +178,23 @@ def main():
             st_lottie(lottie_robot, height=150, key="robot2")
     
     # Load data
-    df = load_data()
+    with profile.phase("load_data"):
+        data_version = STORE.version()
+        df = load_data(data_version)
+    with profile.phase("category_index"):
+        category_index = get_category_index(data_version, df)
     
     # Create tabs for different sections
-    tab1, tab2 = st.tabs(["📋 AI Tools", "➕ Add/Update Tool"])
+    tab1, tab2, tab3 = st.tabs(["📋 AI Tools", "➕ Add/Update Tool", "🕓 History"])
     
     with tab1:
         st.markdown('<h2 class="subheader">AI Tool Explorer</h2>', unsafe_allow_html=True)
         
         # Get all categories for filtering
-        all_categories = get_all_categories(df)
+        all_categories = get_all_categories(category_index)
+        
+        # Text search (ranked; the last word matches as a prefix, so results update while typing)
+        query = st.text_input("🔍 Search tools", placeholder="Search by name or category, e.g. image gen")
         
         # Category filter
         st.markdown("### Filter by Categories")
@@ -160,43 +203,60 @@ def main():
             options=all_categories,
             default=[]
         )
+        match_mode = st.radio(
+            "Match tools with:",
+            options=["Any selected category", "All selected categories"],
+            horizontal=True
+        )
+        
+        # Filter data based on selected categories (multi-hot mask of the category index)
+        with profile.phase("filter"):
+            match = ("all" if match_mode.startswith("All") else "any") if selected_categories else None
+            positions = filter_positions(category_index, selected_categories, match)
+        if query.strip():
+            with profile.phase("search"):
+                allowed = set(positions) if selected_categories else None
+                positions = [p for p in search_positions(SEARCH, query, rows=len(df)) if allowed is None or p in allowed]
         
-        # Filter data based on selected categories
-        if selected_categories:
-            filtered_df = df[df["categories"].apply(
-                lambda x: any(cat in str(x).split("|") for cat in selected_categories)
-            )]
-        else:
-            filtered_df = df
+        # Back to the first page whenever the filter changes
+        filter_key = (tuple(selected_categories), match, query.strip())
+        if st.session_state.get("tool_filter_key") != filter_key:
+            st.session_state.tool_filter_key = filter_key
+            st.session_state.tool_page = 0
         
         # Display filtered tools
-        st.markdown(f"### Showing {len(filtered_df)} AI Tools")
+        st.markdown(f"### Showing {len(positions)} AI Tools")
         
-        # Create columns for better display
-        cols = st.columns(3)
+        # Pagination controls; only the visible page of cards is built and sent to the browser
+        nav1, nav2, nav3, nav4 = st.columns([1, 2, 1, 1])
+        page_size = nav4.selectbox("Cards per page", options=[12, 24, 48], index=0, key="tool_page_size")
+        page, page_count, start, stop = page_bounds(len(positions), st.session_state.get("tool_page", 0), page_size)
+        if nav1.button("◀ Previous", disabled=page == 0, key="tool_page_prev"):
+            page -= 1
+        if nav3.button("Next ▶", disabled=page >= page_count - 1, key="tool_page_next"):
+            page += 1
+        page, page_count, start, stop = page_bounds(len(positions), page, page_size)
+        st.session_state.tool_page = page
+        nav2.markdown(f"Page **{page + 1}** of **{page_count}**")
         
-        # Display tools in cards
-        for i, (_, row) in enumerate(filtered_df.iterrows()):
-            col_idx = i % 3
-            with cols[col_idx]:
-                st.markdown(f"""
-                <div class="card">
-                    <h3>{row['name']}</h3>
-                    <p><a href="{row['website']}" target="_blank">{row['website']}</a></p>
-                    <p><strong>Categories:</strong> {row['categories'].replace('|', ', ')}</p>
-                </div>
-                """, unsafe_allow_html=True)
+        # Display tools in cards (one HTML block per page)
+        with profile.phase("cards_html"):
+            page_df = df.iloc[list(positions[start:stop])]
+            LINKS.refresh() # Non-blocking; cards show the results known so far
+            dead_links = app_data.dead_link_reasons(LINKS, page_df["website"])
+            cards_html = build_cards_html(page_df, columns=3, dead_links=dead_links)
+        profile.size("cards_html", len(cards_html))
+        st.markdown(cards_html, unsafe_allow_html=True)
         
         # Download button with animation
         st.markdown("### Download AI Tool List")
         col1, col2 = st.columns([3, 1])
         with col1:
-            excel_data = to_excel(df)
             st.download_button(
                 label="📥 Download as Excel",
-                data=excel_data,
+                data=to_excel(df, data_version),
                 file_name="ai_tools.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                mime=XLSX_MIME,
                 key="download_button"
             )
         with col2:
@@ -212,7 +272,7 @@ def main():
             website = st.text_input("Website URL")
             
             # Category selection with option to add new
-            existing_categories = get_all_categories(df)
+            existing_categories = get_all_categories(category_index)
             selected_cats = st.multiselect(
                 "Select Categories",
                 options=existing_categories,
@@ -221,16 +281,24 @@ def main():
             
             # Option to add new category
             new_category = st.text_input("Add New Category (optional)")
+            save_anyway = st.checkbox("Save even if it looks like a duplicate")
             
             submitted = st.form_submit_button("Save Tool")
             
             if submitted:
+                duplicate_index = get_duplicate_index(data_version, df)
+                duplicates = find_duplicates(duplicate_index, tool_name, website) if tool_name else []
                 if not tool_name or not website:
                     st.error("Tool name and website are required!")
+                elif duplicates and not save_anyway:
+                    reasons = {"name": "same name", "url": "same website", "similar": "similar name"}
+                    st.warning("This looks like a tool that is already listed:\n\n" + "\n".join(
+                        f"- **{match.name}** ({match.url}) – {reasons[match.reason]}" for match in duplicates
+                    ) + "\n\nCheck **Save even if it looks like a duplicate** to save it anyway.")
                 else:
                     # Show loading animation
+                    loading_placeholder = st.empty()
                     if lottie_loading:
-                        loading_placeholder = st.empty()
                         with loading_placeholder:
                             st_lottie(lottie_loading, height=100, key="saving_animation")
                     
@@ -241,44 +309,49 @@ def main():
                     
                     categories_str = "|".join(final_categories)
                     
-                    # Check if tool already exists
-                    existing_tool = df[df["name"] == tool_name]
-                    
-                    success = False
-                    if len(existing_tool) > 0:
-                        # Update existing tool
-                        df.loc[df["name"] == tool_name, ["website", "categories"]] = [website, categories_str]
-                        success = save_data(df)
-                        if success:
-                            # Replace loading with success animation
-                            loading_placeholder.empty()
-                            if lottie_success:
-                                with st.container():
-                                    st_lottie(lottie_success, height=100, key="success_animation")
-                            st.success(f"Updated {tool_name} successfully!")
-                    else:
-                        # Add new tool
-                        new_row = pd.DataFrame({
-                            "name": [tool_name],
-                            "website": [website],
-                            "categories": [categories_str]
-                        })
-                        df = pd.concat([df, new_row], ignore_index=True)
-                        success = save_data(df)
-                        if success:
-                            # Replace loading with success animation
-                            loading_placeholder.empty()
-                            if lottie_success:
-                                with st.container():
-                                    st_lottie(lottie_success, height=100, key="success_animation")
-                            st.success(f"Added {tool_name} successfully!")
+                    # Adds the tool, or updates the one with the same name
+                    result = upsert_tool(tool_name, website, categories_str)
+                    if result is not None:
+                        # Replace loading with success animation
+                        loading_placeholder.empty()
+                        if lottie_success:
+                            with st.container():
+                                st_lottie(lottie_success, height=100, key="success_animation")
+                        st.success(f"{'Updated' if result.updated else 'Added'} {tool_name} successfully!")
                     
                     # Rerun to refresh the data after a short delay
-                    if success:
+                    if result is not None:
                         import time
                         time.sleep(1.5)  # Give time to see the success animation
                         st.rerun()
 
+    with tab3:
+        st.markdown('<h2 class="subheader">Catalog History</h2>', unsafe_allow_html=True)
+        
+        # Point-in-time view: nearest snapshot plus the logged changes after it
+        today = pd.Timestamp.now().date()
+        history_day = st.date_input("Show the catalog as of", value=today, max_value=today, key="history_day")
+        with profile.phase("history"):
+            past_df = catalog_as_of(history_day)
+            start_day = history_start()
+        st.markdown(f"### {len(past_df)} AI Tools on {history_day:%b %d, %Y} ({len(df)} today)")
+        if start_day is not None and history_day < start_day:
+            st.info(f"History starts {start_day:%b %d, %Y}: tools added before then have no recorded date.")
+        st.dataframe(past_df, use_container_width=True, hide_index=True)
+        
+        # Every add and update of one tool, so earlier websites and categories aren't lost
+        history_tool = st.selectbox("Change history of", options=[""] + sorted(df["name"].dropna().unique().tolist()),
+                                    key="history_tool")
+        if history_tool:
+            changes = tool_changes(history_tool)
+            if changes.empty:
+                st.info(f"No logged changes for {history_tool}; it was listed before the history began.")
+            else:
+                st.dataframe(changes, use_container_width=True, hide_index=True)
+
+    # Debug sidebar and JSON-lines log entry for this run (only when profiling is on)
+    render_sidebar(profile)
+
 # Run the app
 if __name__ == "__main__":
     main()
@@ -0,0 +1,2 @@
+# Headless benchmarks for the data layer. Run from the repo root, e.g.
+#   python -m benchmarks.bench_append
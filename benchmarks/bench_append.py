@@ -0,0 +1,62 @@
+# Insert latency of the old rewrite-everything add_entry vs. the append-only store.
+# Usage: python -m benchmarks.bench_append [--sizes 1000 10000 50000] [--inserts 20]
+import argparse
+import datetime
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_catalog
+from core.dashboard_data import CSV_COLUMNS
+from core.storage import CsvStore
+
+
+def new_entry(i):
+    return {
+        'Name': f"New Tool {i}", 'Tool_Link': "https://new.example.com", 'Category': "Analytics",
+        'Uploaded_By': "Rayna", 'Date_Time': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'Purpose': "Benchmark insert",
+    }
+
+
+def rewrite_insert(path, entry):
+    # The previous add_entry: read everything, prepend one row, write everything back
+    df = pd.read_csv(path)
+    entry = dict(entry, Serial_Number=int(df['Serial_Number'].max() + 1))
+    updated = pd.concat([pd.DataFrame([entry]), df], ignore_index=True)[CSV_COLUMNS]
+    updated.to_csv(path, index=False)
+
+
+def time_inserts(insert, count):
+    start = time.perf_counter()
+    for i in range(count):
+        insert(i)
+    return (time.perf_counter() - start) / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--inserts", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'rewrite ms/insert':>18} {'append ms/insert':>17}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            catalog = make_catalog(n)
+            rewrite_path = os.path.join(tmp, f"rewrite_{n}.csv")
+            append_path = os.path.join(tmp, f"append_{n}.csv")
+            catalog.to_csv(rewrite_path, index=False)
+            catalog.to_csv(append_path, index=False)
+
+            store = CsvStore(append_path, CSV_COLUMNS, serial_column='Serial_Number', compact_every=0)
+            store.append(new_entry(-1)) # One-time serial counter bootstrap, not part of steady-state latency
+            rewrite_ms = time_inserts(lambda i: rewrite_insert(rewrite_path, new_entry(i)), args.inserts)
+            append_ms = time_inserts(lambda i: store.append(new_entry(i)), args.inserts)
+            print(f"{n:>8} {rewrite_ms:>18.2f} {append_ms:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
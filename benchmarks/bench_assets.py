@@ -0,0 +1,73 @@
+# Lottie asset loading with the network disabled: cold (bundled fallback), disk-cache
+# hit in a fresh process-like manager, and warm in-memory lookups. Exits non-zero if
+# any animation fails to resolve or an unreachable URL is retried.
+# Usage: python -m benchmarks.bench_assets
+import json
+import socket
+import sys
+import tempfile
+import time
+
+from core.assets import LOTTIE_FILES, LOTTIE_URLS, AssetManager
+
+
+ATTEMPTS = []
+
+
+def disable_network():
+    # Behave like an offline node: every connection fails with an OSError
+    def refuse(*args, **kwargs):
+        ATTEMPTS.append(args)
+        raise OSError("network is disabled")
+    socket.socket.connect = refuse
+    socket.create_connection = refuse
+    socket.getaddrinfo = refuse
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    disable_network()
+    failures = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        manager = AssetManager(cache_dir=cache_dir, timeout=1)
+        _, prefetch_ms = timed(lambda: manager.prefetch(background=False))
+        attempts = len(ATTEMPTS)
+
+        for name, (url, fallback) in LOTTIE_URLS.items():
+            data, cold_ms = timed(lambda: manager.load_named(name))
+            if data != manager.load_file(fallback):
+                failures.append(f"{name}: did not fall back to {fallback}")
+            _, warm_ms = timed(lambda: manager.load_named(name), repeat=1000)
+            print(f"{name:>16}: fallback {cold_ms:.3f} ms, warm {warm_ms * 1000:.1f} us")
+            manager.load_url(url, fallback, block=True)
+        if len(ATTEMPTS) != attempts:
+            failures.append("unreachable URLs were retried after the first failure")
+
+        # Seed the disk cache as a previous online run would have, then load from a new manager
+        url, fallback = LOTTIE_URLS["add_tool"]
+        with open(fallback, "rb") as f:
+            manager._write_cached(url, f.read())
+        fresh = AssetManager(cache_dir=cache_dir)
+        data, disk_ms = timed(lambda: fresh.load_url(url))
+        if data is None:
+            failures.append("disk cache miss after seeding")
+        print(f"{'disk cache hit':>16}: {disk_ms:.3f} ms")
+
+        for path in LOTTIE_FILES:
+            if manager.load_file(path) is None:
+                failures.append(f"bundled file missing: {path}")
+        payload = sum(len(json.dumps(manager.load_file(p))) for p in LOTTIE_FILES)
+        print(f"{'prefetch':>16}: {prefetch_ms:.3f} ms ({len(LOTTIE_FILES)} bundled files, {payload} bytes)")
+
+    print("OK" if not failures else "FAIL: " + "; ".join(failures))
+    sys.exit(0 if not failures else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+# Headless benchmarks of the data layer (core.app_data / core.dashboard_data) on synthetic
+# catalogs in both schemas. Every operation reports wall time, throughput and peak traced
+# memory (from a separate tracemalloc run); results print as one JSON document so runs can
+# be diffed across commits.
+# Usage: python -m benchmarks.bench_data [--sizes 1000 100000 1000000] [--ops load_data to_csv ...]
+#        [--backend csv|sqlite] [--output results.json] [--no-memory]
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import make_catalog, make_tool_list
+from core import app_data, dashboard_data
+from core.aggregates import CatalogStats
+from core.cache import CACHE
+from core.export import write_csv, write_excel
+from core.storage import BACKEND_ENV
+
+WRITES = 20 # Calls per measurement for the single-row write operations
+
+
+def measure(fn, setup=None, memory=True):
+    # Wall time and peak Python allocations, taken in separate runs (tracemalloc skews timing);
+    # setup runs untimed before each one
+    if setup: setup()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        if setup: setup()
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+QUERIES = ["marketing", "tool 12", "seo", "analytics tools", "ima"] # Mixed selective, common and prefix queries
+
+
+def search_ops(search, n, search_fn):
+    # Build from the table, load from the persisted .npz, and ranked queries on the loaded index
+    def cold():
+        CACHE.invalidate(search.store.path)
+        for path in (search.path, search.log_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def persisted():
+        if not os.path.exists(search.path):
+            search.get()
+        CACHE.invalidate(search.store.path)
+
+    def queries():
+        for i in range(WRITES):
+            search_fn(QUERIES[i % len(QUERIES)])
+
+    return {
+        "search_build": (search.get, cold, n),
+        "search_load": (search.get, persisted, n),
+        "search": (queries, search.get, WRITES),
+    }
+
+
+# --- Operations ---
+# Each returns {name: (fn, setup, units)}; units is what throughput is counted in
+def app_ops(store, n, tmp):
+    state = {}
+    search = app_data.open_search(store)
+
+    def cold():
+        CACHE.invalidate(store.path)
+
+    def with_frame():
+        cold()
+        state["df"] = app_data.load_data(store)
+
+    def with_index():
+        state["index"] = app_data.get_category_index(store, store.version(), app_data.load_data(store))
+        state["index"]._categories = None # Drop the memoized sorted list
+
+    def filter_all():
+        index = state["index"]
+        for match in ("any", "all"):
+            app_data.filter_positions(index, ["Marketing", "SEO"], match)
+
+    def with_duplicates():
+        with_frame()
+        state["duplicates"] = app_data.get_duplicate_index(store, store.version(), state["df"])
+
+    def find_all():
+        for i in range(WRITES):
+            app_data.find_duplicates(state["duplicates"], f"tool-{i * 7 % n}", f"http://www.tool{i}.example.com/")
+
+    def upserts():
+        for i in range(WRITES):
+            app_data.upsert_tool(store, f"Tool {i * 7 % n}", f"https://updated{i}.example.com", "Marketing|SEO",
+                                  search=search)
+
+    return {
+        "load_data": (lambda: app_data.load_data(store), cold, n),
+        "category_index": (lambda: app_data.get_category_index(store, store.version(), state["df"]), with_frame, n),
+        "get_all_categories": (lambda: app_data.get_all_categories(state["index"]), with_index, 1),
+        "filter_categories": (filter_all, with_index, 2 * n),
+        "duplicate_index": (lambda: app_data.get_duplicate_index(store, store.version(), state["df"]), with_frame, n),
+        "find_duplicates": (find_all, with_duplicates, WRITES),
+        "upsert_tool": (upserts, with_index, WRITES),
+        **search_ops(search, n, lambda query: app_data.search_positions(search, query)),
+        "to_excel": (lambda: write_excel(state["df"], os.path.join(tmp, "app.xlsx")), with_frame, n),
+        "to_csv": (lambda: write_csv(state["df"], os.path.join(tmp, "app.csv")), with_frame, n),
+    }
+
+
+def dashboard_ops(store, n, tmp, catalog):
+    state = {}
+    stats = dashboard_data.open_stats(store)
+    search = dashboard_data.open_search(store)
+    inputs = list(zip(catalog['Name'], catalog['Tool_Link'], catalog['Category'],
+                      catalog['Uploaded_By'], catalog['Purpose']))
+
+    def cold():
+        CACHE.invalidate(store.path)
+
+    def with_frame():
+        cold()
+        state["df"] = dashboard_data.load_data(store)
+
+    def validate_all():
+        for row in inputs:
+            dashboard_data.validate_inputs(*row)
+
+    def find_all():
+        for i in range(WRITES):
+            dashboard_data.find_duplicates(store, f"tool-{i * 7 % n}", f"http://www.tool{i}.example.com/")
+
+    def add_entries():
+        for i in range(WRITES):
+            dashboard_data.add_entry(store, stats, f"Bench Tool {i}", "https://bench.example.com",
+                                     "Analytics", "Rayna", "Benchmark insert", search=search)
+
+    filters = dashboard_data.explorer_filters(categories=['Analytics', 'SEO Tools'])
+
+    def browse():
+        # Ten consecutive pages of one query; the first pays for the filter and sort
+        for page in range(10):
+            dashboard_data.fetch_page(store, filters, 'Name', False, page, 50)
+
+    def warm_frame():
+        cold()
+        store.frame()
+
+    def appended():
+        # URL parts current for the table, then one more row: the next call parses one new link
+        dashboard_data.url_parts(store)
+        store.append(dashboard_data.new_entry(f"Domain Tool {len(store.frame())}", "https://domains.example.org/x",
+                                              "Analytics", "Rayna", "Benchmark insert"))
+
+    def warm_stats():
+        stats.get() # Persisted stats and search index current, so add_entry takes the incremental path
+        search.get()
+
+    return {
+        "load_data": (lambda: dashboard_data.load_data(store), cold, n),
+        "validate_inputs": (validate_all, None, n),
+        "duplicate_index": (lambda: dashboard_data.get_duplicate_index(store), with_frame, n),
+        "find_duplicates": (find_all, lambda: dashboard_data.get_duplicate_index(store), WRITES),
+        "add_entry": (add_entries, warm_stats, WRITES),
+        "explorer_first_page": (lambda: dashboard_data.fetch_page(store, filters, 'Name', False, 0, 50), warm_frame, 50),
+        "explorer_pages": (browse, warm_frame, 500),
+        **search_ops(search, n, lambda query: dashboard_data.search_entries(store, search, query)),
+        "url_parts": (lambda: dashboard_data.url_parts(store), warm_frame, n),
+        "url_parts_append": (lambda: dashboard_data.url_parts(store), appended, n),
+        "domain_counts": (lambda: dashboard_data.domain_counts(store), lambda: dashboard_data.url_parts(store), n),
+        "timeline": (lambda: [dashboard_data.timeline(stats.get(), by) for by in (None, 'category', 'contributor')],
+                     warm_stats, 3),
+        "aggregates": (lambda: CatalogStats.from_frame(state["df"], 'Category', 'Uploaded_By', 'Date_Time'),
+                       with_frame, n),
+        "to_excel": (lambda: write_excel(state["df"], os.path.join(tmp, "dashboard.xlsx")), with_frame, n),
+        "to_csv": (lambda: write_csv(state["df"], os.path.join(tmp, "dashboard.csv")), with_frame, n),
+    }
+
+
+def run_schema(schema, n, tmp, selected, memory):
+    results = []
+    if schema == "app":
+        catalog = make_tool_list(n)
+        path = os.path.join(tmp, f"app_{n}.csv")
+        catalog.to_csv(path, index=False)
+        store = app_data.open_tool_store(path)
+        ops = app_ops(store, n, tmp)
+    else:
+        catalog = make_catalog(n)
+        path = os.path.join(tmp, f"dashboard_{n}.csv")
+        catalog.to_csv(path, index=False)
+        store = dashboard_data.open_dashboard_store(path)
+        ops = dashboard_ops(store, n, tmp, catalog)
+    for op, (fn, setup, units) in ops.items():
+        if selected and op not in selected:
+            continue
+        seconds, peak = measure(fn, setup, memory)
+        results.append({
+            "schema": schema, "rows": n, "op": op, "seconds": round(seconds, 6),
+            "units": units, "per_second": round(units / seconds, 1) if seconds else None,
+            "peak_mb": round(peak, 2) if peak is not None else None,
+        })
+        print(f"{schema:>9} {n:>8} {op:<20} {seconds * 1000:>11.2f} ms {units / seconds:>14,.0f}/s", file=sys.stderr)
+    CACHE.invalidate(store.path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--schemas", nargs="+", default=["app", "dashboard"], choices=["app", "dashboard"])
+    parser.add_argument("--ops", nargs="+", help="only run these operations")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default=os.environ.get(BACKEND_ENV, "csv"))
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    args = parser.parse_args()
+    os.environ[BACKEND_ENV] = args.backend
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            for schema in args.schemas:
+                results.extend(run_schema(schema, n, tmp, args.ops, not args.no_memory))
+
+    report = json.dumps({
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "backend": args.backend,
+        "results": results,
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
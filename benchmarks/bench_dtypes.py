@@ -0,0 +1,70 @@
+# Memory and query speed of the typed load (categoricals, Int64 serials, fixed-format dates,
+# pyarrow strings) vs. untyped loads of the same synthetic dashboard catalog.
+# "object" is the old read_csv + to_datetime path as it behaves before pandas 3 (every text
+# column a Python object); "default" is the same path with this pandas' default dtypes.
+# Usage: python -m benchmarks.bench_dtypes [--rows 1000000]
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_catalog
+from core import dashboard_data
+
+
+def old_load(path, **read_kwargs):
+    df = pd.read_csv(path, **read_kwargs)
+    df['Date_Time'] = pd.to_datetime(df['Date_Time'], errors='coerce')
+    return df
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+def profile(df, load_ms):
+    _, counts_ms = timed(lambda: (df['Category'].value_counts(), df['Uploaded_By'].value_counts()), 5)
+    _, nunique_ms = timed(lambda: (df['Category'].nunique(), df['Uploaded_By'].nunique()), 5)
+    _, groupby_ms = timed(lambda: df.groupby(['Category', 'Uploaded_By'], observed=True).size(), 5)
+    return {
+        "memory_mb": round(df.memory_usage(deep=True).sum() / 2**20, 1),
+        "load_ms": round(load_ms, 1),
+        "value_counts_ms": round(counts_ms, 2),
+        "nunique_ms": round(nunique_ms, 2),
+        "groupby_ms": round(groupby_ms, 2),
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.csv")
+        make_catalog(args.rows).to_csv(path, index=False)
+        os.environ.pop("AI_TOOLS_BACKEND", None) # CSV store
+        store = dashboard_data.open_dashboard_store(path)
+
+        results = {}
+        for name, load in [("object", lambda: old_load(path, dtype=object)),
+                           ("default", lambda: old_load(path)),
+                           ("typed", store.read)]:
+            df, load_ms = timed(load)
+            results[name] = profile(df, load_ms)
+            del df
+
+    for name in ("object", "default"):
+        results[f"typed_vs_{name}_memory"] = round(results[name]["memory_mb"] / results["typed"]["memory_mb"], 1)
+    print(json.dumps({"rows": args.rows, "pandas": pd.__version__, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
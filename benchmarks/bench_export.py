@@ -0,0 +1,64 @@
+# Excel export: per-rerun cost and peak memory of the old eager BytesIO workbook vs.
+# the deferred, version-cached, write-only export.
+# Usage: python -m benchmarks.bench_export [--sizes 1000 20000] [--reruns 5]
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+import pandas as pd
+
+from benchmarks.synthetic import make_tool_list
+from core.export import deferred_download, write_excel
+
+
+def eager_excel(df):
+    # The previous to_excel, called on every rerun
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='AI Tools')
+    return output.getvalue()
+
+
+def measure(fn):
+    # Wall time and peak Python allocations, taken in separate runs (tracemalloc skews timing)
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 20000])
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>7} {'eager ms/rerun':>15} {'eager peak MB':>14} {'lazy ms/rerun':>14} "
+          f"{'first click ms':>15} {'stream peak MB':>15} {'cached click ms':>16}")
+    for version, n in enumerate(args.sizes):
+        df = make_tool_list(n)
+        eager_ms, eager_peak = measure(lambda: eager_excel(df))
+
+        # A rerun now only creates the callable; generation happens on click
+        start = time.perf_counter()
+        for _ in range(args.reruns):
+            data = deferred_download("bench.excel", version, lambda f: write_excel(df, f), ".xlsx")
+        lazy_ms = (time.perf_counter() - start) * 1000 / args.reruns
+
+        with tempfile.TemporaryDirectory() as tmp:
+            click_ms, stream_peak = measure(lambda: write_excel(df, os.path.join(tmp, "export.xlsx")))
+        data() # Populate the cache for this version
+        cached_ms, _ = measure(data)
+        print(f"{n:>7} {eager_ms:>15.1f} {eager_peak:>14.1f} {lazy_ms:>14.3f} "
+              f"{click_ms:>15.1f} {stream_peak:>15.1f} {cached_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
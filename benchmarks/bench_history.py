@@ -0,0 +1,100 @@
+# Change log cost and payoff on a catalog of N rows: append/upsert latency with and without
+# history, then "as of" queries (the catalog before and after a batch of writes) and startup
+# recovery of a deleted data file.
+# Exits non-zero when a replayed table differs from what was on disk at that moment.
+# Usage: python -m benchmarks.bench_history [--rows 100000] [--writes 2000] [--backend csv sqlite]
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import make_catalog
+from core import dashboard_data
+from core.cache import CACHE
+
+
+def open_catalog(backend, directory, history=True):
+    os.environ["AI_TOOLS_BACKEND"] = backend
+    store = dashboard_data.open_dashboard_store(os.path.join(directory, "catalog.csv"))
+    if not history:
+        store.history = None
+    return store
+
+
+def entry(i):
+    return dashboard_data.new_entry(f"History Tool {i}", "https://history.example.com", "Analytics",
+                                    "Rayna", "Benchmark insert")
+
+
+def same(a, b):
+    def canonical(df):
+        return df.sort_values('Serial_Number').reset_index(drop=True).astype(str)
+    return canonical(a).equals(canonical(b))
+
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def run(backend, rows, writes):
+    report, failures = {"backend": backend}, []
+    with tempfile.TemporaryDirectory() as plain_dir, tempfile.TemporaryDirectory() as directory:
+        plain = open_catalog(backend, plain_dir, history=False)
+        store = open_catalog(backend, directory)
+        for target in (plain, store):
+            target.write(make_catalog(rows))
+        _, report["append_ms"] = timed(lambda: plain.append(entry(0)), writes // 2)
+        _, report["append_logged_ms"] = timed(lambda: store.append(entry(0)), writes // 2)
+
+        # Point in time between two halves of the writes (the log keeps whole seconds)
+        time.sleep(1.1)
+        before, moment = store.read(), datetime.datetime.now()
+        time.sleep(1.1)
+        for i in range(writes // 2):
+            store.append(entry(i))
+        CACHE.invalidate()
+        past, report["as_of_past_ms"] = timed(lambda: store.history.as_of(moment))
+        now, report["as_of_now_ms"] = timed(lambda: store.history.as_of())
+        if not same(past, before) or not same(now, store.read()):
+            failures.append(f"{backend}: as_of differs from the stored rows")
+        report["snapshots"] = len(store.history._manifest())
+
+        # Startup recovery after losing the data file
+        expected = store.read()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(store.path + suffix):
+                os.remove(store.path + suffix)
+        CACHE.invalidate()
+        store = open_catalog(backend, directory)
+        restored, report["restore_ms"] = timed(store.history.restore)
+        if restored != len(expected) or not same(store.read(), expected):
+            failures.append(f"{backend}: restored {restored} rows, expected {len(expected)}")
+    report = {k: round(v, 2) if isinstance(v, float) else v for k, v in report.items()}
+    return report, failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--backend", nargs="+", default=["csv", "sqlite"])
+    args = parser.parse_args()
+
+    reports, failures = [], []
+    for backend in args.backend:
+        report, failed = run(backend, args.rows, args.writes)
+        reports.append(report)
+        failures += failed
+    print(json.dumps({"rows": args.rows, "writes": args.writes, "results": reports}, indent=2))
+    print("FAILED" if failures else "OK", *failures, sep="\n")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
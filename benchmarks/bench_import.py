@@ -0,0 +1,89 @@
+# Cold import cost of the apps and the core package, measured with `python -X importtime` in a
+# fresh interpreter per run (median of --repeat runs). Also records which heavy optional
+# dependencies each import pulled in; exits non-zero if a lazily-loaded one shows up at import.
+# Usage: python -m benchmarks.bench_import [--repeat 5] [--output importtime.json]
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.bench_data import git_commit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGETS = ["pandas", "streamlit", "core.app_data", "core.dashboard_data", "core.charts", "core.export",
+           "core.assets", "core.profiling", "app", "dashboard"]
+# Imported on demand only: plotly.express when a chart is drawn, openpyxl on export,
+# requests when an animation isn't cached, streamlit_lottie when app.py builds its page
+LAZY = ["plotly.express", "openpyxl", "requests", "streamlit_lottie"]
+
+
+def import_once(target):
+    # Returns (target's cumulative us, {direct import: cumulative us}, lazy modules loaded)
+    code = f"import sys, json; import {target}; print(json.dumps([m for m in {LAZY!r} if m in sys.modules]))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    children, direct, total = {}, {}, 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1: # Children are printed before the module that imported them
+            children[name.strip()] = int(cumulative)
+        elif depth == 0:
+            if name.strip() == target:
+                total, direct = int(cumulative), children
+            children = {}
+    return total, direct, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(target, repeat):
+    runs = [import_once(target) for _ in range(repeat)]
+    totals = [total for total, _, _ in runs]
+    _, direct, loaded = runs[totals.index(sorted(totals)[len(totals) // 2])]
+    heaviest = sorted(direct.items(), key=lambda item: item[1], reverse=True)[:5]
+    return {
+        "target": target,
+        "median_ms": round(statistics.median(totals) / 1000, 1),
+        "min_ms": round(min(totals) / 1000, 1),
+        "heaviest_ms": {name: round(us / 1000, 1) for name, us in heaviest},
+        "lazy_loaded": loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--targets", nargs="+", default=TARGETS)
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    results = []
+    for target in args.targets:
+        result = measure(target, args.repeat)
+        results.append(result)
+        print(f"{target:<22} {result['median_ms']:>8.1f} ms  lazy loaded: {', '.join(result['lazy_loaded']) or '-'}",
+              file=sys.stderr)
+
+    report = json.dumps({
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "results": results,
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+    leaks = [r["target"] for r in results if r["lazy_loaded"] and r["target"] not in ("pandas", "streamlit")]
+    if leaks:
+        sys.exit(f"lazy dependencies imported eagerly by: {', '.join(leaks)}")
+
+
+if __name__ == "__main__":
+    main()
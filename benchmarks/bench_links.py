@@ -0,0 +1,144 @@
+# Link checker against a local stub HTTP server (run in a separate process): first checks the
+# outcome of each kind of link (ok, 404, redirect, HEAD not allowed, redirect loop, timeout,
+# refused connection), then the throughput of a large batch spread over several hosts, then a
+# LinkHealth scan of a CSV catalog. Exits non-zero on a wrong result.
+# Usage: python -m benchmarks.bench_links [--links 100000] [--hosts 8] [--concurrency 256]
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from core.link_health import LinkChecker, LinkHealth, is_dead
+from core.storage import CsvStore
+
+SLOW_SECONDS = 2.0
+
+
+async def handle(reader, writer):
+    # Keep-alive HTTP/1.1 stub: the path decides the answer
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            method, path, _ = line.decode("latin-1").split(" ", 2)
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            extra, body = "", b""
+            if path.startswith("/ok"):
+                status = 200
+            elif path.startswith("/missing"):
+                status = 404
+            elif path.startswith("/redirect"):
+                status, extra = 301, "Location: /ok/redirected\r\n"
+            elif path.startswith("/loop"):
+                status, extra = 302, f"Location: {path}\r\n"
+            elif path.startswith("/nohead"):
+                status = 405 if method == "HEAD" else 200
+                body = b"hello" if method == "GET" else b""
+            elif path.startswith("/slow"):
+                await asyncio.sleep(SLOW_SECONDS)
+                status = 200
+            else:
+                status = 500
+            writer.write(f"HTTP/1.1 {status} Stub\r\nContent-Length: {len(body)}\r\n{extra}\r\n".encode("latin-1") + body)
+            await writer.drain()
+    except (ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+def serve(hosts, ports):
+    async def run():
+        servers = [await asyncio.start_server(handle, "127.0.0.1", 0, backlog=1024) for _ in range(hosts)]
+        ports.put([server.sockets[0].getsockname()[1] for server in servers])
+        await asyncio.Event().wait()
+    asyncio.run(run())
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def check_outcomes(port):
+    base = f"http://127.0.0.1:{port}"
+    expected = {
+        f"{base}/ok": (200, f"{base}/ok"),
+        f"{base}/missing": (404, f"{base}/missing"),
+        f"{base}/redirect": (200, f"{base}/ok/redirected"),
+        f"{base}/nohead": (200, f"{base}/nohead"),
+        f"{base}/loop": (None, None),
+        f"{base}/slow": (None, None),
+        f"http://127.0.0.1:{closed_port()}/ok": (None, None),
+        "ftp://example.com/file": (None, None),
+    }
+    checker = LinkChecker(timeout=SLOW_SECONDS / 4)
+    failures = []
+    for result in checker.check(list(expected)):
+        if (result.status, result.final_url) != expected[result.url]:
+            failures.append(result)
+        print(f"  {result.url:45} {result.status!s:5} {result.error or result.final_url}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--links", type=int, default=100_000)
+    parser.add_argument("--hosts", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--per-host", type=int, default=16)
+    args = parser.parse_args()
+
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(args.hosts, ports), daemon=True)
+    server.start()
+    ports = ports.get(timeout=30)
+    try:
+        print("outcomes:")
+        failures = check_outcomes(ports[0])
+
+        # Every tenth link is dead
+        urls = [f"http://127.0.0.1:{ports[i % len(ports)]}/{'missing' if i % 10 == 0 else 'ok'}/{i}"
+                for i in range(args.links)]
+        checker = LinkChecker(concurrency=args.concurrency, per_host=args.per_host)
+        start = time.perf_counter()
+        results = checker.check(urls)
+        seconds = time.perf_counter() - start
+        dead = sum(is_dead(result) for result in results)
+        if len(results) != len(urls) or dead != len(range(0, args.links, 10)):
+            failures.append(f"batch: {len(results)} results, {dead} dead")
+
+        # LinkHealth over a CSV catalog: a scan persists results, after which nothing is stale
+        with tempfile.TemporaryDirectory() as tmp:
+            store = CsvStore(os.path.join(tmp, "catalog.csv"), ["name", "website"])
+            store.write(pd.DataFrame({"name": [f"t{i}" for i in range(1000)], "website": urls[:1000]}))
+            health = LinkHealth(store, "website", checker=checker)
+            scan_start = time.perf_counter()
+            checked = health.scan()
+            scan_seconds = time.perf_counter() - scan_start
+            if checked != 1000 or len(health.dead()) != 100 or health.stale(health.links()):
+                failures.append(f"scan: {checked} checked, {len(health.dead())} dead")
+    finally:
+        server.terminate()
+
+    print(json.dumps({
+        "links": args.links, "hosts": args.hosts, "concurrency": args.concurrency, "per_host": args.per_host,
+        "seconds": round(seconds, 2), "links_per_second": round(args.links / seconds, 1),
+        "scan_1000_seconds": round(scan_seconds, 2),
+    }, indent=2))
+    print("FAILED" if failures else "OK", *failures, sep="\n")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Bytes of Lottie markup sent per dashboard rerun: JSON inlined into the page (before)
+# vs. a reference to the published static file (after).
+# Usage: python -m benchmarks.bench_lottie_payload [--reruns 10]
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from core import assets
+from core.assets import LOTTIE_URLS, AssetManager, lottie_html
+
+# Animations display_lottie renders on each dashboard page, with their display height
+PAGES = {"Dashboard (empty)": [("empty_dashboard", 300)], "Add Tools": [("add_tool", 150)]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assets.STATIC_DIR = os.path.join(tmp, "static")
+        manager = AssetManager(cache_dir=os.path.join(tmp, "cache"))
+        print(f"{'page':>18} {'inline B/rerun':>15} {'static B/rerun':>15} {'static file B (once)':>21} "
+              f"{'inline json ms':>15} {'publish ms':>11}")
+        for page, animations in PAGES.items():
+            inline_bytes = static_bytes = file_bytes = 0
+            inline_ms = publish_ms = 0.0
+            for name, height in animations:
+                data = manager.load_file(LOTTIE_URLS[name][1])
+                for rerun in range(args.reruns):
+                    start = time.perf_counter()
+                    old_id = f"lottie-animation-{name}-{int(time.time() * 1000)}"
+                    inline = lottie_html(old_id, height, f"animationData: {json.dumps(data)}")
+                    inline_ms += time.perf_counter() - start
+                    start = time.perf_counter()
+                    digest, url = manager.publish(data)
+                    static = lottie_html(f"lottie-animation-{name}-{digest[:12]}", height, f"path: '{url}'")
+                    publish_ms += time.perf_counter() - start
+                    inline_bytes += len(inline.encode("utf-8"))
+                    static_bytes += len(static.encode("utf-8"))
+                file_bytes += os.path.getsize(os.path.join(assets.STATIC_DIR, "lottie", digest + ".json"))
+            n = args.reruns
+            print(f"{page:>18} {inline_bytes // n:>15} {static_bytes // n:>15} {file_bytes:>21} "
+                  f"{inline_ms * 1000 / n:>15.3f} {publish_ms * 1000 / n:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
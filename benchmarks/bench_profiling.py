@@ -0,0 +1,45 @@
+# Cost of the render-profiling hooks per call, disabled (the default) and enabled,
+# against an empty loop. Prints one JSON object.
+# Usage: python -m benchmarks.bench_profiling [calls]
+import json
+import os
+import sys
+import tempfile
+import time
+
+from core.profiling import PROFILE_ENV, PROFILE_LOG_ENV, start_run
+
+
+def per_call_ns(run, calls):
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        with run.phase("phase"):
+            pass
+        run.size("payload", lambda: 0)
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    os.environ.pop(PROFILE_ENV, None)
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        pass
+    baseline = (time.perf_counter_ns() - start) / calls
+
+    disabled = per_call_ns(start_run("bench"), calls)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ[PROFILE_LOG_ENV] = os.path.join(tmp, "profile.jsonl")
+        run = start_run("bench", force=True)
+        enabled = per_call_ns(run, calls)
+        run.finish()
+    print(json.dumps({
+        "calls": calls,
+        "loop_ns": round(baseline, 1),
+        "disabled_ns_per_phase": round(disabled - baseline, 1),
+        "enabled_ns_per_phase": round(enabled - baseline, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Multi-replica change notification test: R reader processes each watch the same catalog
+# while a writer appends rows (plus one rewrite halfway). Every reader must end with exactly
+# the rows on disk, publish each observed version once, and reload the whole table only at
+# startup and after the rewrite (appends are read from the tail). Exits non-zero otherwise.
+# Usage: python -m benchmarks.stress_replicas [--readers 4] [--writes 100] [--rows 100000] [--backend csv sqlite]
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import make_catalog
+from core import dashboard_data
+from core.notify import ChangeWatcher
+
+
+def open_catalog(backend, directory):
+    os.environ["AI_TOOLS_BACKEND"] = backend
+    return dashboard_data.open_dashboard_store(os.path.join(directory, "catalog.csv"))
+
+
+def reader(backend, directory, expected_rows, ready, results):
+    store = open_catalog(backend, directory)
+    loads = {"full": 0, "tail": 0}
+    load_frame = store._load_frame
+
+    def counted(previous):
+        state = load_frame(previous)
+        full = (previous is None or previous.offset is None
+                or (state.generation, state.source) != (previous.generation, previous.source))
+        loads["full" if full else "tail"] += 1
+        return state
+
+    store._load_frame = counted
+    seen, stamps, latencies = [], set(), []
+
+    def on_change(before, after):
+        # Latency: how long the oldest write first seen now waited (the writer stamps each row)
+        now = time.time()
+        seen.append(after)
+        purposes = store.frame()['Purpose'].dropna()
+        new = {float(p[6:]) for p in purposes[purposes.str.startswith("stamp ")]} - stamps
+        if new:
+            latencies.append(now - min(new))
+            stamps.update(new)
+
+    watcher = ChangeWatcher(store, interval=0.01)
+    watcher.subscribe("stress", on_change)
+    watcher.poll() # Initial load
+    ready.set()
+    watcher.start()
+    deadline = time.monotonic() + 120
+    while len(store.frame()) < expected_rows and time.monotonic() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.5) # Let a trailing change be published
+    watcher.stop()
+    frame = store.frame()
+    results.put({"pid": os.getpid(), "rows": len(frame), "serials": sorted(frame['Serial_Number'].tolist()),
+                 "changes": watcher.changes, "unique_versions": len(set(map(repr, seen))) == len(seen),
+                 "full_loads": loads["full"], "tail_loads": loads["tail"], "latencies": latencies})
+
+
+def run(backend, readers, writes, rows):
+    with tempfile.TemporaryDirectory() as directory:
+        store = open_catalog(backend, directory)
+        store.write(make_catalog(rows))
+        ctx = multiprocessing.get_context("spawn")
+        results = ctx.Queue()
+        ready = [ctx.Event() for _ in range(readers)]
+        procs = [ctx.Process(target=reader, args=(backend, directory, rows + writes, ready[i], results))
+                 for i in range(readers)]
+        for p in procs:
+            p.start()
+        for event in ready:
+            event.wait(120)
+
+        start = time.perf_counter()
+        for i in range(writes):
+            if i == writes // 2: # One rewrite: readers must notice it and reload once
+                store.compact() if backend == "csv" else store.write(store.read())
+            store.append({'Name': f"replica-{i}", 'Tool_Link': "", 'Category': "Analytics", 'Uploaded_By': "Rayna",
+                          'Date_Time': "2025-01-01 00:00:00", 'Purpose': f"stamp {time.time()}"})
+            time.sleep(0.02)
+        write_seconds = time.perf_counter() - start
+        reports = [results.get(timeout=180) for _ in procs]
+        for p in procs:
+            p.join()
+        expected = sorted(store.read()['Serial_Number'].tolist())
+
+    failures = []
+    for report in reports:
+        if report["serials"] != expected:
+            failures.append(f"pid {report['pid']}: {report['rows']} rows, expected {len(expected)}")
+        if not report["unique_versions"]:
+            failures.append(f"pid {report['pid']}: a version was published twice")
+        if report["changes"] > writes + 2: # Initial load + each append + the rewrite
+            failures.append(f"pid {report['pid']}: {report['changes']} changes for {writes + 1} writes")
+        if report["full_loads"] > 2: # Startup + the rewrite
+            failures.append(f"pid {report['pid']}: {report['full_loads']} full reloads")
+    latencies = sorted(l for report in reports for l in report["latencies"])
+    print(f"{backend:>6}: {readers} readers x {writes} writes over {rows} rows in {write_seconds:.2f}s; "
+          f"changes/reader {[r['changes'] for r in reports]}, full loads {[r['full_loads'] for r in reports]}, "
+          f"latency p50 {statistics.median(latencies) * 1000:.0f}ms max {latencies[-1] * 1000:.0f}ms"
+          if latencies else f"{backend:>6}: no changes observed")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--backend", nargs="+", default=["csv", "sqlite"])
+    args = parser.parse_args()
+
+    failures = []
+    for backend in args.backend:
+        failures += run(backend, args.readers, args.writes, args.rows)
+    print("FAILED" if failures else "OK", *failures, sep="\n")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Multi-process write stress test: N writer processes insert/upsert concurrently and
+# every row must survive with a unique Serial_Number, and both change logs must replay to
+# exactly the rows on disk (with gapless seqs). Exits non-zero on lost rows.
+# Usage: python -m benchmarks.stress_writers [--writers 8] [--rows 50] [--backend csv sqlite]
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from core.history import ChangeLog
+from core.storage import CsvStore, SqliteStore
+
+CSV_COLUMNS = ['Serial_Number', 'Name', 'Tool_Link', 'Category', 'Uploaded_By', 'Date_Time', 'Purpose']
+APP_COLUMNS = ["name", "website", "categories"]
+
+
+def make_stores(backend, directory):
+    cls = CsvStore if backend == "csv" else SqliteStore
+    suffix = ".csv" if backend == "csv" else ".db"
+    dashboard = cls(os.path.join(directory, "dashboard" + suffix), CSV_COLUMNS,
+                    serial_column='Serial_Number', date_column='Date_Time')
+    app = cls(os.path.join(directory, "app" + suffix), APP_COLUMNS)
+    if backend == "csv":
+        dashboard.compact_every = 37 # Force compactions to interleave with appends
+    # Small segments, so snapshots are taken while other writers wait on the lock
+    dashboard.history = ChangeLog(dashboard, 'Serial_Number', snapshot_every=29)
+    app.history = ChangeLog(app, "name", snapshot_every=29)
+    return dashboard, app
+
+
+def writer(backend, directory, writer_id, rows):
+    dashboard, app = make_stores(backend, directory)
+    for i in range(rows):
+        dashboard.append({'Name': f"w{writer_id}-{i}", 'Category': "Analytics", 'Uploaded_By': "Rayna",
+                          'Date_Time': "2025-01-01 00:00:00", 'Purpose': "stress"})
+        app.upsert("name", {"name": f"w{writer_id}-{i}", "website": "https://example.com", "categories": "A|B"})
+    app.upsert("name", {"name": f"w{writer_id}-0", "website": f"https://example.com/{writer_id}", "categories": "A|B"})
+
+
+def replays(store, key):
+    # The change log's current table equals the data, and its seqs have no gaps or repeats
+    log = store.history
+    seqs = [entry["seq"] for snapshot in log._manifest() for entry in log._read_segment(snapshot["seq"])[0]]
+    seqs += [snapshot["seq"] for snapshot in log._manifest() if snapshot["kind"] == "rewrite"]
+    replayed = log.as_of().sort_values(key).reset_index(drop=True).astype(str)
+    stored = store.read().sort_values(key).reset_index(drop=True).astype(str)
+    return sorted(seqs) == list(range(1, len(seqs) + 1)) and replayed.equals(stored)
+
+
+def run(backend, writers, rows):
+    with tempfile.TemporaryDirectory() as directory:
+        dashboard, app = make_stores(backend, directory)
+        dashboard.initialize()
+        app.initialize()
+
+        start = time.perf_counter()
+        procs = [multiprocessing.Process(target=writer, args=(backend, directory, w, rows)) for w in range(writers)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        expected = writers * rows
+        dashboard_df, app_df = dashboard.read(), app.read()
+        serials = dashboard_df['Serial_Number']
+        failures = []
+        if any(p.exitcode != 0 for p in procs):
+            failures.append("writer process failed")
+        if len(dashboard_df) != expected or dashboard_df['Name'].nunique() != expected:
+            failures.append(f"dashboard rows {len(dashboard_df)} != {expected}")
+        if serials.nunique() != expected or int(serials.max()) != expected:
+            failures.append(f"serials not unique/contiguous (unique={serials.nunique()}, max={serials.max()})")
+        if len(app_df) != expected or app_df['name'].nunique() != expected:
+            failures.append(f"app rows {len(app_df)} != {expected}")
+        if not replays(dashboard, 'Serial_Number') or not replays(app, "name"):
+            failures.append("change log doesn't replay to the stored rows")
+
+        status = "OK" if not failures else "FAIL: " + "; ".join(failures)
+        print(f"{backend:>6}: {writers} writers x {rows} rows in {elapsed:.2f}s -> {status}")
+        return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--backend", nargs="+", default=["csv", "sqlite"], choices=["csv", "sqlite"])
+    args = parser.parse_args()
+    ok = all([run(backend, args.writers, args.rows) for backend in args.backend])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# Synthetic catalogs in both schemas, deterministic for a given size and seed.
+import numpy as np
+import pandas as pd
+
+from core.dashboard_data import CSV_COLUMNS, TOOL_CATEGORIES, UPLOADER_NAMES
+
+APP_CATEGORIES = [
+    "Text Generation", "Chatbot", "Image Generation", "Art", "Design", "Marketing", "Content Creation",
+    "SEO", "Analytics", "Video", "Audio", "Translation", "Productivity", "Research", "Code", "Email",
+    "Social Media", "Sales", "Customer Support", "Data Analysis", "Presentation", "Writing", "Voice", "3D",
+]
+
+
+def make_tool_list(n, seed=0):
+    # app.py schema: name, website, categories (1-3 pipe-separated categories per tool)
+    rng = np.random.default_rng(seed)
+    pool = np.array(APP_CATEGORIES)
+    picks = rng.integers(0, len(pool), size=(n, 3))
+    counts = rng.integers(1, 4, size=n)
+    categories = ["|".join(dict.fromkeys(pool[row[:k]])) for row, k in zip(picks, counts)]
+    ids = pd.RangeIndex(n).astype(str)
+    return pd.DataFrame({
+        "name": "Tool " + ids,
+        "website": "https://tool" + ids + ".example.com",
+        "categories": categories,
+    })
+
+
+def make_catalog(n, seed=0):
+    # dashboard.py schema (CSV_COLUMNS), newest first, one entry per minute
+    rng = np.random.default_rng(seed)
+    categories = np.array(TOOL_CATEGORIES[1:])
+    uploaders = np.array(UPLOADER_NAMES[1:])
+    ids = pd.RangeIndex(n).astype(str)
+    dates = pd.Timestamp("2025-01-01") - pd.to_timedelta(np.arange(n), unit="min")
+    return pd.DataFrame({
+        'Serial_Number': np.arange(n, 0, -1),
+        'Name': "Tool " + ids,
+        'Tool_Link': "https://tool" + ids + ".example.com",
+        'Category': categories[rng.integers(0, len(categories), n)],
+        'Uploaded_By': uploaders[rng.integers(0, len(uploaders), n)],
+        'Date_Time': dates.strftime('%Y-%m-%d %H:%M:%S'),
+        'Purpose': "Synthetic benchmark entry",
+    })[CSV_COLUMNS]
@@ -0,0 +1 @@
+# Shared data layer for the AI Tools apps (app.py and dashboard.py).
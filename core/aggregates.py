@@ -0,0 +1,250 @@
+import collections
+import datetime
+import json
+import os
+
+import pandas as pd
+
+from core.cache import CACHE
+from core.locking import WriteLock, atomic_write
+
+
+BUCKETS = {'day': 'D', 'week': 'W', 'month': 'M', 'quarter': 'Q', 'year': 'Y'} # Rollup bucket -> period frequency
+BUCKET_DAYS = {'day': 1, 'week': 7, 'month': 30.44, 'quarter': 91.31, 'year': 365.25}
+MAX_BUCKETS = 120 # Points on a time chart, whatever the date range
+LOG_LIMIT = 1 << 20 # Bytes of update log after which the persisted stats are compacted
+
+
+def version_key(version):
+    # Versions round-trip through JSON (tuples become lists), so compare them in that form
+    return json.loads(json.dumps(version))
+
+
+class CatalogStats:
+    """Dashboard aggregates: totals, per-category, per-contributor and per-day counts.
+
+    Built once from the full table, then kept current with add() in O(1)
+    per inserted row. Days are 'YYYY-MM-DD' strings; per_day_category and
+    per_day_contributor hold each day's counts per category / contributor,
+    the daily rollups that rollup() coarsens into weeks, months, ...
+    """
+
+    def __init__(self, total=0, per_category=None, per_contributor=None, per_day=None,
+                 per_day_category=None, per_day_contributor=None):
+        self.total = total
+        self.per_category = collections.Counter(per_category or {})
+        self.per_contributor = collections.Counter(per_contributor or {})
+        self.per_day = collections.Counter(per_day or {})
+        self.per_day_category = {day: collections.Counter(counts) for day, counts in (per_day_category or {}).items()}
+        self.per_day_contributor = {day: collections.Counter(counts)
+                                    for day, counts in (per_day_contributor or {}).items()}
+
+    @classmethod
+    def from_frame(cls, df, category_column, contributor_column, date_column):
+        # Count per calendar day first, then format only the distinct days
+        dates = pd.to_datetime(df[date_column], errors='coerce').dt.normalize()
+        days = dates.dropna().value_counts()
+        categories = df[category_column].value_counts()
+        contributors = df[contributor_column].value_counts()
+        return cls(
+            total=len(df),
+            per_category=categories[categories > 0].to_dict(), # Categoricals also list unused categories
+            per_contributor=contributors[contributors > 0].to_dict(),
+            per_day={day.strftime('%Y-%m-%d'): int(n) for day, n in days.items()},
+            per_day_category=_per_day_of(dates, df[category_column]),
+            per_day_contributor=_per_day_of(dates, df[contributor_column]),
+        )
+
+    def add(self, category, contributor, date_time):
+        self.total += 1
+        if category:
+            self.per_category[category] += 1
+        if contributor:
+            self.per_contributor[contributor] += 1
+        day = pd.to_datetime(date_time, errors='coerce')
+        if pd.notna(day):
+            day = day.strftime('%Y-%m-%d')
+            self.per_day[day] += 1
+            if category:
+                self.per_day_category.setdefault(day, collections.Counter())[category] += 1
+            if contributor:
+                self.per_day_contributor.setdefault(day, collections.Counter())[contributor] += 1
+
+    def merge(self, other):
+        # Fold in the counts of another CatalogStats (e.g. one built from a bulk import)
+        self.total += other.total
+        self.per_category.update(other.per_category)
+        self.per_contributor.update(other.per_contributor)
+        self.per_day.update(other.per_day)
+        for mine, theirs in ((self.per_day_category, other.per_day_category),
+                             (self.per_day_contributor, other.per_day_contributor)):
+            for day, counts in theirs.items():
+                mine.setdefault(day, collections.Counter()).update(counts)
+
+    # --- Summaries ---
+    def unique_categories(self):
+        return sum(1 for n in self.per_category.values() if n)
+
+    def contributors(self):
+        return sum(1 for n in self.per_contributor.values() if n)
+
+    def added_since(self, days, today=None):
+        # Entries dated within the last `days` calendar days, today included
+        today = today or datetime.date.today()
+        return sum(self.per_day.get((today - datetime.timedelta(days=i)).isoformat(), 0) for i in range(days))
+
+    def category_counts(self):
+        counts = pd.Series(dict(self.per_category), dtype='int64')
+        return counts[counts > 0].sort_values(ascending=False)
+
+    def daily_counts(self):
+        # Date, Count and running Cumulative, one row per day with entries
+        days = sorted(self.per_day)
+        daily = pd.DataFrame({
+            'Date': pd.to_datetime(pd.Series(days, dtype='object'), format='%Y-%m-%d').dt.date,
+            'Count': [self.per_day[d] for d in days],
+        })
+        daily['Cumulative'] = daily['Count'].cumsum()
+        return daily
+
+    def daily_by(self, by):
+        # Date plus one count column per category (by='category') or contributor (by='contributor'),
+        # one row per day with entries
+        per_day = self.per_day_category if by == 'category' else self.per_day_contributor
+        days = sorted(per_day)
+        daily = pd.DataFrame.from_records([per_day[d] for d in days], columns=None if days else [])
+        daily = daily.fillna(0).astype('int64')
+        daily.insert(0, 'Date', pd.to_datetime(pd.Series(days, dtype='object'), format='%Y-%m-%d').dt.date)
+        return daily
+
+    def to_dict(self):
+        return {"total": self.total, "per_category": dict(self.per_category),
+                "per_contributor": dict(self.per_contributor), "per_day": dict(self.per_day),
+                "per_day_category": {day: dict(c) for day, c in self.per_day_category.items()},
+                "per_day_contributor": {day: dict(c) for day, c in self.per_day_contributor.items()}}
+
+
+def _per_day_of(dates, values):
+    # {day: {value: count}} of aligned Series of normalized timestamps and values
+    counts = pd.DataFrame({'day': dates, 'value': values}).groupby(['day', 'value'], observed=True).size()
+    nested = {}
+    for (day, value), n in counts[counts > 0].items():
+        nested.setdefault(day.strftime('%Y-%m-%d'), {})[value] = int(n)
+    return nested
+
+
+def bucket_for(start, end, max_points=MAX_BUCKETS):
+    # Smallest BUCKETS size that splits start..end (dates, inclusive) into at most max_points buckets
+    days = (end - start).days + 1
+    return next((bucket for bucket, length in BUCKET_DAYS.items() if days / length <= max_points), 'year')
+
+
+def rollup(daily, bucket, start=None, end=None):
+    # Per-bucket sums of the count columns of a frame with a Date column (datetime.date, e.g.
+    # daily_counts() or daily_by()), between start and end inclusive (default: the data's first
+    # and last day). Every bucket of the range gets a row, 0 when empty, dated by its first day
+    columns = [c for c in daily.columns if c not in ('Date', 'Cumulative')]
+    if start is None or end is None:
+        if daily.empty:
+            return pd.DataFrame(columns=['Date'] + columns)
+        start, end = start or min(daily['Date']), end or max(daily['Date'])
+    freq = BUCKETS[bucket]
+    dates = pd.to_datetime(pd.Series(daily['Date'], dtype='object'))
+    keep = ((dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(end))).to_numpy()
+    periods = pd.PeriodIndex(dates[keep], freq=freq)
+    sums = daily.loc[keep, columns].groupby(periods).sum()
+    buckets = pd.period_range(pd.Period(start, freq), pd.Period(end, freq), freq=freq)
+    sums = sums.reindex(buckets, fill_value=0).astype('int64').reset_index(drop=True)
+    sums.insert(0, 'Date', buckets.start_time.date)
+    return sums
+
+
+class StatsStore:
+    """CatalogStats persisted next to the data, kept current one write at a time.
+
+    <path>.stats.json holds the stats tagged with a data version; each write
+    after that is appended to <path>.stats.log as one JSON line (versions
+    before/after and the counts it added), so an insert costs one short
+    append however many days and groups the stats cover. Loading replays
+    the log, and folds it into the .json once it grows past LOG_LIMIT. If
+    the log doesn't lead to the store's version (external edit, missed
+    update), the stats are rebuilt from the table once and persisted again.
+    """
+
+    def __init__(self, store, category_column, contributor_column):
+        self.store = store
+        self.category_column = category_column
+        self.contributor_column = contributor_column
+        self.path = store.path + ".stats.json"
+        self.log_path = store.path + ".stats.log"
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                saved = json.load(f)
+            if "per_day_category" not in saved["stats"]: # Saved before the daily rollups; rebuilt once
+                return None, None
+            return saved["version"], CatalogStats(**saved["stats"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, None
+
+    def _replay(self, version, stats):
+        # Merge the logged deltas that continue from version; returns the version reached
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry["before"] != version:
+                        break
+                    stats.merge(CatalogStats(**entry["delta"]))
+                    version = entry["after"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return version
+
+    def _write(self, version, stats):
+        payload = {"version": version_key(version), "stats": stats.to_dict()}
+        atomic_write(self.path, lambda f: json.dump(payload, f))
+        atomic_write(self.log_path, lambda f: None) # The .json now covers everything logged
+
+    def _add(self, stats, record):
+        stats.add(record.get(self.category_column), record.get(self.contributor_column),
+                  record.get(self.store.date_column))
+
+    def _load(self, version):
+        saved_version, stats = self._read()
+        if stats is not None:
+            saved_version = self._replay(saved_version, stats)
+        if stats is None or saved_version != version_key(version):
+            stats = CatalogStats.from_frame(self.store.frame(), self.category_column,
+                                            self.contributor_column, self.store.date_column)
+            with WriteLock(self.path):
+                self._write(version, stats)
+        elif os.path.exists(self.log_path) and os.path.getsize(self.log_path) > LOG_LIMIT:
+            with WriteLock(self.path):
+                self._write(version, stats)
+        return stats
+
+    def get(self):
+        version = self.store.version()
+        return CACHE.get(f"{self.store.path}:stats", version, lambda: self._load(version))
+
+    def _advance(self, version_before, version_after, delta):
+        # Log one write's counts and patch the cached stats, without rescanning the table;
+        # a log that doesn't continue from the persisted stats makes the next load rebuild them
+        entry = {"before": version_key(version_before), "after": version_key(version_after), "delta": delta.to_dict()}
+        with WriteLock(self.path):
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+        return CACHE.advance(f"{self.store.path}:stats", version_before, version_after,
+                             lambda stats: stats.merge(delta))
+
+    def record(self, result):
+        # One AppendResult
+        delta = CatalogStats()
+        self._add(delta, result.record)
+        return self._advance(result.version_before, result.version_after, delta)
+
+    def record_bulk(self, delta, result):
+        # A BulkAppendResult, with the CatalogStats of the rows it inserted
+        return self._advance(result.version_before, result.version_after, delta)
@@ -0,0 +1,120 @@
+# Data layer of app.py (name, website, categories), importable without Streamlit.
+# Functions take the store explicitly and raise on failure; the app reports errors in the UI.
+import numpy as np
+import pandas as pd
+
+from core.cache import CACHE
+from core.category_index import CategoryIndex
+from core.duplicate_index import DuplicateIndex
+from core.link_health import LinkHealth, describe
+from core.search import SearchStore
+from core.storage import open_store
+
+DATA_FILE = "data/ai_tools.csv"
+COLUMNS = ["name", "website", "categories"]
+SEARCH_FIELDS = {"name": 2.0, "categories": 1.0} # Column -> BM25 term weight
+
+
+def open_tool_store(path=DATA_FILE):
+    # Backend chosen by AI_TOOLS_BACKEND=csv|sqlite; every add/update is logged to <path>.history/
+    return open_store(path, COLUMNS, indexes=["name"], history_key="name")
+
+
+def open_search(store):
+    # Full-text index persisted next to the data (<path>.search.npz + .search.log)
+    return SearchStore(store, SEARCH_FIELDS)
+
+
+def open_link_health(store):
+    # Background-checked health of the website links (<path>.links.json)
+    return LinkHealth(store, "website")
+
+
+def dead_link_reasons(link_health, websites):
+    # website -> short reason ("HTTP 404", "Timeout") for the given websites whose last check failed
+    dead = link_health.dead()
+    return {site: describe(dead[site]) for site in websites if isinstance(site, str) and site in dead}
+
+
+def load_data(store, version=None):
+    # Served from memory until the store's data version changes; tagged with the caller's version,
+    # so the indexes built from it in the same run agree on which rows they saw
+    if store.history is not None and store.history.restore(): # A lost data file comes back from the change log
+        version = None
+    version = store.version() if version is None else version
+    return CACHE.get(f"{store.path}:tools", version, store.frame)
+
+
+def get_category_index(store, version, df):
+    # Built once per data version
+    return CACHE.get(f"{store.path}:category_index", version, lambda: CategoryIndex.build(df["categories"]))
+
+
+def get_duplicate_index(store, version, df):
+    # Name/URL duplicate lookups, built once per data version
+    return CACHE.get(f"{store.path}:duplicate_index", version,
+                     lambda: DuplicateIndex.build(df["name"], df["website"]))
+
+
+def find_duplicates(duplicate_index, name, website):
+    # Other tools that look like this one: same normalized name or canonical URL, or a similar name.
+    # The tool saved under exactly this name is left out, since saving it again is an update.
+    return [match for match in duplicate_index.check(name, website) if match.name != name]
+
+
+def search_positions(search, query, rows=None):
+    # Row positions (in frame order) of the tools matching every query word, best match first;
+    # the last word also matches as a prefix, for search-as-you-type. The index follows the
+    # store's current version, which may have rows appended since the caller's frame was read:
+    # rows=len(frame) drops those (a single-row write appends or edits in place, so the positions
+    # below it still name the same tools)
+    positions, _ = search.get().search(query)
+    if rows is not None:
+        positions = positions[positions < rows]
+    return positions.tolist()
+
+
+def get_all_categories(category_index):
+    return category_index.categories()
+
+
+def filter_positions(category_index, selected_categories, match="any"):
+    # Row positions (in frame order) of the tools matching the selected categories
+    if not selected_categories:
+        return range(len(category_index))
+    return np.flatnonzero(category_index.mask(selected_categories, match=match))
+
+
+def catalog_as_of(store, day):
+    # The tools as they stood at the end of `day`, rebuilt from the change log (nearest snapshot
+    # plus the entries after it)
+    end = pd.Timestamp(day) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    return store.history.as_of(end)
+
+
+def history_start(store):
+    # The day the change log started (today if nothing is logged yet); the tool list has no date
+    # column, so the catalog before that day is unknown
+    start = store.history.start()
+    return (start if start is not None else pd.Timestamp.now()).date()
+
+
+def tool_changes(store, name):
+    # When the tool was added and each later edit (only the fields that changed), oldest first
+    return pd.DataFrame([{"When": at, "Change": "Added" if op == "add" else "Updated",
+                          "Fields": ", ".join(f"{col}: {value}" for col, value in values.items() if col != "name")}
+                         for at, op, values in store.history.changes(name)], columns=["When", "Change", "Fields"])
+
+
+def upsert_tool(store, name, website, categories, search=None):
+    # Add or update one tool under the store's write lock, then patch the category, duplicate
+    # and search indexes in place instead of rebuilding them for the new version
+    record = {"name": name, "website": website, "categories": categories}
+    result = store.upsert("name", record)
+    if search is not None:
+        search.record(result.position, record, result.version_before, result.version_after)
+    CACHE.advance(f"{store.path}:category_index", result.version_before, result.version_after,
+                  lambda index: index.set_row(result.position, categories))
+    CACHE.advance(f"{store.path}:duplicate_index", result.version_before, result.version_after,
+                  lambda index: index.set_row(result.position, name, website))
+    return result
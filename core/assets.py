@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from core.locking import atomic_write
+
+OFFLINE_ENV = "AI_TOOLS_OFFLINE" # Set to 1 to never touch the network
+STATIC_DIR = "static" # Served at app/static/ (server.enableStaticServing in .streamlit/config.toml)
+LOTTIE_PLAYER = "https://cdnjs.cloudflare.com/ajax/libs/lottie-web/5.9.6/lottie.min.js"
+
+# Remote animations used by the apps, with the bundled file to show when they can't be fetched
+LOTTIE_URLS = {
+    "empty_dashboard": ("https://assets1.lottiefiles.com/packages/lf20_VgJfK5.json", "assets/lottie/robot.json"),
+    "add_tool": ("https://assets2.lottiefiles.com/packages/lf20_DMgKk1.json", "assets/lottie/success.json"),
+}
+LOTTIE_FILES = ["assets/lottie/robot.json", "assets/lottie/loading.json", "assets/lottie/success.json"]
+
+
+class AssetManager:
+    """Loads Lottie animations once per process.
+
+    URL assets are persisted in a content-addressed disk cache
+    (<sha256>.json plus a url -> hash index), so later processes and offline
+    nodes never need the network. Failed fetches fall back to a bundled file
+    and are not retried until retry_after seconds have passed.
+    """
+
+    def __init__(self, cache_dir="assets/cache", timeout=5, retry_after=300):
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._loaded = {}
+        self._failed_at = {}
+        self._published = {}
+        self._lock = threading.Lock()
+        self._prefetch_thread = None
+
+    # --- Bundled Files ---
+    def load_file(self, path):
+        key = ("file", path)
+        if key not in self._loaded:
+            try:
+                with open(path, "r") as f:
+                    self._loaded[key] = json.load(f)
+            except (OSError, ValueError):
+                self._loaded[key] = None
+        return self._loaded[key]
+
+    # --- Disk Cache ---
+    def _index_path(self):
+        return os.path.join(self.cache_dir, "index.json")
+
+    def _read_index(self):
+        try:
+            with open(self._index_path(), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _read_cached(self, url):
+        digest = self._read_index().get(url)
+        if not digest:
+            return None
+        try:
+            with open(os.path.join(self.cache_dir, digest + ".json"), "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        if hashlib.sha256(content).hexdigest() != digest: # Corrupt or partial file
+            return None
+        return json.loads(content)
+
+    def _write_cached(self, url, content):
+        digest = hashlib.sha256(content).hexdigest()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        atomic_write(os.path.join(self.cache_dir, digest + ".json"), lambda f: f.write(content), mode="wb")
+        with self._lock:
+            index = self._read_index()
+            index[url] = digest
+            atomic_write(self._index_path(), lambda f: json.dump(index, f, indent=1))
+
+    # --- Network ---
+    def _offline(self):
+        return os.environ.get(OFFLINE_ENV, "").lower() in ("1", "true", "yes")
+
+    def _fetch(self, url):
+        failed_at = self._failed_at.get(url)
+        if self._offline() or (failed_at and time.monotonic() - failed_at < self.retry_after):
+            return None
+        import requests # Only needed when an animation isn't cached yet
+        try:
+            r = requests.get(url, timeout=self.timeout)
+            if r.status_code != 200:
+                raise ValueError(f"HTTP {r.status_code}")
+            data = json.loads(r.content)
+        except (requests.exceptions.RequestException, ValueError):
+            self._failed_at[url] = time.monotonic()
+            return None
+        self._write_cached(url, r.content)
+        return data
+
+    def load_url(self, url, fallback=None, block=True):
+        # Memory -> disk cache -> network (only if block) -> bundled fallback
+        key = ("url", url)
+        if self._loaded.get(key) is None:
+            data = self._read_cached(url)
+            if data is None and block:
+                data = self._fetch(url)
+            if data is not None:
+                self._loaded[key] = data
+        data = self._loaded.get(key)
+        if data is None and fallback:
+            return self.load_file(fallback)
+        return data
+
+    def load_named(self, name, block=False):
+        url, fallback = LOTTIE_URLS[name]
+        return self.load_url(url, fallback, block=block)
+
+    # --- Static Serving ---
+    def publish(self, data):
+        # Serialize once per animation and write it to static/lottie/<sha256>.json, so pages
+        # reference a cacheable URL instead of inlining the JSON; returns (digest, url)
+        entry = self._published.get(id(data))
+        if entry is None or entry[0] is not data:
+            content = json.dumps(data, separators=(",", ":")).encode("utf-8")
+            digest = hashlib.sha256(content).hexdigest()
+            path = os.path.join(STATIC_DIR, "lottie", digest + ".json")
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                atomic_write(path, lambda f: f.write(content), mode="wb")
+            entry = (data, digest, f"app/static/lottie/{digest}.json")
+            self._published[id(data)] = entry # Holding data keeps id() from being reused
+        return entry[1], entry[2]
+
+    # --- Startup ---
+    def prefetch(self, background=True):
+        # Warm every known asset once per process; URL fetches run off the render path
+        for path in LOTTIE_FILES:
+            self.load_file(path)
+
+        def fetch_all():
+            for url, fallback in LOTTIE_URLS.values():
+                self.load_url(url, fallback, block=True)
+
+        with self._lock:
+            if self._prefetch_thread is not None:
+                return
+            self._prefetch_thread = threading.Thread(target=fetch_all, name="lottie-prefetch", daemon=True)
+        if background:
+            self._prefetch_thread.start()
+        else:
+            fetch_all()
+
+
+def lottie_html(animation_id, height, source):
+    # Player markup; source is the loadAnimation option that supplies the animation
+    return f"""
+        <div class="lottie-container">
+            <script src="{LOTTIE_PLAYER}"></script>
+            <div id="{animation_id}" style="width: 100%; max-width: {height}px; height: auto;"></div>
+            <script>
+                var container = document.getElementById('{animation_id}');
+                if (container && !container.classList.contains('lottie-rendered')) {{ // Check if already rendered
+                    lottie.loadAnimation({{ 
+                        container: container, 
+                        renderer: 'svg', 
+                        loop: true, 
+                        autoplay: true, 
+                        {source} 
+                    }});
+                    container.classList.add('lottie-rendered'); // Mark as rendered
+                }}
+            </script>
+        </div>"""
+
+
+ASSETS = AssetManager()
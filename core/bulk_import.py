@@ -0,0 +1,94 @@
+# Streaming bulk import of tools into the dashboard catalog.
+# Usage: python -m core.bulk_import [--chunksize 10000] [--errors import_errors.csv] tools.csv
+import argparse
+import collections
+import csv
+import datetime
+
+import pandas as pd
+
+from core import dashboard_data
+from core.aggregates import CatalogStats
+from core.storage import DATE_FORMAT, parse_dates
+
+REQUIRED_COLUMNS = ['Name', 'Tool_Link', 'Category', 'Uploaded_By', 'Purpose']
+ERROR_COLUMNS = ['Row'] + REQUIRED_COLUMNS + ['Date_Time', 'Error']
+
+ImportReport = collections.namedtuple("ImportReport", "accepted rejected error_report")
+
+
+def read_chunks(source, chunksize):
+    # Raw text chunks of the upload (a path or file object); only one chunk is in memory at a time
+    chunks = pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False, skipinitialspace=True)
+    for chunk in chunks:
+        missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        if 'Date_Time' not in chunk.columns:
+            chunk['Date_Time'] = ''
+        yield chunk
+
+
+def prepare_chunk(chunk, now):
+    # Validated, normalized entries of one chunk, and the error message per row ('' when valid)
+    errors = dashboard_data.validate_frame(chunk)
+    entries = pd.DataFrame({col: chunk[col].str.strip() for col in REQUIRED_COLUMNS}, index=chunk.index)
+    raw_dates = chunk['Date_Time'].str.strip()
+    dates = parse_dates(raw_dates.where(raw_dates != ''))
+    bad_dates = (raw_dates != '') & dates.isna()
+    errors[bad_dates.to_numpy()] = (errors[bad_dates.to_numpy()] + " Date_Time: expected YYYY-MM-DD HH:MM:SS.").str.strip()
+    entries['Date_Time'] = dates.dt.strftime(DATE_FORMAT).where(raw_dates != '', now.strftime(DATE_FORMAT))
+    return entries, errors
+
+
+def import_tools(store, stats, source, chunksize=10_000, error_report=None, now=None):
+    # Append every valid row of a CSV upload to the catalog: chunks are validated with
+    # validate_frame, valid rows get serials in bulk and land in one locked pass (CSV) or one
+    # transaction (SQLite); rejected rows go to error_report with their data row number and reasons
+    now = now or datetime.datetime.now()
+    delta = CatalogStats()
+    counts = {"rejected": 0}
+    report = open(error_report, "w", newline="", encoding="utf-8") if error_report else None
+    try:
+        if report:
+            csv.writer(report).writerow(ERROR_COLUMNS)
+
+        def valid_chunks():
+            for chunk in read_chunks(source, chunksize):
+                entries, errors = prepare_chunk(chunk, now)
+                rejected = (errors != '').to_numpy()
+                if rejected.any():
+                    counts["rejected"] += int(rejected.sum())
+                    if report:
+                        bad = chunk[rejected].reindex(columns=REQUIRED_COLUMNS + ['Date_Time'])
+                        bad.insert(0, 'Row', bad.index + 1)
+                        bad['Error'] = errors[rejected]
+                        bad.to_csv(report, header=False, index=False)
+                accepted = entries[~rejected]
+                delta.merge(CatalogStats.from_frame(accepted, 'Category', 'Uploaded_By', 'Date_Time'))
+                yield accepted
+
+        dashboard_data.initialize_csv(store)
+        result = store.append_frames(valid_chunks())
+    finally:
+        if report:
+            report.close()
+    stats.record_bulk(delta, result)
+    return ImportReport(result.count, counts["rejected"], error_report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import tools into the dashboard catalog.")
+    parser.add_argument("source", help="CSV with Name, Tool_Link, Category, Uploaded_By, Purpose[, Date_Time]")
+    parser.add_argument("--catalog", default=dashboard_data.CSV_FILE)
+    parser.add_argument("--chunksize", type=int, default=10_000)
+    parser.add_argument("--errors", default="import_errors.csv", help="Where to write rejected rows")
+    args = parser.parse_args()
+
+    store = dashboard_data.open_dashboard_store(args.catalog)
+    report = import_tools(store, dashboard_data.open_stats(store), args.source, args.chunksize, args.errors)
+    print(f"imported {report.accepted} rows into {store.path}; rejected {report.rejected} (see {args.errors})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import threading
+
+
+class VersionedCache:
+    """In-process cache of values derived from a data source, keyed by data version.
+
+    Each name keeps only its latest version. A lookup with the same version
+    is served from memory; a new version reloads that one entry and leaves
+    the others alone. Values are shared, not copied, so callers must treat
+    them as read-only.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._locks = {}
+        self._counts = {}
+        self._guard = threading.Lock()
+
+    def _lock_for(self, name):
+        with self._guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _count(self, name, field):
+        counts = self._counts.setdefault(name, {"hits": 0, "misses": 0})
+        counts[field] += 1
+
+    def get(self, name, version, loader):
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            self._count(name, "hits")
+            return entry[1]
+        with self._lock_for(name): # One loader per name; concurrent sessions wait for its result
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == version:
+                self._count(name, "hits")
+                return entry[1]
+            self._count(name, "misses")
+            value = loader()
+            self._entries[name] = (version, value)
+            return value
+
+    def refresh(self, name, version, update):
+        # Like get(), but a new version calls update(previous value or None), so the loader can
+        # bring the old value up to date (e.g. read only appended rows) instead of starting over
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            self._count(name, "hits")
+            return entry[1]
+        with self._lock_for(name):
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == version:
+                self._count(name, "hits")
+                return entry[1]
+            self._count(name, "misses")
+            value = update(entry[1] if entry is not None else None)
+            self._entries[name] = (version, value)
+            return value
+
+    def advance(self, name, version_before, version_after, update):
+        # Patch an entry in place when the caller knows exactly which write moved the version
+        with self._lock_for(name):
+            entry = self._entries.get(name)
+            if entry is None or entry[0] != version_before:
+                return False
+            update(entry[1])
+            self._entries[name] = (version_after, entry[1])
+            return True
+
+    def invalidate(self, prefix=""):
+        # Drop only the entries whose name starts with prefix
+        for name in [name for name in self._entries if name.startswith(prefix)]:
+            self._entries.pop(name, None)
+
+    def stats(self):
+        counts = {name: dict(c) for name, c in self._counts.items()}
+        return {
+            "hits": sum(c["hits"] for c in counts.values()),
+            "misses": sum(c["misses"] for c in counts.values()),
+            "entries": len(self._entries),
+            "by_name": counts,
+        }
+
+
+# Shared by both apps and the storage layer; survives Streamlit reruns
+CACHE = VersionedCache()
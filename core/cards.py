@@ -0,0 +1,31 @@
+import html
+import math
+
+
+def page_bounds(total, page, page_size):
+    # Clamp the page number and return (page, page_count, start, stop)
+    page_count = max(1, math.ceil(total / page_size))
+    page = min(max(page, 0), page_count - 1)
+    start = page * page_size
+    return page, page_count, start, min(start + page_size, total)
+
+
+def build_cards_html(page_df, columns=3, dead_links=None):
+    # All cards of one page as a single HTML grid, built column-wise instead of row by row;
+    # dead_links maps a website to the reason its last check failed
+    dead_links = dead_links or {}
+    names = page_df["name"].fillna("").astype(str).map(html.escape)
+    raw_websites = page_df["website"].fillna("").astype(str)
+    websites = raw_websites.map(html.escape)
+    categories = page_df["categories"].fillna("").astype(str).str.replace("|", ", ", regex=False).map(html.escape)
+    warnings = [
+        f'<p class="dead-link">⚠️ Link may be down ({html.escape(dead_links[site])})</p>' if site in dead_links else ""
+        for site in raw_websites
+    ]
+    cards = [
+        f'<div class="card"><h3>{name}</h3>'
+        f'<p><a href="{site}" target="_blank">{site}</a></p>{warning}'
+        f'<p><strong>Categories:</strong> {cats}</p></div>'
+        for name, site, warning, cats in zip(names, websites, warnings, categories)
+    ]
+    return f'<div class="card-grid" style="grid-template-columns: repeat({columns}, minmax(0, 1fr));">{"".join(cards)}</div>'
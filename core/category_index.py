@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+
+class CategoryIndex:
+    """Inverted index over a pipe-delimited categories column.
+
+    Keeps a posting list (category -> set of row positions) for OR/AND filters
+    as set operations, plus a multi-hot matrix (rows x categories) built
+    vectorized for mask-style filtering. Row positions follow the frame's
+    row order.
+    """
+
+    def __init__(self, postings, row_categories):
+        self.postings = postings
+        self.row_categories = row_categories
+        self._categories = None
+        self._matrix = None # Allocated with spare rows/columns so set_row can fill it in place
+        self._column_of = None
+
+    @classmethod
+    def build(cls, series, sep="|"):
+        split = series.fillna("").astype(str).str.split(sep)
+        exploded = split.explode()
+        exploded = exploded[exploded.str.len() > 0]
+        positions = pd.Series(np.arange(len(series)), index=series.index).loc[exploded.index].to_numpy()
+        postings = {cat: set(rows.tolist()) for cat, rows in pd.Series(positions).groupby(exploded.to_numpy())}
+        row_categories = [tuple(c for c in cats if c) for cats in split]
+        return cls(postings, row_categories)
+
+    def __len__(self):
+        return len(self.row_categories)
+
+    # --- Lookups ---
+    def categories(self):
+        if self._categories is None:
+            self._categories = sorted(cat for cat, rows in self.postings.items() if rows)
+        return self._categories
+
+    def rows(self, categories, match="any"):
+        sets = [self.postings.get(cat, set()) for cat in categories]
+        if not sets:
+            return set(range(len(self)))
+        return set.union(*sets) if match == "any" else set.intersection(*sets)
+
+    def matrix(self):
+        # Multi-hot (rows x categories) boolean matrix; columns follow self._column_of
+        if self._matrix is None:
+            self._column_of = {cat: col for col, cat in enumerate(self.postings)}
+            matrix = np.zeros((len(self), len(self._column_of)), dtype=bool)
+            for cat, col in self._column_of.items():
+                matrix[list(self.postings[cat]), col] = True
+            self._matrix = matrix
+        return self._matrix[:len(self), :len(self._column_of)]
+
+    def mask(self, categories, match="any"):
+        if not categories:
+            return np.ones(len(self), dtype=bool)
+        matrix = self.matrix()
+        columns = [self._column_of[cat] for cat in set(categories) if cat in self._column_of]
+        if match == "all" and len(columns) < len(set(categories)):
+            return np.zeros(len(self), dtype=bool)
+        selected = matrix[:, columns]
+        return selected.any(axis=1) if match == "any" else selected.all(axis=1)
+
+    def _grow(self, rows, columns):
+        # Room for at least rows x columns, doubling so appends stay amortized O(1)
+        height, width = self._matrix.shape
+        if rows <= height and columns <= width:
+            return
+        grown = np.zeros((max(rows, 2 * height) if rows > height else height,
+                          max(columns, 2 * width) if columns > width else width), dtype=bool)
+        grown[:height, :width] = self._matrix
+        self._matrix = grown
+
+    # --- Incremental Updates ---
+    def set_row(self, position, categories_str, sep="|"):
+        # Add (position == len) or replace the categories of a single row
+        categories = tuple(c for c in str(categories_str or "").split(sep) if c)
+        if position == len(self):
+            self.row_categories.append(())
+        for cat in self.row_categories[position]:
+            self.postings[cat].discard(position)
+        for cat in categories:
+            self.postings.setdefault(cat, set()).add(position)
+        self.row_categories[position] = categories
+        self._categories = None
+        if self._matrix is not None: # Keep the matrix current instead of rebuilding it
+            for cat in categories:
+                self._column_of.setdefault(cat, len(self._column_of))
+            self._grow(len(self), len(self._column_of))
+            self._matrix[position] = False
+            self._matrix[position, [self._column_of[cat] for cat in categories]] = True
+
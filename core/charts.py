@@ -0,0 +1,56 @@
+from core.cache import CACHE
+
+
+def category_pie(category_counts):
+    import plotly.express as px # Plotly loads on first chart build, not at app import
+    fig = px.pie(values=category_counts.values, names=category_counts.index, hole=0.4,
+                 color_discrete_sequence=px.colors.qualitative.Pastel) # Example color sequence
+    fig.update_traces(textposition='inside', textinfo='percent+label', marker=dict(line=dict(color='#FFFFFF', width=1)))
+    fig.update_layout(showlegend=True, height=350, font=dict(family="Poppins", size=11),
+                      paper_bgcolor='rgba(0,0,0,0)',
+                      legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    return fig
+
+
+def cumulative_line(buckets):
+    # Running total per bucket (dashboard_data.timeline keeps it to MAX_BUCKETS points)
+    import plotly.express as px
+    fig = px.line(buckets, x='Date', y='Cumulative', markers=len(buckets) < 100, # Markers only while they stay readable
+                  color_discrete_sequence=['#764ba2']) # Using a partner color
+    fig.update_traces(line=dict(width=2.5), marker=dict(size=6))
+    fig.update_layout(height=350, font=dict(family="Poppins", size=11),
+                      paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                      xaxis=dict(gridcolor='rgba(0,0,0,0.05)'), yaxis=dict(gridcolor='rgba(0,0,0,0.05)'))
+    return fig
+
+
+def stacked_bars(buckets, label):
+    # Tools added per bucket, one stacked color per column of `buckets` after Date
+    import plotly.express as px
+    long = buckets.melt(id_vars='Date', var_name=label, value_name='Tools')
+    fig = px.bar(long, x='Date', y='Tools', color=label, color_discrete_sequence=px.colors.qualitative.Pastel)
+    fig.update_layout(height=350, font=dict(family="Poppins", size=11), barmode='stack', bargap=0.1,
+                      paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                      xaxis=dict(gridcolor='rgba(0,0,0,0.05)'), yaxis=dict(gridcolor='rgba(0,0,0,0.05)'),
+                      legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    return fig
+
+
+def domain_bar(domain_counts):
+    # Horizontal bars of tools per domain (biggest on top), split by contributor
+    import plotly.express as px
+    domains = list(dict.fromkeys(domain_counts['Domain']))
+    fig = px.bar(domain_counts, x='Tools', y='Domain', color='Uploaded_By', orientation='h',
+                 category_orders={'Domain': domains}, labels={'Uploaded_By': 'Added By'},
+                 color_discrete_sequence=px.colors.qualitative.Pastel)
+    fig.update_layout(height=max(250, 28 * len(domains) + 120), font=dict(family="Poppins", size=11),
+                      paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', barmode='stack',
+                      xaxis=dict(gridcolor='rgba(0,0,0,0.05)'), yaxis=dict(title=None),
+                      legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    return fig
+
+
+def cached_figure(chart, version, build):
+    # One figure per chart type and data version; reruns that don't change the data
+    # (navigation, widget clicks) reuse the built figure instead of calling Plotly Express
+    return CACHE.get(f"figure:{chart}", version, build)
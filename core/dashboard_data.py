@@ -0,0 +1,288 @@
+# Data layer of dashboard.py (CSV_COLUMNS schema), importable without Streamlit.
+# Functions take the store explicitly and raise on failure; the dashboard reports errors in the UI.
+import collections
+import datetime
+import math
+import os
+
+import pandas as pd
+
+from core.aggregates import StatsStore, bucket_for, rollup
+from core.cache import CACHE
+from core.duplicate_index import DuplicateIndex
+from core.link_health import LinkHealth, describe
+from core.search import SearchStore
+from core.storage import DATE_FORMAT, CsvStore, open_store
+from core.urls import UrlParts
+
+CSV_FILE = "ai_tools_database.csv"
+CSV_COLUMNS = ['Serial_Number', 'Name', 'Tool_Link', 'Category', 'Uploaded_By', 'Date_Time', 'Purpose']
+UPLOADER_NAMES = ["Select your name", "Vamsi Krishna Yevvari", "Rayna", "Vijayashree", "Saakshi", "Sneha", "Sachin", "Manjunath", "Shamanth", "Swaroop", "Shahid", "Other"]
+TOOL_CATEGORIES = ["Select Category", "Content Creation", "Image Generation", "Data Analysis",
+                   "Social Media Management", "Email Marketing", "SEO Tools", "Video Editing",
+                   "Voice/Audio", "Translation", "Chatbots", "Design Tools", "Analytics",
+                   "Productivity", "Research", "Code Generation", "Developer Tools", "Other"]
+SEARCH_FIELDS = {'Name': 2.0, 'Purpose': 1.0, 'Category': 1.0} # Column -> BM25 term weight
+DISPLAY_DATE_FORMAT = '%b %d, %Y %H:%M'
+DEAD_LINKS_SHOWN = 200 # Dead links listed on the dashboard, most recently checked first
+TOP_DOMAINS = 15 # Domains charted on the dashboard
+TIMELINE_GROUPS = 8 # Categories/contributors drawn separately on the timeline; the rest add up to "Others"
+
+# One page of the explorer; page is 0-based and already clamped to the last page
+Page = collections.namedtuple("Page", "rows total page page_count")
+
+
+def open_dashboard_store(path=CSV_FILE):
+    # Backend chosen by AI_TOOLS_BACKEND=csv|sqlite; CSV appends single rows, SQLite pushes queries down to indexes
+    # Low-cardinality columns load as categoricals; the other text columns as pyarrow strings.
+    # Every write is logged to <path>.history/ (see core.history)
+    return open_store(path, CSV_COLUMNS, serial_column='Serial_Number', date_column='Date_Time',
+                      indexes=['Serial_Number', 'Name', 'Category', 'Uploaded_By', 'Date_Time'],
+                      dtypes={'Category': 'category', 'Uploaded_By': 'category'}, history_key='Serial_Number')
+
+
+def open_stats(store):
+    # Dashboard aggregates persisted next to the data and updated per added row
+    return StatsStore(store, 'Category', 'Uploaded_By')
+
+
+def open_search(store):
+    # Full-text index over Name/Purpose/Category persisted next to the data; hits are Serial_Numbers
+    return SearchStore(store, SEARCH_FIELDS, key_column='Serial_Number')
+
+
+def open_link_health(store):
+    # Background-checked health of the Tool_Link column (<path>.links.json)
+    return LinkHealth(store, 'Tool_Link')
+
+
+def initialize_csv(store):
+    if store.history is not None:
+        store.history.restore() # A lost data file comes back from the change log
+    if not isinstance(store, CsvStore): # Database backends create their own schema
+        store.initialize()
+    elif not os.path.exists(store.path):
+        store.initialize()
+    else:
+        try:
+            header = pd.read_csv(store.path, nrows=0).columns # Header only, no full-file scan
+            # Check and add 'Tool_Link' if missing (for backward compatibility)
+            if 'Tool_Link' not in header and 'Name' in header:
+                df_existing = pd.read_csv(store.path)
+                name_idx = df_existing.columns.get_loc('Name')
+                df_existing.insert(name_idx + 1, 'Tool_Link', pd.NA)
+                store.write(df_existing.reindex(columns=CSV_COLUMNS)) # Locked, atomic rewrite
+        except pd.errors.EmptyDataError:
+            store.initialize()
+        except Exception: pass
+
+
+def read_dashboard_frame(store):
+    df = store.frame().copy(deep=False) # The cached frame is shared; columns are replaced below
+    if df.empty: return pd.DataFrame(columns=CSV_COLUMNS)
+
+    # Ensure all defined columns exist, fill with NA if not
+    for col in CSV_COLUMNS:
+        if col not in df.columns:
+            df[col] = pd.NA
+
+    df['Date_Time'] = pd.to_datetime(df['Date_Time'], errors='coerce') # No-op for the store's parsed column
+    df['Tool_Link'] = df['Tool_Link'].fillna('') # Ensure Tool_Link is never NaN for display
+
+    # Return DataFrame with columns in the defined order
+    return df[CSV_COLUMNS].sort_values('Date_Time', ascending=False)
+
+
+def load_data(store):
+    # Served from memory until the store's data version changes (no TTL, no global clear)
+    initialize_csv(store)
+    return CACHE.get(f"{store.path}:dashboard", store.version(), lambda: read_dashboard_frame(store))
+
+
+def timeline(stats, by=None, start=None, end=None):
+    # Tools added between start and end (dates, inclusive; default: all days with entries) in
+    # buckets sized by aggregates.bucket_for, so any range plots at most MAX_BUCKETS points.
+    # by=None gives Count and running Cumulative per bucket, by='category'|'contributor' one
+    # column per group; returns (frame, bucket). Every view comes from the persisted per-day
+    # counts (by Date_Time), so all of them place a row on the same day
+    daily = stats.daily_counts() if by is None else stats.daily_by(by)
+    if daily.empty:
+        return daily, 'day'
+    start, end = start or min(daily['Date']), end or max(daily['Date'])
+    bucket = bucket_for(start, end)
+    if by is None:
+        buckets = rollup(daily[['Date', 'Count']], bucket, start, end)
+        buckets['Cumulative'] = buckets['Count'].cumsum() + int(daily.loc[daily['Date'] < start, 'Count'].sum())
+        return buckets, bucket
+    buckets = rollup(daily, bucket, start, end)
+    totals = buckets.drop(columns='Date').sum().sort_values(ascending=False, kind='stable')
+    totals = totals[totals > 0]
+    if len(totals) > TIMELINE_GROUPS:
+        shown = list(totals.index[:TIMELINE_GROUPS - 1])
+        buckets['Others'] = buckets[totals.index[TIMELINE_GROUPS - 1:]].sum(axis=1)
+        return buckets[['Date'] + shown + ['Others']], bucket
+    return buckets[['Date'] + list(totals.index)], bucket
+
+
+def url_parts(store):
+    # Scheme/host/domain/path of every Tool_Link as categorical columns row-aligned with
+    # store.frame(); a new data version parses only links not seen in the previous one
+    version = store.version()
+    return CACHE.refresh(f"{store.path}:url_parts", version,
+                         lambda previous: UrlParts.build(store.frame()['Tool_Link'], previous))
+
+
+def domain_counts(store, contributor=None, top=TOP_DOMAINS):
+    # Tools per (registrable domain of their link, contributor) for the `top` domains with the
+    # most tools (only `contributor`'s tools when given); Domain/Uploaded_By/Tools, biggest first
+    def load():
+        frame = store.frame()
+        parts = url_parts(store)
+        if len(parts) != len(frame): # A write landed between the two reads
+            parts = UrlParts.build(frame['Tool_Link'], parts)
+        pairs = pd.DataFrame({'Domain': parts.columns['domain'].to_numpy(),
+                              'Uploaded_By': frame['Uploaded_By'].to_numpy()})
+        pairs = pairs[pairs['Domain'] != '']
+        if contributor is not None:
+            pairs = pairs[pairs['Uploaded_By'] == contributor]
+        counts = pairs.groupby(['Domain', 'Uploaded_By'], observed=True).size()
+        totals = counts.groupby(level='Domain', observed=True).sum()
+        domains = totals[totals > 0].sort_values(ascending=False, kind='stable').index[:top]
+        counts = counts[counts.index.get_level_values('Domain').isin(domains) & (counts > 0)]
+        rank = {domain: i for i, domain in enumerate(domains)}
+        return (counts.rename('Tools').reset_index()
+                .sort_values(['Domain', 'Tools'], key=lambda s: s.map(rank) if s.name == 'Domain' else -s)
+                .reset_index(drop=True))
+
+    initialize_csv(store)
+    return CACHE.get(f"{store.path}:domain_counts:{contributor}", store.version(), load)
+
+
+def get_duplicate_index(store):
+    # Name/URL duplicate lookups, built once per data version (version read first, so a
+    # concurrent write can only make the index newer than its tag, never older)
+    version = store.version()
+    return CACHE.get(f"{store.path}:duplicate_index", version,
+                     lambda: DuplicateIndex.build(*(load_data(store)[col] for col in ('Name', 'Tool_Link'))))
+
+
+def find_duplicates(store, name, tool_link):
+    # Entries with the same normalized name or canonical URL, then ones with a similar name
+    return get_duplicate_index(store).check(name, tool_link)
+
+
+def search_entries(store, search, query, limit=50):
+    # Best `limit` entries for the query (every word must match, the last one also as a prefix),
+    # fetched by serial number so only the hits are materialized; ranked best first
+    initialize_csv(store)
+    serials, scores = search.get().search(query, limit=limit)
+    if not len(serials):
+        return pd.DataFrame(columns=CSV_COLUMNS)
+    hits = store.select(filters=[('Serial_Number', 'in', serials.tolist())])
+    rank = {serial: i for i, serial in enumerate(serials.tolist())}
+    return hits.sort_values('Serial_Number', key=lambda s: s.map(rank)).reset_index(drop=True)
+
+
+def dead_link_entries(store, link_health):
+    # Entries whose link failed its last check, with the reason; only the newest DEAD_LINKS_SHOWN
+    # dead links are looked up, and the result is kept until the data or the check results change
+    def load():
+        dead = sorted(link_health.dead().values(), key=lambda result: -result.checked_at)[:DEAD_LINKS_SHOWN]
+        if not dead:
+            return pd.DataFrame(columns=CSV_COLUMNS + ['Link_Status'])
+        rows = store.select(filters=[('Tool_Link', 'in', [result.url for result in dead])])
+        rows = format_rows(rows)
+        rows['Link_Status'] = rows['Tool_Link'].map({result.url: describe(result) for result in dead})
+        return rows
+
+    initialize_csv(store)
+    return CACHE.get(f"{store.path}:dead_link_entries", (store.version(), link_health.version()), load)
+
+
+def explorer_filters(categories=(), contributors=(), start=None, end=None):
+    # Store filters for the explorer; empty selections don't filter, end is an inclusive date
+    filters = []
+    if categories:
+        filters.append(('Category', 'in', list(categories)))
+    if contributors:
+        filters.append(('Uploaded_By', 'in', list(contributors)))
+    if start:
+        filters.append(('Date_Time', '>=', pd.Timestamp(start)))
+    if end:
+        filters.append(('Date_Time', '<', pd.Timestamp(end) + pd.Timedelta(days=1)))
+    return filters
+
+
+def fetch_page(store, filters, order_by='Date_Time', descending=True, page=0, page_size=50):
+    # Filtering, sorting and slicing happen in the store (cached row order for CSV, LIMIT/OFFSET
+    # for SQLite), so only the page's rows are materialized; a page past the end shows the last one
+    initialize_csv(store)
+    rows, total = store.select_page(filters, order_by, descending, limit=page_size, offset=page * page_size)
+    page_count = max(1, math.ceil(total / page_size))
+    if page >= page_count and total:
+        page = page_count - 1
+        rows, total = store.select_page(filters, order_by, descending, limit=page_size, offset=page * page_size)
+    return Page(format_rows(rows), total, min(page, page_count - 1), page_count)
+
+
+def format_rows(rows):
+    # Display copy of the few rows shown: links are never NaN, timestamps formatted once
+    rows = rows.reindex(columns=CSV_COLUMNS).reset_index(drop=True)
+    rows['Tool_Link'] = rows['Tool_Link'].fillna('')
+    rows['Date_Time'] = pd.to_datetime(rows['Date_Time'], errors='coerce').dt.strftime(DISPLAY_DATE_FORMAT)
+    return rows
+
+
+def validate_inputs(name, tool_link, category, uploaded_by, purpose):
+    errors = []
+    if not name or len(name.strip()) < 2: errors.append("Tool name: min 2 characters.")
+    if tool_link and not (tool_link.strip().startswith("http://") or tool_link.strip().startswith("https://")):
+        errors.append("Tool link: must be a valid URL (http:// or https://).")
+    if not category or category == "Select Category": errors.append("Category: please select one.")
+    if not uploaded_by or uploaded_by == "Select your name": errors.append("Your Name: please select from dropdown.")
+    if not purpose or len(purpose.strip()) < 5: errors.append("Purpose: min 5 characters.")
+    return errors
+
+
+def validate_frame(df):
+    # Vectorized validate_inputs over a frame of submissions, plus the category and contributor
+    # whitelists the form enforces with its dropdowns; one message per row, '' when valid
+    def text(col):
+        return df[col].fillna('').astype(str).str.strip()
+    name, link, purpose = text('Name'), text('Tool_Link'), text('Purpose')
+    checks = [
+        (name.str.len() < 2, "Tool name: min 2 characters."),
+        ((link != '') & ~link.str.startswith(("http://", "https://")),
+         "Tool link: must be a valid URL (http:// or https://)."),
+        (~text('Category').isin(TOOL_CATEGORIES[1:]), "Category: not one of the known categories."),
+        (~text('Uploaded_By').isin(UPLOADER_NAMES[1:]), "Your Name: not one of the known contributors."),
+        (purpose.str.len() < 5, "Purpose: min 5 characters."),
+    ]
+    errors = pd.Series('', index=df.index, dtype=object)
+    for failed, message in checks:
+        errors[failed.to_numpy()] += message + ' '
+    return errors.str.rstrip()
+
+
+def new_entry(name, tool_link, category, uploaded_by, purpose, now=None):
+    return {
+        'Name': name.strip(),
+        'Tool_Link': tool_link.strip() if tool_link else '',
+        'Category': category,
+        'Uploaded_By': uploaded_by.strip(), # .strip() in case "Other " was selected with space
+        'Date_Time': (now or datetime.datetime.now()).strftime(DATE_FORMAT),
+        'Purpose': purpose.strip()
+    }
+
+
+def add_entry(store, stats, name, tool_link, category, uploaded_by, purpose, search=None):
+    # Appends one row (Serial_Number comes from the store's persisted counter), bumps the
+    # persisted aggregates, search index and duplicate index for it; returns the AppendResult
+    initialize_csv(store)
+    result = store.append(new_entry(name, tool_link, category, uploaded_by, purpose))
+    stats.record(result)
+    if search is not None:
+        search.record(None, result.record, result.version_before, result.version_after)
+    CACHE.advance(f"{store.path}:duplicate_index", result.version_before, result.version_after,
+                  lambda index: index.set_row(len(index), result.record['Name'], result.record['Tool_Link']))
+    return result
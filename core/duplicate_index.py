@@ -0,0 +1,195 @@
+import collections
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from core.urls import canonical_url, canonical_urls
+
+# reason is "name" (same normalized name), "url" (same canonical URL) or "similar" (name trigrams)
+Match = collections.namedtuple("Match", "position name url reason score")
+
+NUM_HASHES = 16 # MinHash signature length
+BAND_SIZE = 2 # Signature values per LSH band, so NUM_HASHES // BAND_SIZE bands
+SIMILARITY = 0.5 # Trigram Jaccard from which a name counts as a near duplicate
+_RNG = np.random.default_rng(20240601)
+_HASH_A = _RNG.integers(1, 2**63, NUM_HASHES, dtype=np.uint64) | np.uint64(1) # Odd multipliers
+_HASH_B = _RNG.integers(0, 2**63, NUM_HASHES, dtype=np.uint64)
+_EMPTY = np.uint32(0xFFFFFFFF) # Signature of a name without trigrams; never matched
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize_name(name):
+    # "Chat-GPT", "chat gpt" and "ChatGPT " share the key "chatgpt"
+    if not isinstance(name, str):
+        return ""
+    return _NON_ALNUM.sub("", unicodedata.normalize("NFKC", name).casefold())
+
+
+def normalize_names(names):
+    # Vectorized normalize_name over a Series
+    names = names.astype(object).where(names.notna(), "").astype(str)
+    return names.str.normalize("NFKC").str.casefold().str.replace(r"[\W_]+", "", regex=True).astype(object)
+
+
+def _trigrams(key):
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _signatures(keys):
+    # MinHash signatures (len(keys) x NUM_HASHES) of the padded keys' character trigrams, computed
+    # for all keys at once: each trigram becomes one integer from its three code points
+    padded = [f" {key} " for key in keys]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    counts = np.maximum(lengths - 2, 0) # Trigrams per key
+    signatures = np.full((len(padded), NUM_HASHES), _EMPTY, dtype=np.uint32)
+    if not counts.any():
+        return signatures
+    chars = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    codes = (chars[:-2] << np.uint64(42)) | (chars[1:-1] << np.uint64(21)) | chars[2:]
+    firsts = np.cumsum(counts) - counts # Offset of each key's first trigram in the flat list
+    starts = np.cumsum(lengths) - lengths
+    codes = codes[np.repeat(starts - firsts, counts) + np.arange(counts.sum())]
+    has = counts > 0
+    for j in range(NUM_HASHES):
+        hashes = ((_HASH_A[j] * codes + _HASH_B[j]) >> np.uint64(32)).astype(np.uint32) # Multiply-shift
+        signatures[has, j] = np.minimum.reduceat(hashes, firsts[has])
+    return signatures
+
+
+def _positions_by_key(keys):
+    # key -> row positions, skipping empty keys; keys seen once take the fast path
+    keys = pd.Series(keys, dtype=object)
+    present = (keys != "").to_numpy()
+    repeated = keys.duplicated(keep=False).to_numpy() & present
+    single = present & ~repeated
+    table = {key: [position] for key, position in zip(keys[single], np.flatnonzero(single).tolist())}
+    if repeated.any():
+        table.update(pd.Series(np.flatnonzero(repeated)).groupby(keys[repeated].to_numpy()).agg(list).to_dict())
+    return table
+
+
+def _band_keys(signatures):
+    # One 64-bit key per band; rows that agree on a whole band become candidates of each other
+    pairs = signatures.astype(np.uint64).reshape(len(signatures), -1, BAND_SIZE)
+    return (pairs[:, :, 0] << np.uint64(32)) | pairs[:, :, 1]
+
+
+class DuplicateIndex:
+    """Exact and near-duplicate lookups over a catalog's tool names and URLs.
+
+    Exact duplicates come from hash maps on the normalized name and the
+    canonical URL (O(1) per check). Near duplicates come from MinHash
+    signatures of the name's character trigrams, bucketed by LSH bands
+    (sorted per band, binary-searched) and verified by exact Jaccard.
+    Rows added or replaced since the last sort are scanned directly until
+    there are enough of them to re-sort. Positions follow the frame's row
+    order; the index keeps its own copy of names and URLs for display.
+    """
+
+    def __init__(self, names, urls, name_keys, url_keys, signatures):
+        self.names = names
+        self.urls = urls
+        self.name_keys = name_keys
+        self.url_keys = url_keys
+        self.by_name = _positions_by_key(name_keys)
+        self.by_url = _positions_by_key(url_keys)
+        self._signatures = signatures
+        self._bands = _band_keys(signatures)
+        self._sort()
+
+    @classmethod
+    def build(cls, names, urls):
+        name_keys = normalize_names(names).tolist()
+        return cls(names.astype(object).where(names.notna(), "").tolist(),
+                   urls.astype(object).where(urls.notna(), "").tolist(),
+                   name_keys, canonical_urls(urls).tolist(), _signatures(name_keys))
+
+    def __len__(self):
+        return len(self.names)
+
+    def _sort(self):
+        count = len(self)
+        self._order = np.argsort(self._bands[:count], axis=0, kind="stable")
+        self._sorted = np.take_along_axis(self._bands[:count], self._order, axis=0)
+        self._pending = set() # Positions whose signature isn't in the sorted bands yet
+
+    # --- Lookups ---
+    def exact(self, name, url):
+        # Rows with the same normalized name or the same canonical URL
+        matches = {}
+        url_key = canonical_url(url)
+        for position in self.by_url.get(url_key, ()) if url_key else ():
+            matches[position] = Match(position, self.names[position], self.urls[position], "url", 1.0)
+        for position in self.by_name.get(normalize_name(name), ()):
+            matches[position] = Match(position, self.names[position], self.urls[position], "name", 1.0)
+        return sorted(matches.values())
+
+    def _candidates(self, bands):
+        found = np.zeros(len(self), dtype=bool)
+        found[list(self._pending)] = True
+        for band, key in enumerate(bands):
+            column = self._sorted[:, band]
+            lo, hi = np.searchsorted(column, key, "left"), np.searchsorted(column, key, "right")
+            found[self._order[lo:hi, band]] = True
+        return np.flatnonzero(found)
+
+    def similar(self, name, threshold=SIMILARITY, limit=5, exclude=()):
+        # Up to `limit` rows whose name trigrams overlap the given name's by at least `threshold`
+        key = normalize_name(name)
+        if not key:
+            return []
+        signature = _signatures([key])
+        candidates = self._candidates(_band_keys(signature)[0])
+        if not len(candidates):
+            return []
+        # Rank by estimated similarity (signature agreement), then verify the best few exactly
+        agreement = (self._signatures[candidates] == signature).mean(axis=1)
+        ranked = candidates[np.argsort(-agreement, kind="stable")[:max(limit * 4, 20)]]
+        trigrams = _trigrams(key)
+        matches = []
+        for position in ranked.tolist():
+            if position in exclude or not self.name_keys[position]:
+                continue
+            other = _trigrams(self.name_keys[position])
+            score = len(trigrams & other) / len(trigrams | other)
+            if score >= threshold:
+                matches.append(Match(position, self.names[position], self.urls[position], "similar", round(score, 2)))
+        return sorted(matches, key=lambda match: -match.score)[:limit]
+
+    def check(self, name, url, threshold=SIMILARITY, limit=5):
+        # Exact duplicates first, then near duplicates of the name not already listed
+        exact = self.exact(name, url)
+        return exact + self.similar(name, threshold, limit, exclude={match.position for match in exact})
+
+    # --- Incremental Updates ---
+    def set_row(self, position, name, url):
+        # Add (position == len) or replace the name and URL of a single row
+        name_key, url_key = normalize_name(name), canonical_url(url)
+        if position == len(self):
+            self.names.append("")
+            self.urls.append("")
+            self.name_keys.append("")
+            self.url_keys.append("")
+            if position == len(self._signatures): # Grow the arrays geometrically
+                grow = max(len(self._signatures), 64)
+                self._signatures = np.concatenate([self._signatures, np.full((grow, NUM_HASHES), _EMPTY, np.uint32)])
+                self._bands = np.concatenate([self._bands, _band_keys(self._signatures[-grow:])])
+        old_name, old_url = self.name_keys[position], self.url_keys[position]
+        for table, old, new in ((self.by_name, old_name, name_key), (self.by_url, old_url, url_key)):
+            if old:
+                table[old].remove(position)
+            if new:
+                table.setdefault(new, []).append(position)
+        self.names[position] = name if isinstance(name, str) else ""
+        self.urls[position] = url if isinstance(url, str) else ""
+        self.name_keys[position], self.url_keys[position] = name_key, url_key
+        if name_key != old_name or position >= len(self._order):
+            # Stale band entries of a replaced name only yield candidates that fail verification
+            self._signatures[position] = _signatures([name_key])[0]
+            self._bands[position] = _band_keys(self._signatures[position:position + 1])[0]
+            self._pending.add(position)
+            if len(self._pending) > max(1024, len(self) // 16):
+                self._sort()
@@ -0,0 +1,93 @@
+import importlib.util
+import os
+import tempfile
+
+from core.cache import CACHE
+from core.locking import atomic_write
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "ai_tools_exports")
+
+
+def write_excel(df, target, sheet_name="AI Tools"):
+    # openpyxl write-only workbook: rows stream out as they are appended, so memory
+    # stays flat regardless of table size (openpyxl is only imported on export)
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    header = []
+    for col in df.columns:
+        cell = WriteOnlyCell(ws, value=str(col))
+        cell.font = Font(bold=True)
+        header.append(cell)
+    ws.append(header)
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        ws.append(row)
+    wb.save(target)
+
+
+def to_excel(df, sheet_name="AI Tools"):
+    # Whole workbook as bytes (small tables / callers that need bytes directly)
+    from io import BytesIO
+    output = BytesIO()
+    write_excel(df, output, sheet_name)
+    return output.getvalue()
+
+
+def write_csv(df, target):
+    df.to_csv(target, index=False)
+
+
+def write_csv_gzip(df, target):
+    # mtime=0 keeps the bytes identical for identical data
+    df.to_csv(target, index=False, compression={"method": "gzip", "mtime": 0})
+
+
+def write_parquet(df, target):
+    df.to_parquet(target, index=False)
+
+
+def write_arrow(df, target):
+    # Arrow IPC file (Feather v2); requires a default index
+    df.reset_index(drop=True).to_feather(target)
+
+
+def pyarrow_available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def export_formats():
+    # label -> (writer, file suffix, MIME type); columnar formats only when pyarrow is installed
+    formats = {
+        "CSV": (write_csv, ".csv", "text/csv"),
+        "CSV (gzip)": (write_csv_gzip, ".csv.gz", "application/gzip"),
+    }
+    if pyarrow_available():
+        formats["Parquet"] = (write_parquet, ".parquet", "application/vnd.apache.parquet")
+        formats["Arrow IPC"] = (write_arrow, ".arrow", "application/vnd.apache.arrow.file")
+    return formats
+
+
+def cached_export(name, version, write_fn, suffix):
+    # Build the export file once per data version; later calls reuse the file on disk
+    def build():
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        path = os.path.join(EXPORT_DIR, f"{name}-{os.getpid()}{suffix}")
+        atomic_write(path, write_fn, mode="wb")
+        return path
+    return CACHE.get(f"export:{name}", version, build)
+
+
+def deferred_download(name, version, write_fn, suffix):
+    # Zero-argument callable for st.download_button(data=...): nothing is generated
+    # until the user clicks, and repeated clicks on the same version hit the cache.
+    # version may be a callable to resolve the data version at click time.
+    def data():
+        current = version() if callable(version) else version
+        with open(cached_export(name, current, write_fn, suffix), "rb") as f:
+            return f.read()
+    return data
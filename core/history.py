@@ -0,0 +1,339 @@
+# Write-ahead change log of a catalog store, with periodic snapshots (point-in-time history).
+# The store stages each write's entries and appends them here, under its write lock, just before
+# the data changes: added rows in full, updates as only the fields that changed, rewrites as a
+# snapshot of the new table. Entries live in segments (<path>.history/<seq>.log, one JSON line
+# each); every SNAPSHOT_EVERY entries the replayed table is saved as <seq>.csv and a new segment
+# starts. The newest KEEP_SNAPSHOTS snapshots are kept; before them only one periodic snapshot in
+# THIN_EVERY is, while every segment stays, so the catalog as of any moment is one snapshot read
+# plus at most THIN_EVERY segments replayed.
+import datetime
+import json
+import os
+import re
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from core.cache import CACHE
+from core.locking import atomic_write
+from core.storage import DATE_FORMAT, concat_rows
+
+SNAPSHOT_EVERY = 1000 # Log entries between two snapshots (one per added row batch or update)
+KEEP_SNAPSHOTS = 10 # Newest snapshots kept in full
+THIN_EVERY = 10 # Older periodic snapshots: one kept per this many segments
+SPOOL_BYTES = 1 << 20 # Staged entries stay in memory up to this size, then spill to a temp file
+_SEQ = re.compile(rb'^\{"seq":(\d+)')
+
+
+def _json_value(value):
+    if isinstance(value, (pd.Timestamp, datetime.datetime)):
+        return value.strftime(DATE_FORMAT)
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class _Staged:
+    """Entries of one store write, held until the write is about to land.
+
+    Seqs are assigned as entries are staged (the store's write lock is held
+    throughout); commit() appends them to the log, discard() drops them.
+    """
+
+    def __init__(self, log, segment, seq, at):
+        self.log = log
+        self.segment = segment
+        self.seq = seq
+        self.at = at
+        self.snapshot = None
+        self.spool = tempfile.SpooledTemporaryFile(SPOOL_BYTES)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.discard()
+
+    def _entry(self, op, **fields):
+        entry = {"seq": self.seq, "at": self.at, "op": op, **fields}
+        self.spool.write(json.dumps(entry, separators=(",", ":"), default=_json_value).encode("utf-8") + b"\n")
+        self.seq += 1
+
+    def add(self, rows):
+        # Inserted rows: a frame, or a list of records
+        columns = self.log.store.columns
+        if isinstance(rows, pd.DataFrame):
+            frame = rows.reindex(columns=columns).astype(object)
+            values = frame.where(frame.notna(), None).to_numpy().tolist()
+        else:
+            values = [[record.get(col) for col in columns] for record in rows]
+        if values:
+            self._entry("add", columns=columns, rows=values)
+
+    def update(self, key, changes):
+        # Only the fields that changed; an update that changed nothing isn't logged
+        if changes:
+            self._entry("update", key=key, values=changes)
+
+    def rewrite(self, df):
+        # The whole table replaced: saved as a snapshot instead of a log entry
+        self.snapshot = (self.seq, df)
+        self.seq += 1
+
+    def commit(self):
+        if self.spool is not None:
+            self.log._commit(self)
+            self.discard()
+
+    def discard(self):
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+
+
+class ChangeLog:
+    """History of one store: snapshots plus the log of writes since each.
+
+    Attached to a store by open_store(history_key=...), which logs every
+    write through stage(). as_of() rebuilds the table at any moment,
+    changes() lists one key's adds and updates, and restore() rebuilds a
+    missing data file at startup. A catalog that already had rows when the
+    log started is kept as a base snapshot; before that moment, rows are
+    placed by their own date column (if the store has one).
+    """
+
+    def __init__(self, store, key_column, snapshot_every=SNAPSHOT_EVERY):
+        self.store = store
+        self.key_column = key_column
+        self.snapshot_every = snapshot_every
+        self.directory = store.path + ".history"
+        self.manifest_path = os.path.join(self.directory, "snapshots.json")
+
+    # --- Layout ---
+    def _segment_path(self, seq):
+        return os.path.join(self.directory, f"{seq:012d}.log")
+
+    def _snapshot_path(self, seq):
+        return os.path.join(self.directory, f"{seq:012d}.csv")
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _manifest(self):
+        # Snapshots oldest first: {"seq", "at", "kind" (base/periodic/rewrite), "rows"}
+        try:
+            stat = os.stat(self.manifest_path)
+        except OSError:
+            return []
+        return CACHE.get(f"{self.store.path}:history_manifest", (stat.st_mtime_ns, stat.st_size), self._read_manifest)
+
+    def _snapshot(self, seq):
+        # Snapshot files never change once written, so the seq is their version
+        return CACHE.get(f"{self.store.path}:history_snapshot", seq,
+                         lambda: self.store.parse_csv(self._snapshot_path(seq)))
+
+    def _read_segment(self, seq, offset=0):
+        # Entries of one segment from a byte offset, and the offset after the last whole line
+        # (a line cut short by a crash is skipped, and trimmed by the next commit)
+        try:
+            with open(self._segment_path(seq), "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+        data = data[:data.rfind(b"\n") + 1]
+        entries = []
+        for line in data.splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries, offset + len(data)
+
+    # --- Writing (called by the store under its write lock) ---
+    def _next_seq(self, segment):
+        # One past the seq of the segment's last whole line; reads backwards from the end
+        try:
+            f = open(self._segment_path(segment), "rb")
+        except FileNotFoundError:
+            return segment + 1
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            chunks, newlines = [], 0
+            while end > 0 and newlines < 2:
+                start = max(end - 65536, 0)
+                f.seek(start)
+                chunks.append(f.read(end - start))
+                newlines += chunks[-1].count(b"\n")
+                end = start
+        tail = b"".join(reversed(chunks))
+        whole = tail[:tail.rfind(b"\n")]
+        match = _SEQ.match(whole[whole.rfind(b"\n") + 1:])
+        return int(match.group(1)) + 1 if match else segment + 1
+
+    def stage(self):
+        at = datetime.datetime.now().strftime(DATE_FORMAT)
+        snapshots = self._manifest()
+        if not snapshots: # First logged write: keep the catalog as it stands as the base snapshot
+            os.makedirs(self.directory, exist_ok=True)
+            try:
+                rows = self.store.save_csv(self._snapshot_path(0)) # From the cached frame, or a file copy
+            except (OSError, pd.errors.EmptyDataError):
+                self._save_snapshot(0, at, "base", pd.DataFrame(columns=self.store.columns), [])
+            else:
+                self._save_manifest([{"seq": 0, "at": at, "kind": "base", "rows": rows}])
+            snapshots = self._manifest()
+        segment = snapshots[-1]["seq"]
+        return _Staged(self, segment, self._next_seq(segment), at)
+
+    def _commit(self, staged):
+        if staged.spool.tell():
+            with open(self._segment_path(staged.segment), "a+b") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size:
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n": # Drop a line left half-written by a crash
+                        f.seek(0)
+                        f.truncate(f.read().rfind(b"\n") + 1)
+                staged.spool.seek(0)
+                shutil.copyfileobj(staged.spool, f)
+                f.flush()
+                os.fsync(f.fileno()) # On disk before the data changes
+        if staged.snapshot is not None:
+            seq, df = staged.snapshot
+            self._close_segment(staged.segment, seq, staged.at, "rewrite", df)
+        elif staged.seq - 1 - staged.segment >= self.snapshot_every:
+            self._close_segment(staged.segment, staged.seq - 1, staged.at, "periodic", None)
+
+    def _close_segment(self, segment, seq, at, kind, frame):
+        # Snapshot the table after `seq` (frame: the rewritten table, else replayed) and start a
+        # new segment from it
+        if frame is None:
+            entries, _ = self._read_segment(segment)
+            frame = self._replay(self._snapshot(segment), entries)
+        self._save_snapshot(seq, at, kind, frame, self._read_manifest())
+
+    def _save_snapshot(self, seq, at, kind, frame, snapshots):
+        frame = frame.reindex(columns=self.store.columns)
+        atomic_write(self._snapshot_path(seq), lambda f: frame.to_csv(f, index=False, date_format=DATE_FORMAT),
+                     newline="", encoding="utf-8")
+        self._save_manifest(snapshots + [{"seq": seq, "at": at, "kind": kind, "rows": len(frame)}])
+
+    def _save_manifest(self, snapshots):
+        # Thins the snapshots older than the newest KEEP_SNAPSHOTS: a periodic one is dropped unless
+        # THIN_EVERY segments have passed since the last one kept (base and rewrite snapshots can't
+        # be rebuilt from the log, so they stay). A dropped snapshot keeps its manifest entry,
+        # marked "thinned", because its segment is still replayed; its file goes after the manifest
+        dropped, since_kept = [], 0
+        for snapshot in snapshots[:-KEEP_SNAPSHOTS]:
+            since_kept += 1
+            if snapshot.get("thinned"):
+                continue
+            if snapshot["kind"] == "periodic" and 1 < since_kept <= THIN_EVERY:
+                snapshot["thinned"] = True
+                dropped.append(snapshot["seq"])
+            else:
+                since_kept = 1
+        atomic_write(self.manifest_path, lambda f: json.dump(snapshots, f))
+        for seq in dropped:
+            try:
+                os.remove(self._snapshot_path(seq))
+            except OSError:
+                pass
+
+    # --- Replay ---
+    def _replay(self, frame, entries):
+        # The table after applying entries (oldest first) to frame; adds go first, which is safe
+        # because a key is only ever updated after it was added
+        added, updates = [], {}
+        for entry in entries:
+            if entry["op"] == "add":
+                added.append(pd.DataFrame(entry["rows"], columns=entry["columns"], dtype=object))
+            elif entry["op"] == "update":
+                updates.setdefault(entry["key"], {}).update(entry["values"])
+        if added:
+            rows = pd.concat(added, ignore_index=True).reindex(columns=frame.columns)
+            frame = concat_rows(frame, self.store._apply_schema(rows))
+        if updates:
+            keys = frame[self.key_column]
+            first = np.flatnonzero(~keys.duplicated().to_numpy()) # Position of each key's first row
+            found = pd.Index(keys.to_numpy()[first]).get_indexer(list(updates))
+            frame = frame.copy()
+            for col in {col for values in updates.values() for col in values}:
+                column = frame[col].astype(object)
+                for values, position in zip(updates.values(), found):
+                    if position >= 0 and col in values:
+                        column.iat[first[position]] = values[col]
+                frame[col] = column
+            frame = self.store._apply_schema(frame)
+        return frame
+
+    def _dated(self, frame, when):
+        # Rows from before the log started that existed at `when`, going by their own date; without
+        # a date column none of them can be placed, so there are none
+        if when is None:
+            return frame
+        if not self.store.date_column:
+            return frame.iloc[:0]
+        return frame[frame[self.store.date_column] <= pd.Timestamp(when)].reset_index(drop=True)
+
+    # --- Queries ---
+    def start(self):
+        # When the log started (the base snapshot was taken), None if nothing is logged yet; before
+        # it, only a store with a date column has any history
+        snapshots = self._manifest()
+        return pd.Timestamp(snapshots[0]["at"]) if snapshots else None
+
+    def as_of(self, when=None):
+        # The table as it stood at `when` (None: after the last logged write)
+        snapshots = self._manifest()
+        if not snapshots: # Nothing logged yet: the catalog as it stands is all there is
+            frame = self.store.frame()
+            return frame if when is None or pd.Timestamp(when) >= pd.Timestamp.now() else self._dated(frame, when)
+        cutoff = None if when is None else pd.Timestamp(when).strftime(DATE_FORMAT)
+        taken = [s for s in snapshots if cutoff is None or s["at"] <= cutoff]
+        if not taken:
+            return self._dated(self._snapshot(snapshots[0]["seq"]), when)
+        start = len(taken) - 1
+        while taken[start].get("thinned"): # Replay from the nearest kept snapshot
+            start -= 1
+        entries = [entry for snapshot in taken[start:] for entry in self._read_segment(snapshot["seq"])[0]
+                   if cutoff is None or entry["at"] <= cutoff]
+        return self._replay(self._snapshot(taken[start]["seq"]), entries)
+
+    def changes(self, key):
+        # (time, op, fields) of every logged add and update of one key, oldest first
+        found = []
+        for snapshot in self._manifest():
+            entries, _ = self._read_segment(snapshot["seq"])
+            for entry in entries:
+                if entry["op"] == "update" and entry["key"] == key:
+                    found.append((entry["at"], "update", entry["values"]))
+                elif entry["op"] == "add" and self.key_column in entry["columns"]:
+                    position = entry["columns"].index(self.key_column)
+                    for row in entry["rows"]:
+                        if row[position] == key:
+                            found.append((entry["at"], "add", dict(zip(entry["columns"], row))))
+        return found
+
+    def restore(self):
+        # Startup recovery: a missing or empty data file is rebuilt from the newest snapshot and
+        # the log after it; returns the number of rows restored
+        if not self._manifest():
+            return 0
+        try:
+            if len(self.store.frame()):
+                return 0
+        except (OSError, pd.errors.EmptyDataError):
+            pass
+        frame = self.as_of()
+        if frame.empty:
+            return 0
+        self.store.write(frame)
+        return len(frame)
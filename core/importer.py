@@ -0,0 +1,42 @@
+# One-shot import of the CSV catalogs into their SQLite databases.
+# Usage: python -m core.importer [--force] [csv_path ...]
+import argparse
+import os
+
+import pandas as pd
+
+from core.storage import SqliteStore, sqlite_path
+
+DEFAULT_CATALOGS = ["data/ai_tools.csv", "ai_tools_database.csv"]
+INDEXED_COLUMNS = ["name", "Name", "Category", "Uploaded_By", "Date_Time"]
+
+
+def store_for_csv(csv_path):
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    return SqliteStore(
+        sqlite_path(csv_path), header,
+        serial_column='Serial_Number' if 'Serial_Number' in header else None,
+        date_column='Date_Time' if 'Date_Time' in header else None,
+        indexes=[col for col in INDEXED_COLUMNS if col in header],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import CSV catalogs into SQLite.")
+    parser.add_argument("csv_paths", nargs="*", default=DEFAULT_CATALOGS)
+    parser.add_argument("--force", action="store_true", help="Replace rows already in the database")
+    args = parser.parse_args()
+
+    for csv_path in args.csv_paths:
+        if not os.path.exists(csv_path):
+            print(f"skip {csv_path}: not found")
+            continue
+        store = store_for_csv(csv_path)
+        if not args.force and not store.is_empty():
+            print(f"skip {csv_path}: {store.path} already has data (use --force to replace)")
+            continue
+        print(f"imported {store.import_csv(csv_path)} rows from {csv_path} into {store.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+# Background health checks of the catalogs' links (dashboard Tool_Link, app website).
+# Checks run on asyncio over pooled keep-alive HTTP/1.1 connections (HEAD, or GET where HEAD
+# isn't allowed) with a global and a per-host concurrency limit. Results are persisted next to
+# the data (<path>.links.json) and revalidated once their TTL has passed; pages only read them.
+import asyncio
+import collections
+import itertools
+import json
+import os
+import ssl
+import threading
+import time
+import urllib.parse
+
+from core.assets import OFFLINE_ENV
+from core.cache import CACHE
+from core.locking import WriteLock, atomic_write
+
+# status is the final HTTP status after redirects; None when the request failed (see error)
+LinkStatus = collections.namedtuple("LinkStatus", "url status final_url latency_ms error checked_at")
+
+TTL = 24 * 3600 # Seconds before a healthy link is checked again
+DEAD_TTL = 3600 # Dead links are retried sooner, so a short outage doesn't stick for a day
+SCAN_INTERVAL = 300 # Minimum seconds between two background scans of the same catalog
+FLUSH_SECONDS = 10 # Results are persisted this often during a scan, so dead links show up early
+REDIRECTS = (301, 302, 303, 307, 308)
+USER_AGENT = "Mozilla/5.0 (compatible; ai-tools-link-checker/1.0)"
+
+
+# Background scans per results file, shared by every session of the process (Streamlit re-creates
+# the page module's LinkHealth on each rerun): path -> {"thread", "started", "checked", "queued"}
+_SCANS = {}
+_SCANS_LOCK = threading.Lock()
+
+
+def is_dead(result):
+    # Failed requests and error statuses; sites that refuse bots (401/403/429) aren't dead
+    if result.error is not None:
+        return True
+    return result.status >= 400 and result.status not in (401, 403, 429)
+
+
+def describe(result):
+    # Short reason for the UI, e.g. "HTTP 404" or "Timeout"
+    return f"HTTP {result.status}" if result.error is None else result.error
+
+
+def _error(exc):
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return "Timeout"
+    if isinstance(exc, ssl.SSLError):
+        return "TLS error"
+    message = str(exc).strip()
+    return f"{type(exc).__name__}: {message}"[:200] if message else type(exc).__name__
+
+
+def interleave_hosts(urls):
+    # Round-robin over hosts, so workers don't all queue behind one host's limit
+    by_host = {}
+    for url in urls:
+        by_host.setdefault(urllib.parse.urlsplit(url).hostname, []).append(url)
+    return [url for batch in itertools.zip_longest(*by_host.values()) for url in batch if url is not None]
+
+
+class _Pool:
+    """Idle keep-alive connections and the concurrency limit of one scheme/host/port."""
+
+    def __init__(self, limit):
+        self.limit = asyncio.Semaphore(limit)
+        self.idle = []
+
+
+class LinkChecker:
+    """Checks many URLs concurrently over pooled HTTP/1.1 connections.
+
+    At most `concurrency` URLs are in flight overall and `per_host` requests
+    per host; connections are kept alive and reused for later URLs on the
+    same host. Redirects are followed up to max_redirects; `timeout` bounds
+    each connect and each response head.
+    """
+
+    def __init__(self, concurrency=256, per_host=4, timeout=10.0, max_redirects=5):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self._tls = None
+
+    # --- HTTP ---
+    async def _read_head(self, reader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionResetError("Connection closed")
+            version, _, rest = line.decode("latin-1").partition(" ")
+            status = int(rest[:3])
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if not 100 <= status < 200: # Skip interim responses
+                return version, status, headers
+
+    async def _connect(self, scheme, host, port):
+        if scheme == "https" and self._tls is None:
+            self._tls = ssl.create_default_context()
+        connect = asyncio.open_connection(host, port, ssl=self._tls if scheme == "https" else None)
+        return await asyncio.wait_for(connect, self.timeout)
+
+    async def _request(self, pools, url, method):
+        # (status, Location header) of one request; reuses an idle connection to the host if any
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError("Not an http(s) URL")
+        host = parts.hostname.encode("idna").decode("ascii")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        default_port = port == (443 if parts.scheme == "https" else 80)
+        target = urllib.parse.quote(parts.path or "/", safe="/%:@!$&'()*+,;=~-._") + (f"?{parts.query}" if parts.query else "")
+        request = (f"{method} {target} HTTP/1.1\r\nHost: {host if default_port else f'{host}:{port}'}\r\n"
+                   f"User-Agent: {USER_AGENT}\r\nAccept: */*\r\nConnection: keep-alive\r\n\r\n").encode("latin-1")
+        pool = pools.setdefault((parts.scheme, host, port), _Pool(self.per_host))
+        async with pool.limit:
+            while True:
+                reused = bool(pool.idle)
+                reader, writer = pool.idle.pop() if reused else await self._connect(parts.scheme, host, port)
+                try:
+                    writer.write(request)
+                    version, status, headers = await asyncio.wait_for(self._read_head(reader), self.timeout)
+                    break
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    writer.close()
+                    if not reused: # A reused connection may have been closed by the server; retry fresh
+                        raise
+            # HEAD responses have no body; other bodies aren't read, so their connection can't be reused
+            if method == "HEAD" and version == "HTTP/1.1" and headers.get("connection", "").lower() != "close":
+                pool.idle.append((reader, writer))
+            else:
+                writer.close()
+        return status, headers.get("location")
+
+    async def _check(self, pools, url):
+        start = time.perf_counter()
+        current, status, error = url, None, None
+        try:
+            for _ in range(self.max_redirects + 1):
+                status, location = await self._request(pools, current, "HEAD")
+                if status in (405, 501): # HEAD not allowed
+                    status, location = await self._request(pools, current, "GET")
+                if status not in REDIRECTS or not location:
+                    break
+                current = urllib.parse.urljoin(current, location)
+            else:
+                status, error = None, "Too many redirects"
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+            status, error = None, _error(exc)
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        return LinkStatus(url, status, current if error is None else None, latency_ms, error, time.time())
+
+    # --- Batches ---
+    async def check_many(self, urls, on_result=None):
+        # LinkStatus per URL, in completion order; on_result(result) is called as each one finishes
+        pools = {}
+        pending = iter(interleave_hosts(urls))
+        results = []
+
+        async def worker():
+            for url in pending: # Shared iterator: each URL goes to exactly one worker
+                result = await self._check(pools, url)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(urls)) or 1)))
+        finally:
+            for pool in pools.values():
+                for _, writer in pool.idle:
+                    writer.close()
+        return results
+
+    def check(self, urls, on_result=None):
+        # Blocking wrapper around check_many, for threads and scripts
+        return asyncio.run(self.check_many(urls, on_result))
+
+
+class LinkHealth:
+    """Link check results for one catalog column, persisted next to the data.
+
+    <path>.links.json maps each URL to its last LinkStatus. A result stays
+    fresh for `ttl` seconds (`dead_ttl` for dead links); refresh() starts a
+    background thread (one per file and process) that checks unchecked and
+    stale links, persisting results every FLUSH_SECONDS. Readers never wait
+    for the network: they see the file as of its last flush (cached in
+    memory until it changes).
+    """
+
+    def __init__(self, store, column, ttl=TTL, dead_ttl=DEAD_TTL, checker=None):
+        self.store = store
+        self.column = column
+        self.ttl = ttl
+        self.dead_ttl = dead_ttl
+        self.checker = checker or LinkChecker()
+        self.path = store.path + ".links.json"
+
+    # --- Results ---
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return {url: LinkStatus(url, *fields) for url, fields in json.load(f).items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def version(self):
+        # Changes whenever a scan (in any process) flushes results
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def results(self):
+        # url -> LinkStatus, reread only when the file changed
+        return CACHE.get(f"{self.store.path}:links", self.version(), self._read)
+
+    def dead(self):
+        # url -> LinkStatus of the links that failed their last check
+        return CACHE.get(f"{self.store.path}:dead_links", self.version(),
+                         lambda: {url: result for url, result in self.results().items() if is_dead(result)})
+
+    def is_fresh(self, result, now=None):
+        age = (now or time.time()) - result.checked_at
+        return age < (self.dead_ttl if is_dead(result) else self.ttl)
+
+    def stale(self, urls, now=None):
+        # The given URLs that were never checked or whose result has expired
+        now = now or time.time()
+        results = self.results()
+        return [url for url in urls if url not in results or not self.is_fresh(results[url], now)]
+
+    def save(self, new_results):
+        # Merge results into the file (locked read-modify-write; other processes may flush too)
+        if not new_results:
+            return
+        with WriteLock(self.path):
+            merged = {url: list(result[1:]) for url, result in self._read().items()}
+            merged.update((result.url, list(result[1:])) for result in new_results)
+            atomic_write(self.path, lambda f: json.dump(merged, f, separators=(",", ":")))
+
+    # --- Checking ---
+    def links(self):
+        # Distinct http(s) links of the catalog
+        values = self.store.frame()[self.column].dropna().astype(str).str.strip()
+        return values[values.str.match(r"(?i)https?://")].unique().tolist()
+
+    def scan(self, progress=None):
+        # Check every stale link now (blocking); progress is a dict updated with checked/queued counts
+        progress = {} if progress is None else progress
+        urls = self.stale(self.links())
+        progress.update(checked=0, queued=len(urls))
+        batch = []
+        flushed = [time.monotonic()]
+
+        def on_result(result):
+            batch.append(result)
+            progress["checked"] += 1
+            if time.monotonic() - flushed[0] >= FLUSH_SECONDS:
+                self.save(batch)
+                batch.clear()
+                flushed[0] = time.monotonic()
+
+        try:
+            self.checker.check(urls, on_result)
+        finally:
+            self.save(batch)
+        return len(urls)
+
+    def progress(self):
+        # (checked, queued) of this process' running or last scan
+        scan = _SCANS.get(self.path, {})
+        return scan.get("checked", 0), scan.get("queued", 0)
+
+    def running(self):
+        thread = _SCANS.get(self.path, {}).get("thread")
+        return thread is not None and thread.is_alive()
+
+    def refresh(self, force=False):
+        # Start a background scan unless one is running or the last one is recent; never blocks
+        if os.environ.get(OFFLINE_ENV, "").lower() in ("1", "true", "yes"):
+            return False
+        with _SCANS_LOCK:
+            scan = _SCANS.get(self.path)
+            if scan is not None and (scan["thread"].is_alive()
+                                     or not force and time.monotonic() - scan["started"] < SCAN_INTERVAL):
+                return False
+            scan = {"started": time.monotonic(), "checked": 0, "queued": 0}
+            scan["thread"] = threading.Thread(target=self.scan, args=(scan,), name=f"link-health-{self.column}", daemon=True)
+            _SCANS[self.path] = scan
+            scan["thread"].start()
+        return True
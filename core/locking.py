@@ -0,0 +1,102 @@
+import os
+import random
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LockTimeout(TimeoutError):
+    pass
+
+
+class WriteLock:
+    """Exclusive cross-process lock on ``<path>.lock``.
+
+    Serializes writers across Streamlit sessions (threads) and processes.
+    Readers never take it: writers publish complete files via atomic_replace.
+    """
+
+    def __init__(self, path, timeout=30.0, poll_interval=0.005):
+        self.lock_path = path + ".lock"
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def _try_lock(self, fd):
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self):
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        delay = self.poll_interval
+        while not self._try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                raise LockTimeout(f"Timed out waiting for {self.lock_path}")
+            # Jittered exponential backoff under contention
+            time.sleep(delay * (0.5 + random.random()))
+            delay = min(delay * 2, 0.2)
+        self._fd = fd
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def atomic_replace(src, dst, retries=50, delay=0.01):
+    # os.replace is atomic; on Windows it fails while a reader holds dst open, so retry briefly
+    for attempt in range(retries):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(delay)
+
+
+def atomic_write(path, write_fn, mode="w", **open_kwargs):
+    # Write to a temp file in the same directory, fsync, then rename over the live file
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        os.chmod(tmp_path, 0o644) # mkstemp creates 0600 files
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            write_fn(f)
+            f.flush()
+            os.fsync(f.fileno())
+        atomic_replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
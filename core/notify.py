@@ -0,0 +1,80 @@
+# Cross-process change notification for the catalog stores (several app replicas on shared data).
+# Every write changes the store's data version (the CSV file's inode/mtime/size, or SQLite's
+# meta counter), so the version doubles as the version file: one watcher thread per store and
+# process checks it (a stat() or a one-row query, never the data) and, on a change, refreshes
+# the cached frame once (appended rows only) before telling its subscribers.
+import threading
+
+POLL_INTERVAL = 0.5 # Seconds between two version checks
+
+_WATCHERS = {} # store.path -> ChangeWatcher of this process
+_WATCHERS_LOCK = threading.Lock()
+
+
+class ChangeWatcher:
+    """Publishes each observed change of one store's data version.
+
+    poll() compares the current version with the last one seen; on a change
+    it brings store.frame() up to date and calls every subscriber with
+    (version_before, version_after). Writes that land between two polls are
+    published as one change, so each process refreshes at most once per
+    write no matter how many sessions it serves.
+    """
+
+    def __init__(self, store, interval=POLL_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self.version = None
+        self.changes = 0
+        self._subscribers = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, name, callback):
+        # callback(version_before, version_after); a second subscription under the same name replaces the first
+        self._subscribers[name] = callback
+
+    def unsubscribe(self, name):
+        self._subscribers.pop(name, None)
+
+    def poll(self):
+        # One check; True if the version changed since the last one
+        version = self.store.version()
+        if version == self.version:
+            return False
+        before, self.version = self.version, version
+        self.store.frame()
+        self.changes += 1
+        for callback in list(self._subscribers.values()):
+            callback(before, version)
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception: # E.g. the file is missing for a moment; the next tick retries
+                pass
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"watch-{self.store.path}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def watch(store, interval=POLL_INTERVAL):
+    # The running watcher of store.path in this process, started on first use
+    # (Streamlit re-runs the page module on every rerun, so it can't own the thread)
+    with _WATCHERS_LOCK:
+        watcher = _WATCHERS.get(store.path)
+        if watcher is None:
+            watcher = _WATCHERS[store.path] = ChangeWatcher(store, interval)
+        return watcher.start()
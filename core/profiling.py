@@ -0,0 +1,124 @@
+import contextlib
+import datetime
+import json
+import os
+import threading
+import time
+
+from core.cache import CACHE
+
+PROFILE_ENV = "AI_TOOLS_PROFILE" # Set to 1 to profile every rerun (or add ?profile=1 to the URL)
+PROFILE_LOG_ENV = "AI_TOOLS_PROFILE_LOG"
+DEFAULT_LOG = "render_profile.jsonl"
+
+_NULL_PHASE = contextlib.nullcontext()
+_LOG_LOCK = threading.Lock()
+
+
+class NullRun:
+    """Stand-in used when profiling is off: every call is a constant-time no-op."""
+
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def size(self, name, value):
+        pass
+
+    def finish(self):
+        return None
+
+
+_NULL_RUN = NullRun()
+
+
+class ProfileRun:
+    """Timings, payload sizes and cache hit/miss deltas for one script run.
+
+    Phases may nest; each records its own wall time in milliseconds. Sizes
+    accept a number or a zero-argument callable, so measuring a payload
+    costs nothing unless profiling is on.
+    """
+
+    enabled = True
+
+    def __init__(self, app, log_path):
+        self.app = app
+        self.log_path = log_path
+        self.phases = {}
+        self.sizes = {}
+        self._cache_before = CACHE.stats()["by_name"]
+        self._started = time.perf_counter()
+        self.record = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def size(self, name, value):
+        self.sizes[name] = value() if callable(value) else value
+
+    def _cache_delta(self):
+        # Hits and misses since the run started; CACHE is process-wide, so concurrent
+        # sessions' lookups are included
+        delta = {}
+        for name, counts in CACHE.stats()["by_name"].items():
+            before = self._cache_before.get(name, {"hits": 0, "misses": 0})
+            hits, misses = counts["hits"] - before["hits"], counts["misses"] - before["misses"]
+            if hits or misses:
+                delta[name] = {"hits": hits, "misses": misses}
+        return delta
+
+    def finish(self):
+        # Close the run and append it to the log as one JSON line
+        if self.record is not None:
+            return self.record
+        self.record = {
+            "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "app": self.app,
+            "pid": os.getpid(),
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "phases_ms": {name: round(ms, 3) for name, ms in self.phases.items()},
+            "sizes": self.sizes,
+            "cache": self._cache_delta(),
+        }
+        line = json.dumps(self.record) + "\n"
+        with _LOG_LOCK:
+            with open(self.log_path, "a") as f:
+                f.write(line)
+        return self.record
+
+
+def profiling_enabled():
+    return os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def start_run(app, force=False):
+    # Profiling follows the environment; force turns it on for one run (e.g. from a query parameter)
+    if not (force or profiling_enabled()):
+        return _NULL_RUN
+    return ProfileRun(app, os.environ.get(PROFILE_LOG_ENV, DEFAULT_LOG))
+
+
+def render_sidebar(run):
+    # Debug panel with the finished run's numbers; nothing is drawn when profiling is off
+    record = run.finish()
+    if record is None:
+        return
+    import streamlit as st
+    with st.sidebar.expander("⏱ Render profile", expanded=True):
+        st.caption(f"{record['app']} · {record['total_ms']:.1f} ms total · logged to {run.log_path}")
+        st.table({"Phase": list(record["phases_ms"]), "ms": list(record["phases_ms"].values())})
+        if record["sizes"]:
+            st.table({"Payload": list(record["sizes"]), "Bytes": list(record["sizes"].values())})
+        if record["cache"]:
+            st.table({
+                "Cache": list(record["cache"]),
+                "Hits": [c["hits"] for c in record["cache"].values()],
+                "Misses": [c["misses"] for c in record["cache"].values()],
+            })
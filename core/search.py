@@ -0,0 +1,306 @@
+import bisect
+import collections
+import json
+import math
+import os
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from core.aggregates import version_key
+from core.cache import CACHE
+from core.locking import WriteLock, atomic_write
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+MAX_EXPANSIONS = 50 # Most frequent vocabulary terms a type-ahead prefix expands to
+LOG_LIMIT = 1 << 20 # Bytes of update log after which the persisted index is compacted
+
+
+def tokenize(text):
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", text).casefold())
+
+
+def _field_postings(values, weight, term_ids):
+    # (doc, term id, weight) triples of one text column; each distinct value is tokenized once
+    codes, uniques = pd.factorize(values)
+    counts, flat = [], []
+    for value in uniques:
+        tokens = tokenize(value)
+        counts.append(len(tokens))
+        flat.extend(term_ids.setdefault(token, len(term_ids)) for token in tokens)
+    counts = np.array(counts + [0], dtype=np.int64) # Missing values (code -1) pick the trailing 0
+    firsts = np.cumsum(counts) - counts
+    per_doc = counts[codes]
+    docs = np.repeat(np.arange(len(codes)), per_doc)
+    within = np.arange(per_doc.sum()) - np.repeat(np.cumsum(per_doc) - per_doc, per_doc)
+    terms = np.array(flat, dtype=np.int64)[np.repeat(firsts[codes], per_doc) + within]
+    return docs, terms, np.full(len(docs), weight, dtype=np.float32)
+
+
+def _grow(array, fill):
+    return np.concatenate([array, np.full(max(len(array), 64), fill, dtype=array.dtype)])
+
+
+class SearchIndex:
+    """Inverted index over a few weighted text fields, ranked with BM25.
+
+    Postings are stored CSR-style: a sorted vocabulary and per-term offsets
+    into parallel doc and term-frequency arrays. The last query term also
+    matches as a prefix (type-ahead), found by binary search in the
+    vocabulary. Rows added or replaced after the build go to a small
+    in-memory delta and replaced rows are masked out of the arrays, until
+    compacted() merges them. Results are row positions, or the rows' keys
+    when the index was built with a key column.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, fields, vocab, offsets, docs, freqs, lengths, keys=None):
+        self.fields = dict(fields) # column -> weight
+        self.vocab = vocab
+        self.offsets = offsets
+        self.docs = docs
+        self.freqs = freqs
+        self.lengths = lengths # Weighted token count per row (capacity may exceed count)
+        self.keys = keys
+        self.count = len(lengths)
+        self.base_count = self.count # Rows covered by the arrays
+        self.total_length = float(lengths.sum())
+        self.delta = {} # term -> {row: weighted tf} for rows added or replaced since the build
+        self.delta_rows = {} # row -> its delta terms
+        self.replaced = set() # Base rows whose postings in the arrays are outdated
+
+    @classmethod
+    def build(cls, df, fields, key_column=None):
+        term_ids = {}
+        parts = [_field_postings(df[col], weight, term_ids) for col, weight in fields.items()]
+        docs, terms, weights = (np.concatenate(arrays) for arrays in zip(*parts))
+        vocab = sorted(term_ids)
+        rank = np.empty(len(vocab), dtype=np.int64) # Term id -> position in the sorted vocabulary
+        rank[[term_ids[term] for term in vocab]] = np.arange(len(vocab))
+        width = max(len(df), 1)
+        pairs, inverse = np.unique(rank[terms] * width + docs, return_inverse=True)
+        keys = df[key_column].to_numpy(dtype=np.int64, na_value=-1) if key_column else None
+        return cls(fields, vocab, np.searchsorted(pairs // width, np.arange(len(vocab) + 1)),
+                   (pairs % width).astype(np.int32), np.bincount(inverse, weights=weights).astype(np.float32),
+                   np.bincount(docs, weights=weights, minlength=len(df)).astype(np.float32), keys)
+
+    def __len__(self):
+        return self.count
+
+    # --- Queries ---
+    def _term_id(self, term):
+        i = bisect.bisect_left(self.vocab, term)
+        return i if i < len(self.vocab) and self.vocab[i] == term else None
+
+    def _expand(self, prefix):
+        # Terms starting with prefix: the MAX_EXPANSIONS most frequent in the arrays, plus delta terms
+        lo = bisect.bisect_left(self.vocab, prefix)
+        hi = bisect.bisect_left(self.vocab, prefix + "\U0010ffff", lo)
+        ids = np.arange(lo, hi)
+        if len(ids) > MAX_EXPANSIONS:
+            df = self.offsets[lo + 1:hi + 1] - self.offsets[lo:hi]
+            ids = ids[np.argpartition(-df, MAX_EXPANSIONS)[:MAX_EXPANSIONS]]
+        return [self.vocab[i] for i in ids.tolist()] + [term for term in self.delta if term.startswith(prefix)]
+
+    def _bm25(self, idf, tf, rows, avg_length):
+        return idf * tf * (self.K1 + 1) / (tf + self.K1 * (1 - self.B + self.B * self.lengths[rows] / avg_length))
+
+    def _scores(self, terms):
+        # Per-row score of the best-matching term of the group (0 where none matches)
+        scores = np.zeros(self.count, dtype=np.float32)
+        avg_length = self.total_length / self.count or 1.0
+        delta_terms = []
+        for term in dict.fromkeys(terms):
+            term_id = self._term_id(term)
+            lo, hi = (self.offsets[term_id], self.offsets[term_id + 1]) if term_id is not None else (0, 0)
+            delta = self.delta.get(term, {})
+            df = hi - lo + len(delta)
+            if not df:
+                continue
+            idf = math.log(1 + (self.count - df + 0.5) / (df + 0.5))
+            if hi - lo == self.count: # In every row: postings are 0..count-1, no gather/scatter needed
+                np.maximum(scores, self._bm25(idf, self.freqs[lo:hi], slice(None, self.count), avg_length),
+                           out=scores)
+            elif hi > lo: # Postings of one term are unique per row, so this is a plain scatter
+                rows = self.docs[lo:hi]
+                scores[rows] = np.maximum(scores[rows], self._bm25(idf, self.freqs[lo:hi], rows, avg_length))
+            if delta:
+                delta_terms.append((idf, delta))
+        if self.replaced: # Their current content is in the delta
+            scores[np.fromiter(self.replaced, dtype=np.int64, count=len(self.replaced))] = 0
+        for idf, delta in delta_terms:
+            rows = np.fromiter(delta, dtype=np.int64, count=len(delta))
+            tf = np.fromiter(delta.values(), dtype=np.float32, count=len(delta))
+            scores[rows] = np.maximum(scores[rows], self._bm25(idf, tf, rows, avg_length))
+        return scores
+
+    def search(self, query, limit=None, prefix=True):
+        # (positions or keys, scores) of the rows matching every query term, best first;
+        # with prefix=True the last term also matches longer words ("chat" finds "chatbot")
+        terms = tokenize(query)
+        if not terms or not self.count:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        groups = [[term] for term in terms]
+        if prefix:
+            groups[-1] += self._expand(terms[-1])
+        total = np.zeros(self.count, dtype=np.float32)
+        matched = np.ones(self.count, dtype=bool)
+        for group in groups:
+            scores = self._scores(group)
+            matched &= scores > 0
+            total += scores
+        rows = np.flatnonzero(matched)
+        if limit is not None and len(rows) > limit:
+            rows = rows[np.argpartition(-total[rows], limit)[:limit]]
+        rows = rows[np.argsort(-total[rows], kind="stable")]
+        return (self.keys[rows] if self.keys is not None else rows), total[rows]
+
+    # --- Incremental Updates ---
+    def set_row(self, position, record, key=None):
+        # Add (position None or == len) or replace one row from its field values
+        tf = collections.Counter()
+        for col, weight in self.fields.items():
+            for token in tokenize(record.get(col)):
+                tf[token] += weight
+        if position is None or position == self.count:
+            position = self.count
+            if position == len(self.lengths):
+                self.lengths = _grow(self.lengths, 0)
+                if self.keys is not None:
+                    self.keys = _grow(self.keys, -1)
+            self.count += 1
+        else:
+            self.total_length -= float(self.lengths[position])
+            for term in self.delta_rows.pop(position, ()):
+                del self.delta[term][position]
+                if not self.delta[term]:
+                    del self.delta[term]
+            if position < self.base_count:
+                self.replaced.add(position)
+        for term, weight in tf.items():
+            self.delta.setdefault(term, {})[position] = weight
+        self.delta_rows[position] = list(tf)
+        self.lengths[position] = sum(tf.values())
+        self.total_length += float(self.lengths[position])
+        if self.keys is not None:
+            self.keys[position] = -1 if key is None or pd.isna(key) else int(key)
+
+    def compacted(self):
+        # A new index with the delta merged into the arrays
+        if not self.delta_rows:
+            return self
+        vocab = sorted(set(self.vocab).union(self.delta))
+        new_id = {term: i for i, term in enumerate(vocab)}
+        old_ids = np.fromiter((new_id[term] for term in self.vocab), dtype=np.int64, count=len(self.vocab))
+        terms = np.repeat(old_ids, np.diff(self.offsets))
+        keep = ~np.isin(self.docs, list(self.replaced)) if self.replaced else slice(None)
+        delta = [(new_id[term], row, tf) for term, postings in self.delta.items() for row, tf in postings.items()]
+        delta_terms, delta_rows, delta_tf = (np.array(column) for column in zip(*delta)) if delta else ([], [], [])
+        terms = np.concatenate([terms[keep], np.asarray(delta_terms, dtype=np.int64)])
+        docs = np.concatenate([self.docs[keep], np.asarray(delta_rows, dtype=np.int32)])
+        freqs = np.concatenate([self.freqs[keep], np.asarray(delta_tf, dtype=np.float32)])
+        order = np.lexsort((docs, terms))
+        keys = self.keys[:self.count].copy() if self.keys is not None else None
+        return SearchIndex(self.fields, vocab, np.searchsorted(terms[order], np.arange(len(vocab) + 1)),
+                           docs[order], freqs[order], self.lengths[:self.count].copy(), keys)
+
+    # --- Serialization ---
+    def to_arrays(self):
+        index = self.compacted()
+        arrays = {"vocab": np.frombuffer("\n".join(index.vocab).encode("utf-8"), dtype=np.uint8),
+                  "offsets": index.offsets, "docs": index.docs, "freqs": index.freqs, "lengths": index.lengths}
+        if index.keys is not None:
+            arrays["keys"] = index.keys
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, fields, arrays):
+        text = arrays["vocab"].tobytes().decode("utf-8")
+        return cls(fields, text.split("\n") if text else [], arrays["offsets"], arrays["docs"],
+                   arrays["freqs"], arrays["lengths"], arrays["keys"] if "keys" in arrays else None)
+
+
+class SearchStore:
+    """SearchIndex persisted next to the data, kept current one write at a time.
+
+    <path>.search.npz holds the compacted index tagged with a data version;
+    each single-row write after that is appended to <path>.search.log as one
+    JSON line (versions before/after, position, field values). Loading
+    replays the log, and compacts it into the .npz once it grows past
+    LOG_LIMIT. If the log doesn't lead to the store's version (external
+    edit, bulk import, full rewrite) the index is rebuilt once.
+    """
+
+    def __init__(self, store, fields, key_column=None):
+        self.store = store
+        self.fields = dict(fields)
+        self.key_column = key_column
+        self.path = store.path + ".search.npz"
+        self.log_path = store.path + ".search.log"
+
+    def _read(self):
+        try:
+            with np.load(self.path) as saved:
+                arrays = {name: saved[name] for name in saved.files}
+            meta = json.loads(arrays.pop("meta").tobytes().decode("utf-8"))
+            if meta["fields"] != self.fields or meta["key_column"] != self.key_column:
+                return None, None
+            return meta["version"], SearchIndex.from_arrays(self.fields, arrays)
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+    def _replay(self, version, index):
+        # Apply the logged writes that continue from version; returns the version reached
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if entry["before"] != version:
+                        break
+                    index.set_row(entry["position"], entry["record"], entry["record"].get(self.key_column))
+                    version = entry["after"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return version
+
+    def _write(self, version, index):
+        meta = {"version": version_key(version), "fields": self.fields, "key_column": self.key_column}
+        arrays = index.to_arrays()
+        arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+        atomic_write(self.path, lambda f: np.savez(f, **arrays), mode="wb")
+        atomic_write(self.log_path, lambda f: None) # The .npz now covers everything logged
+
+    def _load(self, version):
+        saved_version, index = self._read()
+        if index is not None:
+            saved_version = self._replay(saved_version, index)
+        if index is None or saved_version != version_key(version):
+            index = SearchIndex.build(self.store.frame(), self.fields, self.key_column)
+            with WriteLock(self.path):
+                self._write(version, index)
+        elif os.path.exists(self.log_path) and os.path.getsize(self.log_path) > LOG_LIMIT:
+            index = index.compacted()
+            with WriteLock(self.path):
+                self._write(version, index)
+        return index
+
+    def get(self):
+        version = self.store.version()
+        return CACHE.get(f"{self.store.path}:search", version, lambda: self._load(version))
+
+    def record(self, position, record, version_before, version_after):
+        # One single-row write (position None appends): one log line, and the cached index patched in place
+        record = {col: record.get(col) for col in [*self.fields, self.key_column] if col}
+        entry = {"before": version_key(version_before), "after": version_key(version_after),
+                 "position": position, "record": record}
+        with WriteLock(self.path):
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+        CACHE.advance(f"{self.store.path}:search", version_before, version_after,
+                      lambda index: index.set_row(position, record, record.get(self.key_column)))
@@ -0,0 +1,852 @@
+import collections
+import contextlib
+import csv
+import datetime
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from core.cache import CACHE
+from core.locking import WriteLock, atomic_write
+
+BACKEND_ENV = "AI_TOOLS_BACKEND" # "csv" (default) or "sqlite"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+MAX_SELECTIONS = 16 # Sorted/filtered row orders kept per frame for select()
+
+# position is the row's index in read() order; versions bracket the write for incremental index updates
+UpsertResult = collections.namedtuple("UpsertResult", "updated position version_before version_after")
+AppendResult = collections.namedtuple("AppendResult", "record version_before version_after")
+BulkAppendResult = collections.namedtuple("BulkAppendResult", "count version_before version_after")
+# A cached frame and how far it was read: while generation (bumped by every rewrite) and source
+# (the file's inode) are unchanged, rows appended after offset (bytes for CSV, a rowid for SQLite)
+# are read on their own; offset None means the next change needs a full reload. edits is the
+# (inode, offset) reached in a CSV store's edits log
+_FrameState = collections.namedtuple("_FrameState", "frame generation source offset edits", defaults=(None,))
+
+
+def _to_timestamp(value):
+    return value if isinstance(value, pd.Timestamp) else pd.Timestamp(value)
+
+
+def string_dtype():
+    # pyarrow-backed strings that keep NaN for missing values (the pandas 3 default "str"),
+    # falling back to Python objects where pyarrow or that dtype isn't available
+    try:
+        return pd.StringDtype("pyarrow", na_value=float("nan"))
+    except (TypeError, ImportError):
+        return object
+
+
+def concat_rows(frame, rows):
+    # frame + appended rows; categorical columns stay categorical with merged categories
+    if rows.empty:
+        return frame
+    rows = rows.copy(deep=False)
+    for col in frame.columns:
+        dtype = frame[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and rows[col].dtype != dtype:
+            new = pd.Index(rows[col].dropna().unique()).difference(dtype.categories)
+            if len(new): # Categories stay sorted (categoricals sort by code), so a new one recodes the column
+                frame = frame.copy(deep=False)
+                frame[col] = frame[col].cat.set_categories(dtype.categories.union(new))
+            rows[col] = rows[col].astype(frame[col].dtype)
+    return pd.concat([frame, rows], ignore_index=True)
+
+
+def changed_fields(old, record):
+    # The fields of record whose value differs from the stored row `old` (missing equals missing)
+    changes = {}
+    for col, new in record.items():
+        before, after = old.get(col), new
+        if pd.isna(before) and (after is None or after == "" or pd.isna(after)):
+            continue
+        if pd.isna(before) or str(before) != str(after):
+            changes[col] = new
+    return changes
+
+
+def parse_dates(values):
+    # Fixed-format parse of the stored timestamps; anything else falls back to per-value inference
+    parsed = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce')
+    unparsed = parsed.isna() & values.notna()
+    if unparsed.any():
+        parsed[unparsed] = pd.to_datetime(values[unparsed], format='mixed', errors='coerce')
+    return parsed
+
+
+class _Unlogged:
+    """Stand-in for ChangeLog.stage() on stores that keep no history."""
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): pass
+    def add(self, rows): pass
+    def update(self, key, changes): pass
+    def rewrite(self, df): pass
+    def commit(self): pass
+    def discard(self): pass
+
+
+class Store:
+    """Common interface for the catalog storage backends.
+
+    The query helpers below run on the in-memory frame; backends that can
+    push them down (SQLite) override them.
+    Writes are logged to `history` (a core.history.ChangeLog) when one is
+    attached, under the write lock and before the data changes.
+    Filters are (column, op, value) tuples with op in ==, !=, in, >=, <=, >, <.
+    read() returns typed columns: nullable Int64 serials, parsed datetimes,
+    the dtypes given per column (e.g. "category"), and pyarrow strings for
+    everything else.
+    """
+
+    def __init__(self, path, columns, serial_column=None, date_column=None, indexes=(), dtypes=None):
+        self.path = path
+        self.columns = list(columns)
+        self.serial_column = serial_column
+        self.date_column = date_column
+        self.indexes = list(indexes)
+        self.dtypes = dict(dtypes or {})
+        self.history = None
+
+    def initialize(self): raise NotImplementedError
+    def version(self): raise NotImplementedError
+    def read(self): raise NotImplementedError
+    def write(self, df): raise NotImplementedError
+    def append(self, record): raise NotImplementedError
+    def append_frames(self, frames): raise NotImplementedError
+    def upsert(self, key_column, record): raise NotImplementedError
+    def compact(self): pass
+
+    # --- Schema ---
+    def _read_dtypes(self):
+        # dtypes the parser can produce directly (the rest are converted in _apply_schema)
+        strings = string_dtype()
+        return {col: self.dtypes.get(col, strings) for col in self.columns
+                if col not in (self.serial_column, self.date_column)}
+
+    def _apply_schema(self, df):
+        dtypes = self._read_dtypes()
+        for col in df.columns:
+            if col == self.serial_column:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+            elif col == self.date_column:
+                if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                    df[col] = parse_dates(df[col])
+            elif col in dtypes and df[col].dtype != dtypes[col]:
+                df[col] = df[col].astype(dtypes[col])
+        return df
+
+    def parse_csv(self, source, names=None):
+        # Typed frame of CSV text; names are given for headerless tails
+        if names is None:
+            df = pd.read_csv(source, dtype=self._read_dtypes())
+        else:
+            df = pd.read_csv(source, header=None, names=list(names), dtype=self._read_dtypes())
+        return self._apply_schema(df)
+
+    def _stage(self):
+        # Change-log entries of the write in progress; called with the write lock held
+        return self.history.stage() if self.history is not None else _Unlogged()
+
+    def save_csv(self, path):
+        # The table as it stands, saved at path in the format parse_csv reads (the change log's
+        # base snapshot); returns the number of rows
+        frame = self.frame().reindex(columns=self.columns)
+        atomic_write(path, lambda f: frame.to_csv(f, index=False, date_format=DATE_FORMAT),
+                     newline="", encoding="utf-8")
+        return len(frame)
+
+    # --- Queries ---
+    def frame(self):
+        return self.read()
+
+    def _mask(self, df, filters):
+        mask = pd.Series(True, index=df.index)
+        for column, op, value in filters or ():
+            series = df[column]
+            if column == self.date_column and op not in ("in", "==", "!="):
+                value = _to_timestamp(value)
+            if op == "==": mask &= series == value
+            elif op == "!=": mask &= series != value
+            elif op == "in": mask &= series.isin(list(value))
+            elif op == ">=": mask &= series >= value
+            elif op == "<=": mask &= series <= value
+            elif op == ">": mask &= series > value
+            elif op == "<": mask &= series < value
+            else: raise ValueError(f"Unsupported filter operator: {op}")
+        return mask
+
+    def count(self, filters=None):
+        df = self.frame()
+        return int(self._mask(df, filters).sum()) if filters else len(df)
+
+    def _selection(self, filters, order_by, descending):
+        # The frame and the positions of its matching rows in the requested order. Positions are
+        # cached per frame and query, so paging through a result sorts once, not once per page.
+        df = self.frame()
+        queries = CACHE.get(f"{self.path}:selections", self.version(), dict)
+        if queries.get("frame") is not df: # Also catches a write between version() and frame()
+            queries.clear()
+            queries["frame"] = df
+        key = repr((filters, order_by, descending))
+        positions = queries.pop(key, None)
+        if positions is None:
+            positions = np.flatnonzero(self._mask(df, filters).to_numpy()) if filters else np.arange(len(df))
+            if order_by:
+                values = df[order_by].take(positions).reset_index(drop=True)
+                order = values.sort_values(ascending=not descending, na_position='last', kind='stable').index
+                positions = positions[order.to_numpy()]
+            while len(queries) > MAX_SELECTIONS:
+                queries.pop(next(key for key in queries if key != "frame"))
+        queries[key] = positions # Most recently used last
+        return df, positions
+
+    def select(self, filters=None, order_by=None, descending=False, limit=None, offset=0):
+        df, positions = self._selection(filters, order_by, descending)
+        stop = offset + limit if limit is not None else None
+        return df.take(positions[offset:stop]) # Only the requested rows are materialized
+
+    def select_page(self, filters=None, order_by=None, descending=False, limit=None, offset=0):
+        # (rows of one page, number of rows matching the filters)
+        df, positions = self._selection(filters, order_by, descending)
+        stop = offset + limit if limit is not None else None
+        return df.take(positions[offset:stop]), len(positions)
+
+
+class CsvStore(Store):
+    """Append-only CSV table.
+
+    Inserts append a single line to the file instead of rewriting it, and
+    updates append the changed fields to an edits log (<path>.edits.log)
+    that readers apply on top of the rows. A compaction pass periodically
+    rewrites the file in canonical order with the edits folded in.
+    Serial numbers come from a counter persisted next to the data file.
+    Writers are serialized by a cross-process WriteLock and full rewrites are
+    published with an atomic rename, so readers never see a partial file.
+    """
+
+    def __init__(self, path, columns, serial_column=None, date_column=None, indexes=(), dtypes=None,
+                 compact_every=1000):
+        super().__init__(path, columns, serial_column, date_column, indexes, dtypes)
+        self.compact_every = compact_every
+        self.meta_path = path + ".meta.json"
+        self.edits_path = path + ".edits.log"
+
+    def _lock(self):
+        return WriteLock(self.path)
+
+    # --- File Setup ---
+    def _is_blank(self):
+        return not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+
+    def initialize(self):
+        if self._is_blank():
+            with self._lock():
+                if self._is_blank():
+                    self._write(pd.DataFrame(columns=self.columns))
+
+    def version(self):
+        # Cheap data version: atomic rewrites get a new inode, appends grow the file, and updates
+        # grow the edits log
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        try:
+            edits = os.path.getsize(self.edits_path)
+        except OSError:
+            edits = 0
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size, edits)
+
+    def _read_raw(self):
+        # Untyped read for the rewrite paths, which may set values outside a column's categories
+        with open(self.path, "rb") as f:
+            edits, _ = self._read_edits()
+            return self._apply_edits(pd.read_csv(f), edits, os.fstat(f.fileno()).st_ino, typed=False)
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            edits, _ = self._read_edits()
+            return self._apply_edits(self.parse_csv(f), edits, os.fstat(f.fileno()).st_ino)
+
+    # --- Edits Log ---
+    def _read_edits(self, previous=None):
+        # Edits logged since previous (an (inode, offset) of the log) or all of them, and the
+        # (inode, offset) after the last whole line. Callers read them before the rows, so each
+        # edit read targets a row they will see.
+        try:
+            f = open(self.edits_path, "rb")
+        except FileNotFoundError:
+            return [], None
+        with f:
+            source = os.fstat(f.fileno()).st_ino
+            offset = previous[1] if previous is not None and previous[0] == source else 0
+            f.seek(offset)
+            data = f.read()
+        data = data[:data.rfind(b"\n") + 1] # A line still being written is read next time
+        return [json.loads(line) for line in data.splitlines()], (source, offset + len(data))
+
+    def _apply_edits(self, frame, edits, source, typed=True):
+        # The rows with the edits made to this data file (source: its inode) applied in log order;
+        # edits of an older file are already part of this one
+        updates = {}
+        for edit in edits:
+            if edit["source"] == source:
+                for position in edit["positions"]:
+                    updates.setdefault(position, {}).update(edit["values"])
+        if not updates:
+            return frame
+        frame = frame.copy(deep=False)
+        for col in {col for values in updates.values() for col in values}:
+            positions = [p for p, values in updates.items() if col in values and p < len(frame)]
+            values = pd.Series([updates[p][col] for p in positions], dtype=object)
+            if typed: # Set as typed values, so the column keeps its dtype without a round trip
+                column = frame[col].copy()
+                values = self._apply_schema(values.to_frame(col))[col]
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    new = pd.Index(values.dropna().unique()).difference(column.cat.categories)
+                    column = column.cat.set_categories(column.cat.categories.union(new))
+                    values = values.astype(object)
+            else:
+                column = frame[col].astype(object)
+            column.iloc[positions] = values.to_numpy()
+            frame[col] = column
+        return frame
+
+    def _log_edit(self, positions, values):
+        # One line per update, written whole; a line cut short by a crash is dropped first
+        line = json.dumps({"source": os.stat(self.path).st_ino, "positions": positions, "values": values},
+                          separators=(",", ":"), default=str) + "\n"
+        with open(self.edits_path, "a+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    f.seek(0)
+                    f.truncate(f.read().rfind(b"\n") + 1)
+            f.write(line.encode("utf-8"))
+
+    def frame(self):
+        # Typed frame for the query helpers, refreshed once per data version (in each process):
+        # rows appended since the cached copy, by any process, are read from the file's tail,
+        # while a rewrite (new generation or file) reloads the whole file
+        return CACHE.refresh(f"{self.path}:frame", self.version(), self._load_frame).frame
+
+    def _generation(self):
+        return self._read_meta().get("generation", 0)
+
+    def _load_frame(self, previous):
+        with open(self.path, "rb") as f:
+            source = os.fstat(f.fileno()).st_ino
+            if (previous is not None and previous.offset is not None and previous.source == source
+                    and previous.generation == self._generation()):
+                edits, edits_state = self._read_edits(previous.edits) # New edits only
+                f.seek(previous.offset)
+                tail = f.read()
+                tail = tail[:tail.rfind(b"\n") + 1] # A line still being written is read next time
+                rows = self.parse_csv(io.BytesIO(tail), previous.frame.columns) if tail.strip() else None
+                frame = previous.frame if rows is None else concat_rows(previous.frame, rows)
+                state = _FrameState(frame, None, source, previous.offset + len(tail))
+            else:
+                edits, edits_state = self._read_edits()
+                state = self._load_full(f, source)
+        # Generation read after the rows: a rewrite landing meanwhile shows up as a change next time
+        return state._replace(frame=self._apply_edits(state.frame, edits, source), generation=self._generation(),
+                              edits=edits_state)
+
+    def _load_full(self, f, source):
+        f.seek(0)
+        frame = self.parse_csv(f)
+        offset = f.tell()
+        start = max(offset - 65536, 0)
+        f.seek(start)
+        last = f.read(offset - start)
+        if offset and not last.endswith(b"\n"):
+            # The last line is incomplete (being appended, or the file lacks a final newline): drop
+            # it here and let the next tail read pick it up once the append completes it
+            cut = last.rfind(b"\n")
+            if frame.empty or cut < 0:
+                return _FrameState(frame, None, source, None)
+            frame, offset = frame.iloc[:-1], start + cut + 1
+        return _FrameState(frame, None, source, offset)
+
+    def write(self, df):
+        with self._lock():
+            staged = self._stage()
+            staged.rewrite(df)
+            staged.commit()
+            self._write(df)
+
+    def _write(self, df):
+        # Full rewrite (write() and compaction); resets the append counter and the edits log (its
+        # edits name the replaced file, so readers skip them even before it's reset)
+        atomic_write(self.path, lambda f: df[self.columns].to_csv(f, index=False), newline="", encoding="utf-8")
+        if os.path.exists(self.edits_path):
+            atomic_write(self.edits_path, lambda f: None)
+        meta = self._read_meta()
+        meta["appends"] = 0
+        meta["generation"] = meta.get("generation", 0) + 1 # Tells readers their cached rows are stale
+        if self.serial_column and "next_serial" in meta:
+            max_serial = pd.to_numeric(df[self.serial_column], errors="coerce").max()
+            if pd.notna(max_serial):
+                meta["next_serial"] = max(meta["next_serial"], int(max_serial) + 1)
+        self._write_meta(meta)
+
+    def save_csv(self, path):
+        # A byte copy of the data file when it already is the table: canonical header, whole lines
+        # and no pending edits (saves encoding every row again)
+        rows = len(self.frame())
+        with open(self.path, "rb") as f:
+            header = f.readline().rstrip(b"\r\n").decode("utf-8", errors="replace")
+            edits, _ = self._read_edits()
+            if header != ",".join(self.columns) or edits or not self._ends_with_newline():
+                return super().save_csv(path)
+            f.seek(0)
+            atomic_write(path, lambda out: shutil.copyfileobj(f, out), mode="wb")
+        return rows
+
+    # --- Serial Counter ---
+    def _read_meta(self):
+        try:
+            with open(self.meta_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, meta):
+        atomic_write(self.meta_path, lambda f: json.dump(meta, f))
+
+    def _scan_max_serial(self):
+        # One-time bootstrap when no counter has been persisted yet
+        try:
+            serials = pd.read_csv(self.path, usecols=[self.serial_column])[self.serial_column]
+        except (OSError, ValueError, pd.errors.EmptyDataError):
+            return 0
+        serials = pd.to_numeric(serials, errors="coerce")
+        return int(serials.max()) if serials.notna().any() else 0
+
+    def _next_serial(self, meta, count=1):
+        # First of `count` consecutive serials, reserved in meta
+        if "next_serial" not in meta:
+            meta["next_serial"] = self._scan_max_serial() + 1
+        serial = meta["next_serial"]
+        meta["next_serial"] = serial + count
+        return serial
+
+    # --- Inserts & Updates ---
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) in (b"\n", b"\r")
+
+    def _append_line(self, record):
+        row = ["" if record.get(col) is None else record.get(col) for col in self.columns]
+        line = io.StringIO()
+        if not self._ends_with_newline():
+            line.write("\n")
+        csv.writer(line, lineterminator="\n").writerow(row)
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            f.write(line.getvalue()) # Single write so readers see whole lines
+
+    def _count_write(self, meta, count=1):
+        # Appends and logged edits since the last rewrite; compacts once there are compact_every
+        meta["appends"] = meta.get("appends", 0) + count
+        self._write_meta(meta)
+        if self.compact_every and meta["appends"] >= self.compact_every:
+            self._compact()
+
+    def append(self, record):
+        self.initialize()
+        record = dict(record)
+        with self._lock():
+            version_before = self.version()
+            meta = self._read_meta()
+            if self.serial_column:
+                record[self.serial_column] = self._next_serial(meta)
+
+            staged = self._stage()
+            staged.add([record])
+            staged.commit()
+
+            self._append_line(record)
+            self._count_write(meta)
+            return AppendResult(record, version_before, self.version())
+
+    def append_frames(self, frames):
+        # Bulk insert in one locked pass: each frame gets a block of serials and is staged in a
+        # temp file, then the staged rows are appended with a single copy. If anything fails
+        # before that copy (e.g. while the caller produces frames), nothing is written.
+        self.initialize()
+        with self._lock():
+            version_before = self.version()
+            meta = self._read_meta()
+            count = 0
+            staged = self._stage()
+            fd, staging = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+                    for frame in frames:
+                        if frame.empty:
+                            continue
+                        frame = frame.reindex(columns=self.columns)
+                        if self.serial_column:
+                            first = self._next_serial(meta, len(frame))
+                            frame[self.serial_column] = range(first, first + len(frame))
+                        frame.to_csv(f, header=False, index=False, lineterminator="\n")
+                        staged.add(frame)
+                        count += len(frame)
+                if count:
+                    staged.commit() # Logged before the rows land
+                    newline = not self._ends_with_newline()
+                    with open(staging, "rb") as src, open(self.path, "ab") as dst:
+                        if newline:
+                            dst.write(b"\n")
+                        shutil.copyfileobj(src, dst)
+            finally:
+                staged.discard()
+                os.remove(staging)
+            if count:
+                self._count_write(meta, count)
+            return BulkAppendResult(count, version_before, self.version())
+
+    def upsert(self, key_column, record):
+        # One record under the write lock: a new key is appended as a single line, an existing one
+        # gets its changed fields logged as an edit; neither rewrites the file
+        self.initialize()
+        with self._lock():
+            version_before = self.version()
+            df = self.frame() # Current: no other writer can get in before the lock is released
+            matches = np.flatnonzero((df[key_column] == record[key_column]).to_numpy(dtype=bool, na_value=False))
+            updated = len(matches) > 0
+            staged = self._stage()
+            if updated:
+                position = int(matches[0])
+                changes = changed_fields(df.iloc[position], {col: record[col] for col in record if col != key_column})
+                staged.update(record[key_column], changes)
+                staged.commit()
+                if changes:
+                    self._log_edit(matches.tolist(), changes)
+                    self._count_write(self._read_meta())
+            else:
+                position = len(df)
+                staged.add([record])
+                staged.commit()
+                self._append_line(record)
+                self._count_write(self._read_meta())
+            return UpsertResult(updated, position, version_before, self.version())
+
+    # --- Compaction ---
+    def compact(self):
+        with self._lock():
+            self._compact()
+
+    def _compact(self):
+        df = self._read_raw()
+        for col in self.columns:
+            if col not in df.columns:
+                df[col] = pd.NA
+        if self.serial_column:
+            serials = pd.to_numeric(df[self.serial_column], errors="coerce").astype("Int64")
+            df[self.serial_column] = serials
+            # Newest entries first, matching the layout save_data used to produce
+            duplicated = serials.notna() & df.duplicated(subset=[self.serial_column], keep="last")
+            df = df[~duplicated]
+            df = df.sort_values(self.serial_column, ascending=False, na_position="last")
+        self._write(df)
+
+
+class SqliteStore(Store):
+    """SQLite table in WAL mode with indexes on the commonly filtered columns.
+
+    Counts, filters and "most recent" lookups run as SQL instead of pandas
+    passes over the full frame.
+    """
+
+    TABLE = "tools"
+    OPERATORS = {"==": "=", "!=": "!=", ">=": ">=", "<=": "<=", ">": ">", "<": "<"}
+
+    def __init__(self, path, columns, serial_column=None, date_column=None, indexes=(), dtypes=None):
+        super().__init__(path, columns, serial_column, date_column, indexes, dtypes)
+        self._ready = False
+
+    # --- Connection Handling ---
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent writers queue on busy_timeout
+        with contextlib.closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                # Every write transaction bumps the data version readers key their caches on
+                conn.execute("INSERT INTO meta (key, value) VALUES ('version', 1) "
+                             "ON CONFLICT(key) DO UPDATE SET value = value + 1")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _query(self, sql, params=()):
+        self.initialize()
+        with contextlib.closing(self._connect()) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def _column_type(self, column):
+        return "INTEGER" if column == self.serial_column else "TEXT"
+
+    def initialize(self):
+        if self._ready:
+            return
+        with contextlib.closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns_sql = ", ".join(f'"{col}" {self._column_type(col)}' for col in self.columns)
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} ({columns_sql})")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+            for col in self.indexes:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{self.TABLE}_{col}" ON {self.TABLE} ("{col}")')
+        self._ready = True
+
+    def version(self):
+        # Write counter maintained by _transaction
+        rows = self._query("SELECT value FROM meta WHERE key = 'version'")
+        return rows[0][0] if rows else 0
+
+    # --- Reads & Writes ---
+    def _columns_sql(self):
+        return ", ".join(f'"{col}"' for col in self.columns)
+
+    def read(self):
+        self.initialize()
+        with contextlib.closing(self._connect()) as conn:
+            df = pd.read_sql_query(f"SELECT {self._columns_sql()} FROM {self.TABLE} ORDER BY rowid", conn)
+        return self._apply_schema(df)
+
+    def _rows(self, df):
+        df = df.reindex(columns=self.columns)
+        if self.date_column and pd.api.types.is_datetime64_any_dtype(df[self.date_column]):
+            df[self.date_column] = df[self.date_column].dt.strftime(DATE_FORMAT)
+        if self.serial_column:
+            df[self.serial_column] = pd.to_numeric(df[self.serial_column], errors="coerce").astype("Int64")
+        df = df.astype(object).where(df.notna(), None)
+        return df.itertuples(index=False, name=None)
+
+    def _get_meta(self, conn, key):
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn, key, value):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _bump_generation(self, conn):
+        # For writes that change existing rows: readers reload instead of reading new rowids only
+        conn.execute("INSERT INTO meta (key, value) VALUES ('generation', 1) "
+                     "ON CONFLICT(key) DO UPDATE SET value = value + 1")
+
+    def frame(self):
+        # Typed frame, refreshed once per data version (in each process): rows inserted since the
+        # cached copy are fetched by rowid, anything else (new generation) reloads the table
+        return CACHE.refresh(f"{self.path}:frame", self.version(), self._load_frame).frame
+
+    def _load_frame(self, previous):
+        self.initialize()
+        with contextlib.closing(self._connect()) as conn:
+            conn.execute("BEGIN") # One snapshot for the generation and the rows
+            try:
+                generation = self._get_meta(conn, "generation") or 0
+                last = conn.execute(f"SELECT MAX(rowid) FROM {self.TABLE}").fetchone()[0] or 0
+                start = previous.offset if previous is not None and previous.generation == generation else None
+                df = pd.read_sql_query(f"SELECT {self._columns_sql()} FROM {self.TABLE} WHERE rowid > ? AND rowid <= ? "
+                                       "ORDER BY rowid", conn, params=(start or 0, last))
+            finally:
+                conn.execute("COMMIT")
+        rows = self._apply_schema(df)
+        frame = rows if start is None else concat_rows(previous.frame, rows)
+        return _FrameState(frame, generation, None, last)
+
+    def _sync_serial_counter(self, conn):
+        max_serial = conn.execute(f'SELECT MAX("{self.serial_column}") FROM {self.TABLE}').fetchone()[0]
+        next_serial = max(self._get_meta(conn, "next_serial") or 1, (max_serial or 0) + 1)
+        self._set_meta(conn, "next_serial", next_serial)
+        return next_serial
+
+    def write(self, df):
+        self.initialize()
+        placeholders = ", ".join("?" for _ in self.columns)
+        with self._transaction() as conn:
+            self._bump_generation(conn)
+            conn.execute(f"DELETE FROM {self.TABLE}")
+            conn.executemany(f"INSERT INTO {self.TABLE} ({self._columns_sql()}) VALUES ({placeholders})", self._rows(df))
+            if self.serial_column:
+                self._sync_serial_counter(conn)
+            staged = self._stage()
+            staged.rewrite(df)
+            staged.commit() # Logged before the transaction commits
+
+    def append(self, record):
+        self.initialize()
+        record = dict(record)
+        placeholders = ", ".join("?" for _ in self.columns)
+        with self._transaction() as conn:
+            version_before = self._get_meta(conn, "version") or 0
+            if self.serial_column:
+                serial = self._get_meta(conn, "next_serial") or self._sync_serial_counter(conn)
+                record[self.serial_column] = serial
+                self._set_meta(conn, "next_serial", serial + 1)
+            conn.execute(f"INSERT INTO {self.TABLE} ({self._columns_sql()}) VALUES ({placeholders})",
+                         [record.get(col) for col in self.columns])
+            staged = self._stage()
+            staged.add([record])
+            staged.commit()
+        return AppendResult(record, version_before, version_before + 1)
+
+    def append_frames(self, frames):
+        # Bulk insert in a single transaction, one executemany per frame
+        self.initialize()
+        placeholders = ", ".join("?" for _ in self.columns)
+        count = 0
+        with self._transaction() as conn:
+            version_before = self._get_meta(conn, "version") or 0
+            serial = None
+            if self.serial_column:
+                serial = self._get_meta(conn, "next_serial") or self._sync_serial_counter(conn)
+            with self._stage() as staged: # Dropped unread if a frame fails
+                for frame in frames:
+                    if frame.empty:
+                        continue
+                    frame = frame.reindex(columns=self.columns)
+                    if serial is not None:
+                        frame[self.serial_column] = range(serial, serial + len(frame))
+                        serial += len(frame)
+                    conn.executemany(f"INSERT INTO {self.TABLE} ({self._columns_sql()}) VALUES ({placeholders})",
+                                     self._rows(frame))
+                    staged.add(frame)
+                    count += len(frame)
+                staged.commit() # Logged before the transaction commits
+            if serial is not None:
+                self._set_meta(conn, "next_serial", serial)
+        return BulkAppendResult(count, version_before, version_before + 1)
+
+    def upsert(self, key_column, record):
+        self.initialize()
+        columns = [col for col in record if col != key_column]
+        assignments = ", ".join(f'"{col}" = ?' for col in columns)
+        with self._transaction() as conn:
+            version_before = self._get_meta(conn, "version") or 0
+            row = conn.execute(f'SELECT MIN(rowid) FROM {self.TABLE} WHERE "{key_column}" = ?',
+                               (record[key_column],)).fetchone()
+            updated = row[0] is not None
+            staged = self._stage()
+            if updated:
+                position = conn.execute(f"SELECT COUNT(*) FROM {self.TABLE} WHERE rowid < ?", (row[0],)).fetchone()[0]
+                columns_sql = ", ".join(f'"{col}"' for col in columns)
+                old = conn.execute(f"SELECT {columns_sql} FROM {self.TABLE} WHERE rowid = ?", (row[0],)).fetchone()
+                staged.update(record[key_column], changed_fields(dict(zip(columns, old)), {col: record[col] for col in columns}))
+                self._bump_generation(conn)
+                conn.execute(f'UPDATE {self.TABLE} SET {assignments} WHERE "{key_column}" = ?',
+                             [record[col] for col in columns] + [record[key_column]])
+            else:
+                position = conn.execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()[0]
+                placeholders = ", ".join("?" for _ in self.columns)
+                conn.execute(f"INSERT INTO {self.TABLE} ({self._columns_sql()}) VALUES ({placeholders})",
+                             [record.get(col) for col in self.columns])
+                staged.add([record])
+            staged.commit()
+        return UpsertResult(updated, position, version_before, version_before + 1)
+
+    def compact(self):
+        self._query("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def is_empty(self):
+        return not self._query(f"SELECT 1 FROM {self.TABLE} LIMIT 1")
+
+    def import_csv(self, csv_path):
+        # One-shot import of an existing CSV catalog
+        df = pd.read_csv(csv_path)
+        for col in self.columns:
+            if col not in df.columns:
+                df[col] = pd.NA
+        if self.date_column:
+            df[self.date_column] = parse_dates(df[self.date_column])
+        self.write(df)
+        return len(df)
+
+    # --- Queries (pushed down to SQL) ---
+    def _sql_value(self, column, value):
+        if isinstance(value, (datetime.date, pd.Timestamp)):
+            return _to_timestamp(value).strftime(DATE_FORMAT)
+        return value
+
+    def _where_sql(self, filters):
+        clauses, params = [], []
+        for column, op, value in filters or ():
+            if op == "in":
+                values = [self._sql_value(column, v) for v in value]
+                if not values:
+                    clauses.append("0")
+                    continue
+                clauses.append(f'"{column}" IN ({", ".join("?" for _ in values)})')
+                params.extend(values)
+            elif op in self.OPERATORS:
+                clauses.append(f'"{column}" {self.OPERATORS[op]} ?')
+                params.append(self._sql_value(column, value))
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(self, filters=None):
+        where, params = self._where_sql(filters)
+        return self._query(f"SELECT COUNT(*) FROM {self.TABLE}{where}", params)[0][0]
+
+    def select(self, filters=None, order_by=None, descending=False, limit=None, offset=0):
+        where, params = self._where_sql(filters)
+        sql = f"SELECT {self._columns_sql()} FROM {self.TABLE}{where}"
+        if order_by: # rowid breaks ties, so pages of equal values don't overlap
+            sql += f' ORDER BY "{order_by}" IS NULL, "{order_by}" {"DESC" if descending else "ASC"}, rowid'
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params = list(params) + [-1 if limit is None else limit, offset]
+        self.initialize()
+        with contextlib.closing(self._connect()) as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+        return self._apply_schema(df)
+
+    def select_page(self, filters=None, order_by=None, descending=False, limit=None, offset=0):
+        # One indexed COUNT plus one LIMIT/OFFSET query; only the page's rows leave SQLite
+        return self.select(filters, order_by, descending, limit, offset), self.count(filters)
+
+
+def sqlite_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".db"
+
+
+def open_store(csv_path, columns, serial_column=None, date_column=None, indexes=(), dtypes=None, history_key=None):
+    # Pick the backend from AI_TOOLS_BACKEND; the SQLite database lives next to the CSV.
+    # With a history_key, every write is also logged to <csv_path>.history/ (see core.history)
+    backend = os.environ.get(BACKEND_ENV, "csv").lower()
+    if backend == "csv":
+        store = CsvStore(csv_path, columns, serial_column, date_column, indexes, dtypes)
+    elif backend == "sqlite":
+        db_path = sqlite_path(csv_path)
+        first_open = not os.path.exists(db_path)
+        store = SqliteStore(db_path, columns, serial_column, date_column, indexes, dtypes)
+        if first_open and os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
+            store.import_csv(csv_path)
+    else:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    if history_key is not None:
+        from core.history import ChangeLog # core.history builds on this module
+        store.history = ChangeLog(store, history_key)
+    return store
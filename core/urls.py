@@ -0,0 +1,131 @@
+# URL canonicalization shared by duplicate detection, the link views and the domain rollups.
+# A canonical URL is host + path: scheme, credentials, port, query and fragment are dropped,
+# the host is lowercased without a leading "www." and the path loses its trailing slashes.
+# The registrable domain is the host's public suffix plus one label ("openai.com" for
+# "platform.openai.com", "bbc.co.uk" for "www.bbc.co.uk").
+import re
+
+import numpy as np
+import pandas as pd
+
+URL_PATTERN = r"^\s*(?:(?:([A-Za-z][A-Za-z0-9+.\-]*):)?//)?(?:[^@/?#\s]*@)?([^:/?#\s]*)(?::\d*)?([^?#\s]*)"
+_URL_RE = re.compile(URL_PATTERN)
+_IP_HOST = r"^[\d.]+$"
+
+# Multi-label public suffixes common among tool sites (second-level country domains and hosting
+# platforms that give each customer a subdomain); any other host's suffix is its last label
+PUBLIC_SUFFIXES = frozenset({
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "com.au", "net.au", "org.au", "co.nz", "co.jp",
+    "ne.jp", "or.jp", "co.kr", "co.in", "net.in", "org.in", "com.br", "com.cn", "com.hk", "com.sg",
+    "com.tr", "com.mx", "com.ar", "co.za", "co.il", "com.tw", "com.ua", "com.pl",
+    "github.io", "gitlab.io", "vercel.app", "netlify.app", "herokuapp.com", "pages.dev", "web.app",
+    "firebaseapp.com", "azurewebsites.net", "appspot.com", "streamlit.app", "hf.space",
+    "notion.site", "substack.com", "webflow.io", "framer.app", "framer.website", "wixsite.com",
+    "blogspot.com", "wordpress.com", "replit.app", "onrender.com", "fly.dev", "glitch.me",
+})
+PARTS = ["scheme", "host", "domain", "path", "canonical"]
+
+
+def _host(host):
+    host = host.lower().rstrip(".")
+    return host[4:] if host.startswith("www.") else host
+
+
+def canonical_url(url):
+    # '' for a missing or host-less URL
+    if not isinstance(url, str):
+        return ""
+    _, host, path = _URL_RE.match(url).groups()
+    host = _host(host)
+    return host + path.rstrip("/") if host else ""
+
+
+def _strings(urls):
+    return urls.astype(object).where(urls.notna(), "").astype(str)
+
+
+def canonical_urls(urls):
+    # Vectorized canonical_url over a Series
+    parts = _strings(urls).str.extract(URL_PATTERN)
+    hosts = parts[1].fillna("").str.lower().str.rstrip(".").str.replace(r"^www\.", "", regex=True)
+    canonical = hosts + parts[2].fillna("").str.rstrip("/")
+    return canonical.where(hosts != "", "").astype(object).rename(urls.name)
+
+
+def registrable_domains(hosts):
+    # Registrable domain of each of a Series of lowercased hosts (IPs and one- or two-label hosts
+    # unchanged)
+    two = hosts.str.replace(r"^.*\.([^.]+\.[^.]+)$", r"\1", regex=True)
+    three = hosts.str.replace(r"^.*\.([^.]+\.[^.]+\.[^.]+)$", r"\1", regex=True)
+    return two.where(~two.isin(PUBLIC_SUFFIXES), three).where(~hosts.str.match(_IP_HOST), hosts)
+
+
+def split_urls(urls):
+    # Scheme, host, registrable domain, path and canonical URL of each URL ('' when absent), indexed
+    # like urls. Same parse as URL_PATTERN, written as anchored replaces, which pandas runs natively
+    # on pyarrow strings (str.extract goes through Python per value)
+    text = _strings(urls).str.strip()
+    rest = text.str.replace(r"^(?:[A-Za-z][A-Za-z0-9+.\-]*:)?//", "", regex=True)
+    authority = rest.str.replace(r"[/?#\s].*", "", regex=True)
+    hosts = authority.str.replace(r"^.*@", "", regex=True).str.replace(r":.*", "", regex=True)
+    hosts = hosts.str.lower().str.rstrip(".").str.replace(r"^www\.", "", regex=True)
+    paths = rest.str.replace(r"^[^/?#\s]*", "", regex=True).str.replace(r"[?#\s].*", "", regex=True).str.rstrip("/")
+    schemes = text.str.replace(r"://.*", "", regex=True).str.lower()
+    has_host = hosts != ""
+    return pd.DataFrame({
+        "scheme": schemes.where(has_host & text.str.match(r"[A-Za-z][A-Za-z0-9+.\-]*://"), ""),
+        "host": hosts,
+        "domain": registrable_domains(hosts).where(has_host, ""),
+        "path": paths.where(has_host, ""),
+        "canonical": (hosts + paths).where(has_host, ""),
+    }, index=urls.index)
+
+
+def _extend(categorical, values):
+    # categorical with values appended; new categories go after the old ones so existing codes hold
+    categories = categorical.categories
+    codes = categories.get_indexer(values)
+    missing = codes < 0
+    if missing.any():
+        added = pd.Index(values[missing]).unique()
+        codes[missing] = len(categories) + added.get_indexer(values[missing])
+        categories = categories.append(added)
+    return pd.Categorical.from_codes(np.concatenate([categorical.codes, codes]), categories)
+
+
+class UrlParts:
+    """A URL column split into PARTS, stored as one categorical column per part.
+
+    columns is row-aligned with the URLs it was built from; by_url holds the
+    (categorical) parts of each distinct URL, so build() given the previous
+    result parses only URLs it hasn't seen, e.g. those of rows appended since.
+    """
+
+    def __init__(self, columns, by_url):
+        self.columns = columns
+        self.by_url = by_url
+
+    def __len__(self):
+        return len(self.columns)
+
+    @classmethod
+    def build(cls, urls, previous=None):
+        codes, uniques = pd.factorize(_strings(urls))
+        by_url = previous.by_url if previous is not None else None
+        if by_url is not None and len(by_url) > 2 * len(uniques) + 1000: # Mostly URLs no longer in the data
+            by_url = None
+        if by_url is None:
+            by_url = split_urls(pd.Series(uniques, index=uniques)).astype("category")
+            positions = np.arange(len(uniques))
+        else:
+            positions = by_url.index.get_indexer(uniques)
+            new = positions < 0
+            if new.any():
+                parsed = split_urls(pd.Series(uniques[new], index=uniques[new]))
+                by_url = pd.DataFrame({part: _extend(by_url[part].array, parsed[part].to_numpy(object))
+                                       for part in PARTS}, index=by_url.index.append(parsed.index))
+                positions[new] = np.arange(len(by_url) - new.sum(), len(by_url))
+        rows = positions[codes] # Row -> position of its URL in by_url
+        columns = {part: pd.Categorical.from_codes(by_url[part].cat.codes.to_numpy()[rows], by_url[part].cat.categories)
+                   for part in PARTS}
+        return cls(pd.DataFrame(columns, index=urls.index), by_url)
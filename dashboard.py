@@ -1,16 +1,24 @@
 import streamlit as st
 import pandas as pd
 import datetime
-import time
 import os
-import plotly.express as px
-import plotly.graph_objects as go # Not explicitly used, but good to have if making complex plots
-# from plotly.subplots import make_subplots # Not used in this version
-import requests
-import json
+import time
+from pathlib import Path
+
+from core import dashboard_data
+from core.assets import ASSETS, lottie_html
+from core.bulk_import import REQUIRED_COLUMNS, import_tools
+from core.charts import cached_figure, category_pie, cumulative_line, domain_bar, stacked_bars
+from core.dashboard_data import CSV_COLUMNS, CSV_FILE, TOOL_CATEGORIES, UPLOADER_NAMES, Page, validate_inputs
+from core.export import EXPORT_DIR, deferred_download, export_formats
+from core.notify import watch
+from core.profiling import render_sidebar, start_run
+
+# Nothing below touches Streamlit at import time; the page is built by main().
+# Plotly is imported by core.charts only when the Dashboard page draws its charts.
 
 # --- Page Configuration ---
-st.set_page_config(
+PAGE_CONFIG = dict(
     page_title="AI Tools Dashboard",
     page_icon="🤖",
     layout="wide",
@@ -18,7 +26,7 @@ st.set_page_config(
 )
 
 # --- Custom CSS ---
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     /* Import Google Fonts */
     @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap');
@@ -138,138 +146,145 @@ st.markdown("""
          div[data-testid="stRadio"] > div { flex-wrap: wrap; justify-content: center; } 
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 # --- Session State Initialization ---
-if 'data_updated' not in st.session_state:
-    st.session_state.data_updated = False
-if 'current_page_navbar' not in st.session_state:
-    st.session_state.current_page_navbar = "🏠 Dashboard"
+def init_session_state():
+    if 'data_updated' not in st.session_state:
+        st.session_state.data_updated = False
+    if 'current_page_navbar' not in st.session_state:
+        st.session_state.current_page_navbar = "🏠 Dashboard"
 
 # --- Global Variables & Constants ---
-CSV_FILE = "ai_tools_database.csv"
-CSV_COLUMNS = ['Serial_Number', 'Name', 'Tool_Link', 'Category', 'Uploaded_By', 'Date_Time', 'Purpose']
-UPLOADER_NAMES = ["Select your name", "Vamsi Krishna Yevvari", "Rayna", "Vijayashree", "Saakshi", "Sneha", "Sachin", "Manjunath", "Shamanth", "Swaroop", "Shahid", "Other"]
-TOOL_CATEGORIES = ["Select Category", "Content Creation", "Image Generation", "Data Analysis", 
-                   "Social Media Management", "Email Marketing", "SEO Tools", "Video Editing", 
-                   "Voice/Audio", "Translation", "Chatbots", "Design Tools", "Analytics", 
-                   "Productivity", "Research", "Code Generation", "Developer Tools", "Other"]
+# Schema, option lists and the data functions live in core.dashboard_data (importable without Streamlit)
+STORE = dashboard_data.open_dashboard_store(CSV_FILE)
+STATS = dashboard_data.open_stats(STORE)
+SEARCH = dashboard_data.open_search(STORE) # Full-text index over Name/Purpose/Category, persisted next to the data
+LINKS = dashboard_data.open_link_health(STORE) # Tool_Link checks, run in a background thread
 
 
 # --- Data Handling Functions ---
 def initialize_csv():
-    if not os.path.exists(CSV_FILE):
-        pd.DataFrame(columns=CSV_COLUMNS).to_csv(CSV_FILE, index=False)
-    else: 
-        try:
-            df_existing = pd.read_csv(CSV_FILE)
-            # Check and add 'Tool_Link' if missing (for backward compatibility)
-            if 'Tool_Link' not in df_existing.columns and 'Name' in df_existing.columns:
-                name_idx = df_existing.columns.get_loc('Name')
-                df_existing.insert(name_idx + 1, 'Tool_Link', pd.NA)
-                df_existing.to_csv(CSV_FILE, index=False)
-        except pd.errors.EmptyDataError: 
-            pd.DataFrame(columns=CSV_COLUMNS).to_csv(CSV_FILE, index=False)
-        except Exception: pass 
-
-@st.cache_data # Caching the data loading significantly improves performance
+    dashboard_data.initialize_csv(STORE)
+
 def load_data():
-    initialize_csv()
     try:
-        df = pd.read_csv(CSV_FILE)
-        if df.empty: return pd.DataFrame(columns=CSV_COLUMNS)
-        
-        # Ensure all defined columns exist, fill with NA if not
-        for col in CSV_COLUMNS:
-            if col not in df.columns:
-                df[col] = pd.NA
-        
-        df['Date_Time'] = pd.to_datetime(df['Date_Time'], errors='coerce')
-        df['Tool_Link'] = df['Tool_Link'].fillna('') # Ensure Tool_Link is never NaN for display
-        
-        # Return DataFrame with columns in the defined order
-        return df[CSV_COLUMNS].sort_values('Date_Time', ascending=False)
+        return dashboard_data.load_data(STORE)
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
         return pd.DataFrame(columns=CSV_COLUMNS)
 
-def save_data(df):
+def add_entry(name, tool_link, category, uploaded_by, purpose):
     try:
-        # Ensure DataFrame columns are in the correct order before saving
-        df[CSV_COLUMNS].to_csv(CSV_FILE, index=False)
-        st.session_state.data_updated = True
-        return True
+        dashboard_data.add_entry(STORE, STATS, name, tool_link, category, uploaded_by, purpose, search=SEARCH)
     except Exception as e:
         st.error(f"Error saving data: {str(e)}")
         return False
+    st.session_state.data_updated = True # The append changed the data version, so cached reads refresh themselves
+    return True
 
-def validate_inputs(name, tool_link, category, uploaded_by, purpose):
-    errors = []
-    if not name or len(name.strip()) < 2: errors.append("Tool name: min 2 characters.")
-    if tool_link and not (tool_link.strip().startswith("http://") or tool_link.strip().startswith("https://")):
-        errors.append("Tool link: must be a valid URL (http:// or https://).")
-    if not category or category == "Select Category": errors.append("Category: please select one.")
-    if not uploaded_by or uploaded_by == "Select your name": errors.append("Your Name: please select from dropdown.")
-    if not purpose or len(purpose.strip()) < 5: errors.append("Purpose: min 5 characters.")
-    return errors
+def search_entries(query):
+    try:
+        return dashboard_data.search_entries(STORE, SEARCH, query)
+    except Exception as e:
+        st.error(f"Error searching: {str(e)}")
+        return pd.DataFrame(columns=CSV_COLUMNS)
 
-def add_entry(name, tool_link, category, uploaded_by, purpose):
-    df = load_data()
-    serial_num = 1
-    if not df.empty and pd.notna(df['Serial_Number'].max()): # Check if max is not NaN
-        serial_num = int(df['Serial_Number'].max() + 1)
-    
-    new_entry_data = {
-        'Serial_Number': serial_num,
-        'Name': name.strip(),
-        'Tool_Link': tool_link.strip() if tool_link else '',
-        'Category': category,
-        'Uploaded_By': uploaded_by.strip(), # .strip() in case "Other " was selected with space
-        'Date_Time': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'Purpose': purpose.strip()
-    }
-    new_df_row = pd.DataFrame([new_entry_data])
-    # Concatenate and ensure columns are in the correct order
-    updated_df = pd.concat([new_df_row, df], ignore_index=True)[CSV_COLUMNS]
-    
-    if save_data(updated_df):
-        st.cache_data.clear() # Crucial to clear cache after data modification
-        return True
-    return False
+def fetch_page(filters, order_by, descending, page, page_size):
+    try:
+        return dashboard_data.fetch_page(STORE, filters, order_by, descending, page, page_size)
+    except Exception as e:
+        st.error(f"Error loading data: {str(e)}")
+        return Page(pd.DataFrame(columns=CSV_COLUMNS), 0, 0, 1)
 
-# --- UI Helper Functions ---
-def load_lottie_url(url: str):
+def dead_link_entries():
+    try:
+        return dashboard_data.dead_link_entries(STORE, LINKS)
+    except Exception as e:
+        st.error(f"Error loading link health: {str(e)}")
+        return pd.DataFrame(columns=CSV_COLUMNS + ['Link_Status'])
+
+def timeline(stats, by, start, end):
+    try:
+        return dashboard_data.timeline(stats, by, start, end)
+    except Exception as e:
+        st.error(f"Error loading the timeline: {str(e)}")
+        return pd.DataFrame(columns=['Date', 'Count', 'Cumulative']), 'day'
+
+def domain_counts(contributor=None):
+    try:
+        return dashboard_data.domain_counts(STORE, contributor)
+    except Exception as e:
+        st.error(f"Error loading domains: {str(e)}")
+        return pd.DataFrame(columns=['Domain', 'Uploaded_By', 'Tools'])
+
+def find_duplicates(name, tool_link):
+    # Hash lookups on the normalized name and canonical URL, plus similar names
     try:
-        r = requests.get(url, timeout=10) # Added timeout
-        return r.json() if r.status_code == 200 else None
-    except requests.exceptions.RequestException: # Catch specific request errors
+        return dashboard_data.find_duplicates(STORE, name, tool_link)
+    except Exception as e:
+        st.error(f"Error checking for duplicates: {str(e)}")
+        return []
+
+def submit_entry(name, tool_link, category, uploaded_by, purpose):
+    with st.spinner("Adding tool to database..."):
+        time.sleep(0.5) 
+        if add_entry(name, tool_link, category, uploaded_by, purpose):
+            st.success("🎉 Tool added successfully!")
+            st.balloons()
+            time.sleep(1.5) 
+            st.rerun() # Rerun to clear form and update any views
+        else: 
+            st.error("❌ Failed to add tool. Please check logs or try again.")
+
+def bulk_import(uploaded_file):
+    # Streams the upload in chunks; rejected rows are written to a per-upload error report
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    error_report = os.path.join(EXPORT_DIR, f"import_errors_{datetime.datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}.csv")
+    try:
+        report = import_tools(STORE, STATS, uploaded_file, error_report=error_report)
+    except Exception as e:
+        st.error(f"Error importing data: {str(e)}")
         return None
+    st.session_state.data_updated = True
+    return report
 
+# --- UI Helper Functions ---
 def display_lottie(lottie_json, height=200, key_suffix=""):
     if lottie_json:
-        animation_id = f"lottie-animation-{key_suffix}-{int(time.time() * 1000)}"
-        st.markdown(f"""
-        <div class="lottie-container">
-            <script src="https://cdnjs.cloudflare.com/ajax/libs/lottie-web/5.9.6/lottie.min.js"></script>
-            <div id="{animation_id}" style="width: 100%; max-width: {height}px; height: auto;"></div>
-            <script>
-                var container = document.getElementById('{animation_id}');
-                if (container && !container.classList.contains('lottie-rendered')) {{ // Check if already rendered
-                    lottie.loadAnimation({{ 
-                        container: container, 
-                        renderer: 'svg', 
-                        loop: true, 
-                        autoplay: true, 
-                        animationData: {json.dumps(lottie_json)} 
-                    }});
-                    container.classList.add('lottie-rendered'); // Mark as rendered
-                }}
-            </script>
-        </div>""", unsafe_allow_html=True)
+        # The animation is served once as a static file; the stable content-hash id keeps the markup identical across reruns
+        digest, url = ASSETS.publish(lottie_json)
+        animation_id = f"lottie-animation-{key_suffix}-{digest[:12]}"
+        st.markdown(lottie_html(animation_id, height, f"path: '{url}'"), unsafe_allow_html=True)
+
+def display_tools_table(rows):
+    # rows come from dashboard_data.format_rows (links filled, timestamps already formatted)
+    display_df = rows.rename(columns={
+        'Serial_Number': 'S.No', 'Name': 'Tool Name', 'Tool_Link': 'Link', 
+        'Uploaded_By': 'Added By', 'Date_Time': 'Timestamp', 'Purpose': 'Purpose/Usage'
+    })
+    # Ensure only existing columns are selected for display
+    cols_to_display = ['S.No', 'Tool Name', 'Link', 'Category', 'Added By', 'Timestamp', 'Purpose/Usage']
+    existing_cols_for_display = [col for col in cols_to_display if col in display_df.columns]
+
+    st.dataframe(
+        display_df[existing_cols_for_display], 
+        use_container_width=True, 
+        hide_index=True,
+        column_config={
+            "S.No": st.column_config.NumberColumn(width="small", format="%d"), 
+            "Tool Name": st.column_config.TextColumn(width="medium"),
+            "Link": st.column_config.LinkColumn(display_text="Visit 🔗", width="small", help="Link to tool"),
+            "Category": st.column_config.TextColumn(width="small"), 
+            "Added By": st.column_config.TextColumn(width="small"),
+            "Timestamp": st.column_config.TextColumn(width="medium"), 
+            "Purpose/Usage": st.column_config.TextColumn(width="large"),
+        }
+    )
 
 def display_navbar():
     st.markdown('<div class="navbar-outer-container"><div class="navbar-container">', unsafe_allow_html=True)
-    page_options = ["🏠 Dashboard", "➕ Add Tools"]
+    page_options = ["🏠 Dashboard", "📋 Explore", "➕ Add Tools"]
     if st.session_state.current_page_navbar not in page_options: 
         st.session_state.current_page_navbar = page_options[0]
     
@@ -289,27 +304,36 @@ def display_navbar():
         st.rerun() # Rerun the script to reflect page change
     return st.session_state.current_page_navbar
 
-# --- Main Application Flow ---
-page = display_navbar()
+# --- Pages ---
+TIMELINE_BREAKDOWNS = {"Total": None, "By Category": 'category', "By Contributor": 'contributor'}
 
-if page == "🏠 Dashboard":
+def render_dashboard_page(profile):
     st.markdown('<div class="page-container">', unsafe_allow_html=True)
     
-    df_dashboard_data = load_data() # Load data once for this page
+    with profile.phase("stats"):
+        data_version = STORE.version() # Figures below are cached per data version
+        stats = STATS.get() # Metrics and charts below come from the persisted aggregates, not a table scan
+    total_tools = stats.total
     
     # Quick Stats & Download Section
     st.markdown('<div class="quick-stats-container">', unsafe_allow_html=True)
-    if not df_dashboard_data.empty:
+    if total_tools:
+        unique_categories = stats.unique_categories()
         stat_cols = st.columns([2,2,3]) # Adjust column ratios as needed
-        stat_cols[0].metric("Total Tools", len(df_dashboard_data))
-        stat_cols[1].metric("Categories", df_dashboard_data['Category'].nunique())
+        stat_cols[0].metric("Total Tools", total_tools)
+        stat_cols[1].metric("Categories", unique_categories)
         with stat_cols[2]:
+            formats = export_formats()
+            export_format = st.selectbox("Format", list(formats), key="export_format", label_visibility="collapsed")
+            writer, suffix, mime = formats[export_format]
+            # Export bytes are built on click and cached per data version and format
             st.download_button(
                 label="📥 Download Dataset", 
-                data=df_dashboard_data.to_csv(index=False),
-                file_name=f"ai_tools_dataset_{datetime.date.today().strftime('%Y%m%d')}.csv", 
-                mime="text/csv",
-                help="Download the complete dataset as CSV file.", 
+                data=deferred_download(f"dashboard-{suffix.strip('.')}", STORE.version,
+                                       lambda f: writer(load_data(), f), suffix),
+                file_name=f"ai_tools_dataset_{datetime.date.today().strftime('%Y%m%d')}{suffix}", 
+                mime=mime,
+                help=f"Download the complete dataset as {export_format}.", 
                 use_container_width=True
             )
     else:
@@ -322,20 +346,20 @@ if page == "🏠 Dashboard":
                     <div class="hero-subtitle">Empowering Marketing Excellence Through AI Innovation</div>
                  </div>""", unsafe_allow_html=True)
 
-    if df_dashboard_data.empty:
+    if not total_tools:
         col_center, _ = st.columns([3,1]) 
         with col_center:
-             lottie_empty = load_lottie_url("https://assets1.lottiefiles.com/packages/lf20_VgJfK5.json")
+             lottie_empty = ASSETS.load_named("empty_dashboard") # Falls back to the bundled robot animation
              if lottie_empty: display_lottie(lottie_empty, height=300, key_suffix="empty_dashboard_lottie")
              st.markdown("<div style='text-align:center; margin-top:1rem;'><h3>No Tools Found</h3><p>Get started by adding tools using the '➕ Add Tools' page!</p></div>", unsafe_allow_html=True)
     else:
         # Metric Cards Grid
         st.markdown('<div class="metric-card-grid">', unsafe_allow_html=True)
-        st.markdown(f'<div class="metric-card"><div class="metric-number">{len(df_dashboard_data)}</div><div class="metric-label">Total AI Tools</div></div>', unsafe_allow_html=True)
-        st.markdown(f'<div class="metric-card"><div class="metric-number">{df_dashboard_data["Category"].nunique()}</div><div class="metric-label">Unique Categories</div></div>', unsafe_allow_html=True)
-        recent_uploads = len(df_dashboard_data[df_dashboard_data['Date_Time'] >= (datetime.datetime.now() - datetime.timedelta(days=7))])
+        st.markdown(f'<div class="metric-card"><div class="metric-number">{total_tools}</div><div class="metric-label">Total AI Tools</div></div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="metric-card"><div class="metric-number">{unique_categories}</div><div class="metric-label">Unique Categories</div></div>', unsafe_allow_html=True)
+        recent_uploads = stats.added_since(7)
         st.markdown(f'<div class="metric-card"><div class="metric-number">{recent_uploads}</div><div class="metric-label">Added This Week</div></div>', unsafe_allow_html=True)
-        st.markdown(f'<div class="metric-card"><div class="metric-number">{df_dashboard_data["Uploaded_By"].nunique()}</div><div class="metric-label">Contributors</div></div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="metric-card"><div class="metric-number">{stats.contributors()}</div><div class="metric-label">Contributors</div></div>', unsafe_allow_html=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
         # Charts Section
@@ -344,63 +368,152 @@ if page == "🏠 Dashboard":
         with chart_cols[0]:
             st.markdown('<div class="content-container">', unsafe_allow_html=True)
             st.subheader("📊 Tools by Category")
-            category_counts = df_dashboard_data['Category'].value_counts()
-            fig_pie = px.pie(values=category_counts.values, names=category_counts.index, hole=0.4, 
-                             color_discrete_sequence=px.colors.qualitative.Pastel) # Example color sequence
-            fig_pie.update_traces(textposition='inside', textinfo='percent+label', marker=dict(line=dict(color='#FFFFFF', width=1)))
-            fig_pie.update_layout(showlegend=True, height=350, font=dict(family="Poppins", size=11), 
-                                  paper_bgcolor='rgba(0,0,0,0)', 
-                                  legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
-            st.plotly_chart(fig_pie, use_container_width=True)
+            with profile.phase("chart_pie"):
+                fig_pie = cached_figure("category_pie", data_version, lambda: category_pie(stats.category_counts()))
+                st.plotly_chart(fig_pie, use_container_width=True)
+            profile.size("chart_pie_json", lambda: len(fig_pie.to_json()))
             st.markdown('</div>', unsafe_allow_html=True)
         with chart_cols[1]:
             st.markdown('<div class="content-container">', unsafe_allow_html=True)
             st.subheader("📈 Tools Added Over Time")
-            df_time = df_dashboard_data.copy()
-            df_time['Date'] = pd.to_datetime(df_time['Date_Time']).dt.date
-            daily_counts = df_time.groupby('Date').size().reset_index(name='Count')
-            daily_counts['Cumulative'] = daily_counts['Count'].cumsum()
-            fig_line = px.line(daily_counts, x='Date', y='Cumulative', markers=True, color_discrete_sequence=['#764ba2']) # Using a partner color
-            fig_line.update_traces(line=dict(width=2.5), marker=dict(size=6))
-            fig_line.update_layout(height=350, font=dict(family="Poppins", size=11), 
-                                   paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', 
-                                   xaxis=dict(gridcolor='rgba(0,0,0,0.05)'), yaxis=dict(gridcolor='rgba(0,0,0,0.05)'))
-            st.plotly_chart(fig_line, use_container_width=True)
+            days = sorted(day for day, n in stats.per_day.items() if n)
+            first_day = datetime.date.fromisoformat(days[0]) if days else datetime.date.today()
+            last_day = datetime.date.fromisoformat(days[-1]) if days else datetime.date.today()
+            timeline_cols = st.columns([2, 3])
+            breakdown = timeline_cols[0].selectbox("Show", list(TIMELINE_BREAKDOWNS), key="timeline_by",
+                                                   label_visibility="collapsed")
+            date_range = timeline_cols[1].date_input("Date range", value=(first_day, last_day), min_value=first_day,
+                                                     max_value=max(last_day, datetime.date.today()),
+                                                     key="timeline_range", label_visibility="collapsed")
+            start, end = date_range if len(date_range) == 2 else (first_day, last_day) # Mid-selection: whole history
+            # Rolled up from the per-day counts into days, weeks, months, ... by the range's length,
+            # so long ranges plot as few points as short ones
+            with profile.phase("chart_line"):
+                by = TIMELINE_BREAKDOWNS[breakdown]
+                buckets, bucket = timeline(stats, by, start, end)
+                fig_line = cached_figure("timeline", (data_version, by, start, end),
+                                         lambda: cumulative_line(buckets) if by is None
+                                         else stacked_bars(buckets, breakdown.replace("By ", "")))
+                st.plotly_chart(fig_line, use_container_width=True)
+            st.caption(f"One point per {bucket}.")
+            profile.size("chart_line_json", lambda: len(fig_line.to_json()))
             st.markdown('</div>', unsafe_allow_html=True)
         st.markdown('</div>', unsafe_allow_html=True) # Closes chart-cols-container
 
-        # Recent Activity Table
+        # Top Domains (registrable domain of each Tool_Link, parsed once per data version)
         st.markdown('<div class="content-container">', unsafe_allow_html=True)
-        st.subheader("🕒 Recent Activity (Top 10)")
-        recent_df = df_dashboard_data.head(10).copy() # .copy() is good practice
-        recent_df['Date_Time'] = pd.to_datetime(recent_df['Date_Time']).dt.strftime('%b %d, %Y %H:%M')
-        display_df = recent_df.rename(columns={
-            'Serial_Number': 'S.No', 'Name': 'Tool Name', 'Tool_Link': 'Link', 
-            'Uploaded_By': 'Added By', 'Date_Time': 'Timestamp', 'Purpose': 'Purpose/Usage'
-        })
-        # Ensure only existing columns are selected for display
-        cols_to_display = ['S.No', 'Tool Name', 'Link', 'Category', 'Added By', 'Timestamp', 'Purpose/Usage']
-        existing_cols_for_display = [col for col in cols_to_display if col in display_df.columns]
-
-        st.dataframe(
-            display_df[existing_cols_for_display], 
-            use_container_width=True, 
-            hide_index=True,
-            column_config={
-                "S.No": st.column_config.NumberColumn(width="small", format="%d"), 
-                "Tool Name": st.column_config.TextColumn(width="medium"),
-                "Link": st.column_config.LinkColumn(display_text="Visit 🔗", width="small", help="Link to tool"),
-                "Category": st.column_config.TextColumn(width="small"), 
-                "Added By": st.column_config.TextColumn(width="small"),
-                "Timestamp": st.column_config.TextColumn(width="medium"), 
-                "Purpose/Usage": st.column_config.TextColumn(width="large"),
-            }
-        )
+        st.subheader("🌐 Top Domains")
+        contributor = st.selectbox("Added By", ["All contributors"] + sorted(c for c, n in stats.per_contributor.items() if n),
+                                   key="domain_contributor")
+        contributor = None if contributor == "All contributors" else contributor
+        with profile.phase("chart_domains"):
+            domains_df = domain_counts(contributor)
+            if domains_df.empty:
+                st.info("No tool links to group by domain yet.")
+            else:
+                fig_domains = cached_figure("domain_bar", (data_version, contributor), lambda: domain_bar(domains_df))
+                st.plotly_chart(fig_domains, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
+
+        # Recent Activity Table (or search results)
+        st.markdown('<div class="content-container">', unsafe_allow_html=True)
+        query = st.text_input("🔍 Search tools", placeholder="Search by name, purpose or category",
+                              key="dashboard_search", label_visibility="collapsed").strip()
+        if query:
+            with profile.phase("search"):
+                recent_df = search_entries(query) # Best 50 matches, ranked
+            st.subheader(f"🔍 Search Results ({len(recent_df)})")
+        else:
+            st.subheader("🕒 Recent Activity (Top 10)")
+        with profile.phase("recent_table"):
+            if not query:
+                recent_df = STORE.select(order_by='Date_Time', descending=True, limit=10) # Only the 10 rows shown
+            recent_df = dashboard_data.format_rows(recent_df)
+        display_tools_table(recent_df)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Link Health (results of the background checker; the page never waits for it)
+        with profile.phase("link_health"):
+            LINKS.refresh() # Starts a scan of unchecked/expired links unless one ran recently
+            dead_df = dead_link_entries()
+        with st.expander(f"🔗 Link Health ({len(LINKS.dead())} dead links)", expanded=False):
+            checked, queued = LINKS.progress()
+            if LINKS.running():
+                st.caption(f"Checking links in the background: {checked} of {queued} done.")
+            else:
+                st.caption(f"{len(LINKS.results())} links checked. Healthy links are re-checked daily, dead ones hourly.")
+            if dead_df.empty:
+                st.success("No dead links found so far.")
+            else:
+                st.dataframe(
+                    dead_df[['Name', 'Tool_Link', 'Link_Status', 'Uploaded_By']].rename(columns={
+                        'Name': 'Tool Name', 'Tool_Link': 'Link', 'Link_Status': 'Status', 'Uploaded_By': 'Added By'}),
+                    use_container_width=True, hide_index=True,
+                    column_config={"Link": st.column_config.LinkColumn(width="medium")},
+                )
+            if st.button("🔄 Re-check links now", key="link_health_refresh", disabled=LINKS.running()):
+                LINKS.refresh(force=True)
+                st.rerun()
     st.markdown('</div>', unsafe_allow_html=True) # Closes page-container for Dashboard
 
 
-elif page == "➕ Add Tools":
+EXPLORER_SORTS = {"Date Added": 'Date_Time', "Tool Name": 'Name', "Category": 'Category',
+                  "Added By": 'Uploaded_By', "S.No": 'Serial_Number'}
+
+def set_explorer_page(page):
+    st.session_state.explorer_page = page
+
+def render_explorer_page(profile):
+    st.markdown('<div class="page-container">', unsafe_allow_html=True)
+    st.markdown('<div class="content-container">', unsafe_allow_html=True)
+    st.subheader("📋 Explore All Tools")
+
+    filter_cols = st.columns([2,2,2])
+    with filter_cols[0]:
+        categories = st.multiselect("Category 📂", TOOL_CATEGORIES[1:], key="explorer_categories")
+    with filter_cols[1]:
+        contributors = st.multiselect("Added By 👤", UPLOADER_NAMES[1:], key="explorer_contributors")
+    with filter_cols[2]:
+        dates = st.date_input("Date Range 📅", value=(), key="explorer_dates", format="YYYY-MM-DD")
+    sort_cols = st.columns([2,2,2])
+    with sort_cols[0]:
+        sort_label = st.selectbox("Sort By", list(EXPLORER_SORTS), key="explorer_sort")
+    with sort_cols[1]:
+        descending = st.radio("Order", ["Descending", "Ascending"], horizontal=True, key="explorer_order") == "Descending"
+    with sort_cols[2]:
+        page_size = st.selectbox("Rows Per Page", [25, 50, 100], index=1, key="explorer_page_size")
+
+    # A half-picked range (start only) filters from that day on
+    start, end = (tuple(dates) + (None, None))[:2]
+    filters = dashboard_data.explorer_filters(categories, contributors, start, end)
+    query_key = (repr(filters), sort_label, descending, page_size)
+    if st.session_state.get("explorer_query") != query_key: # New query: back to the first page
+        st.session_state.explorer_query = query_key
+        st.session_state.explorer_page = 0
+
+    with profile.phase("explorer_page"):
+        result = fetch_page(filters, EXPLORER_SORTS[sort_label], descending, st.session_state.explorer_page, page_size)
+    st.session_state.explorer_page = result.page
+    display_tools_table(result.rows)
+
+    # Callbacks move the page before the next run fetches it
+    nav_cols = st.columns([1,3,1])
+    with nav_cols[0]:
+        st.button("⬅️ Previous", key="explorer_prev", disabled=result.page == 0,
+                  on_click=set_explorer_page, args=(result.page - 1,), use_container_width=True)
+    with nav_cols[1]:
+        first = result.page * page_size + 1 if result.total else 0
+        last = min((result.page + 1) * page_size, result.total)
+        st.markdown(f"<p style='text-align:center; margin-top:0.5rem;'>Page {result.page + 1} of {result.page_count} · "
+                    f"{first}–{last} of {result.total} tools</p>", unsafe_allow_html=True)
+    with nav_cols[2]:
+        st.button("Next ➡️", key="explorer_next", disabled=result.page + 1 >= result.page_count,
+                  on_click=set_explorer_page, args=(result.page + 1,), use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True) # Closes page-container for Explore
+
+
+def render_add_tools_page(profile):
     st.markdown('<div class="page-container">', unsafe_allow_html=True)
     
     header_cols = st.columns([3,1]) # Column for header text and Lottie
@@ -410,7 +523,7 @@ elif page == "➕ Add Tools":
                         <p style="font-size:1rem; opacity:0.85;">Expand our AI toolkit for the marketing team.</p>
                      </div>""", unsafe_allow_html=True)
     with header_cols[1]:
-        lottie_add = load_lottie_url("https://assets2.lottiefiles.com/packages/lf20_DMgKk1.json")
+        lottie_add = ASSETS.load_named("add_tool") # Falls back to the bundled success animation
         if lottie_add: display_lottie(lottie_add, height=150, key_suffix="add_tool_page_icon")
 
     form_cols = st.columns([2,1]) # Columns for form and tips/recent
@@ -432,17 +545,44 @@ elif page == "➕ Add Tools":
                 errors = validate_inputs(name, tool_link, category, uploaded_by, purpose)
                 if errors:
                     for error in errors: st.error(f"⚠️ {error}")
+                elif find_duplicates(name, tool_link):
+                    # The form clears on submit, so the entry waits in the session until it's confirmed
+                    st.session_state.pending_entry = (name, tool_link, category, uploaded_by, purpose)
                 else:
-                    with st.spinner("Adding tool to database..."):
-                        time.sleep(0.5) 
-                        if add_entry(name, tool_link, category, uploaded_by, purpose):
-                            st.success("🎉 Tool added successfully!")
-                            st.balloons()
-                            time.sleep(1.5) 
-                            st.rerun() # Rerun to clear form and update any views
-                        else: 
-                            st.error("❌ Failed to add tool. Please check logs or try again.")
+                    submit_entry(name, tool_link, category, uploaded_by, purpose)
         st.markdown('</div>', unsafe_allow_html=True) # Closes content-container for form
+
+        # Duplicate Warning (checked again on every rerun, so it reflects entries added meanwhile)
+        pending = st.session_state.get("pending_entry")
+        if pending:
+            duplicates = find_duplicates(pending[0], pending[1])
+            reasons = {"name": "same name", "url": "same link", "similar": "similar name"}
+            st.warning(f"⚠️ **{pending[0]}** looks like a tool that is already in the database:\n\n" + "\n".join(
+                f"- **{match.name}** {match.url} ({reasons[match.reason]})" for match in duplicates
+            ))
+            confirm_cols = st.columns(2)
+            if confirm_cols[0].button("➕ Add Anyway", key="pending_entry_add", use_container_width=True):
+                del st.session_state.pending_entry
+                submit_entry(*pending)
+            if confirm_cols[1].button("✖️ Discard", key="pending_entry_discard", use_container_width=True):
+                del st.session_state.pending_entry
+                st.rerun()
+
+        # Bulk Import
+        with st.expander("📤 Bulk Import from CSV"):
+            st.caption(f"Columns: {', '.join(REQUIRED_COLUMNS)} (optional Date_Time). "
+                       "Rows are checked like the form; invalid rows are skipped and listed in an error report.")
+            uploaded_file = st.file_uploader("CSV file", type=["csv"], key="bulk_import_file")
+            if uploaded_file is not None and st.button("Import Tools", key="bulk_import_button"):
+                with st.spinner("Importing tools..."):
+                    st.session_state.bulk_import_report = bulk_import(uploaded_file)
+            report = st.session_state.get("bulk_import_report")
+            if report:
+                st.success(f"Imported {report.accepted} tools.")
+                if report.rejected:
+                    st.warning(f"{report.rejected} rows were rejected.")
+                    st.download_button("📥 Download Error Report", data=Path(report.error_report).read_bytes,
+                                       file_name="import_errors.csv", mime="text/csv", key="bulk_import_errors")
     
     with form_cols[1]:
         # Tips Section
@@ -459,12 +599,13 @@ elif page == "➕ Add Tools":
         </div>""", unsafe_allow_html=True)
         
         # Recent Additions Preview
-        df_add_page_recent = load_data()
+        with profile.phase("recent_preview"):
+            df_add_page_recent = STORE.select(order_by='Date_Time', descending=True, limit=3)
         if not df_add_page_recent.empty:
             st.markdown('<div class="content-container" style="margin-top:1.5rem;">', unsafe_allow_html=True)
             st.markdown("<h5 style='margin-bottom:0.7rem;'>📋 Recently Added (Top 3)</h5>", unsafe_allow_html=True)
             recent_display_cols = ['Name', 'Category', 'Uploaded_By']
-            recent_display = df_add_page_recent.head(3)[recent_display_cols].rename(
+            recent_display = df_add_page_recent[recent_display_cols].rename(
                 columns={'Name':'Tool', 'Category':'Type', 'Uploaded_By':'By'}
             )
             st.dataframe(recent_display, use_container_width=True, hide_index=True, height=130) 
@@ -473,10 +614,43 @@ elif page == "➕ Add Tools":
     st.markdown('</div>', unsafe_allow_html=True) # Closes page-container for Add Tools
 
 # --- Footer ---
-st.markdown("<hr style='margin: 2rem 0; border-color: rgba(0,0,0,0.1);'>", unsafe_allow_html=True) # A bit more styled hr
-st.markdown("""
+def render_footer():
+    st.markdown("<hr style='margin: 2rem 0; border-color: rgba(0,0,0,0.1);'>", unsafe_allow_html=True) # A bit more styled hr
+    st.markdown("""
 <div class="footer">
     <h4>🤖 AI Tools Dashboard</h4>
     <p>Empowering Marketing Teams with AI Innovation</p>
     <p style="opacity: 0.7;">Streamlit App | Enhanced Version</p>
 </div>""", unsafe_allow_html=True)
+
+# --- Main Application Flow ---
+def main():
+    st.set_page_config(**PAGE_CONFIG)
+    # Render profiling (AI_TOOLS_PROFILE=1 or ?profile=1); a no-op stand-in when off
+    profile = start_run("dashboard", force=st.query_params.get("profile") == "1")
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    init_session_state()
+
+    with profile.phase("initialize_csv"):
+        initialize_csv()
+    # Writes by other replicas refresh this process' cached frame once per change, off the render
+    # path; the dashboard frame derived from it is rebuilt by the next render that needs it
+    watch(STORE)
+    with profile.phase("assets"):
+        ASSETS.prefetch() # Loads every known animation once per process, fetching URLs in the background
+    page = display_navbar()
+
+    if page == "🏠 Dashboard":
+        render_dashboard_page(profile)
+    elif page == "📋 Explore":
+        render_explorer_page(profile)
+    elif page == "➕ Add Tools":
+        render_add_tools_page(profile)
+
+    render_footer()
+    # Debug sidebar and JSON-lines log entry for this run (only when profiling is on)
+    render_sidebar(profile)
+
+
+if __name__ == "__main__":
+    main()
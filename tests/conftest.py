@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from core import dashboard_data
+from core.storage import BACKEND_ENV
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def open_catalog(request, tmp_path, monkeypatch):
+    # Opens dashboard stores on one catalog in tmp_path, on each backend in turn
+    monkeypatch.setenv(BACKEND_ENV, request.param)
+
+    def open_catalog():
+        store = dashboard_data.open_dashboard_store(open_catalog.path)
+        dashboard_data.initialize_csv(store)
+        return store
+    open_catalog.path = os.path.join(tmp_path, "catalog.csv") # What another process opens
+    return open_catalog
+
+
+def entry(name, category="Analytics", uploaded_by="Rayna", date_time=None):
+    return dashboard_data.new_entry(name, f"https://{name.lower()}.example.com", category, uploaded_by,
+                                    "Test entry", now=date_time)
@@ -0,0 +1,20 @@
+import os
+
+from core import dashboard_data
+from core.aggregates import CatalogStats
+from core.cache import CACHE
+from tests.conftest import entry
+
+
+def test_inserts_are_logged_and_replayed(open_catalog):
+    store = open_catalog()
+    stats = dashboard_data.open_stats(store)
+    stats.get()
+    saved = os.stat(stats.path).st_mtime_ns
+    for i in range(5):
+        dashboard_data.add_entry(store, stats, f"Tool {i}", "", "Research", "Sneha", "Test entry")
+    assert os.stat(stats.path).st_mtime_ns == saved # Inserts only append to the log
+
+    CACHE.invalidate(store.path) # As another process would load them
+    rebuilt = CatalogStats.from_frame(store.frame(), 'Category', 'Uploaded_By', 'Date_Time')
+    assert stats.get().to_dict() == rebuilt.to_dict()
@@ -0,0 +1,52 @@
+import os
+
+import pandas as pd
+import pytest
+
+from core import app_data
+from core.storage import BACKEND_ENV
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_search_positions_stay_within_the_frame(backend, tmp_path, monkeypatch):
+    monkeypatch.setenv(BACKEND_ENV, backend)
+    store = app_data.open_tool_store(os.path.join(tmp_path, "ai_tools.csv"))
+    search = app_data.open_search(store)
+    app_data.upsert_tool(store, "Image Maker", "https://a.example.com", "Image Generation", search)
+    df = app_data.load_data(store)
+    app_data.upsert_tool(store, "Image Fixer", "https://b.example.com", "Image Editing", search) # After df was read
+    assert len(app_data.search_positions(search, "image")) == 2
+    assert app_data.search_positions(search, "image", rows=len(df)) == [0]
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_upsert_updates_in_place(backend, tmp_path, monkeypatch):
+    monkeypatch.setenv(BACKEND_ENV, backend)
+    path = os.path.join(tmp_path, "ai_tools.csv")
+    store = app_data.open_tool_store(path)
+    store.upsert("name", {"name": "A", "website": "https://a.example.com", "categories": "Art"})
+    store.upsert("name", {"name": "B", "website": "https://b.example.com", "categories": "Video"})
+    store.frame() # Cached; the update below is read on its own
+    data_file = os.stat(store.path).st_ino
+    result = store.upsert("name", {"name": "A", "website": "https://a.example.org", "categories": "Art"})
+    assert (result.updated, result.position) == (True, 0)
+    if backend == "csv":
+        assert os.stat(store.path).st_ino == data_file # Not rewritten
+    expected = [["A", "https://a.example.org", "Art"], ["B", "https://b.example.com", "Video"]]
+    assert store.frame().values.tolist() == expected
+    assert app_data.open_tool_store(path).read().values.tolist() == expected
+    store.compact()
+    assert store.read().values.tolist() == expected
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_history_starts_with_the_log(backend, tmp_path, monkeypatch):
+    monkeypatch.setenv(BACKEND_ENV, backend)
+    store = app_data.open_tool_store(os.path.join(tmp_path, "ai_tools.csv"))
+    store.write(pd.DataFrame([["Old", "https://old.example.com", "Art"]], columns=app_data.COLUMNS))
+    yesterday = pd.Timestamp.now().date() - pd.Timedelta(days=1)
+    assert app_data.catalog_as_of(store, yesterday).empty # The rows carry no date, and the log starts today
+    store.upsert("name", {"name": "New", "website": "https://new.example.com", "categories": "Video"})
+    assert app_data.history_start(store) == pd.Timestamp.now().date()
+    assert app_data.catalog_as_of(store, yesterday).empty
+    assert app_data.catalog_as_of(store, pd.Timestamp.now().date())["name"].tolist() == ["Old", "New"]
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+import requests
+
+from core.assets import LOTTIE_URLS, OFFLINE_ENV, AssetManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    # Every request fails like an unreachable host; returns the list of requested URLs
+    urls = []
+
+    def refuse(url, **kwargs):
+        urls.append(url)
+        raise requests.exceptions.ConnectionError("network is disabled")
+    monkeypatch.chdir(ROOT) # Bundled fallbacks are relative to the repo
+    monkeypatch.delenv(OFFLINE_ENV, raising=False)
+    monkeypatch.setattr(requests, "get", refuse)
+    return urls
+
+
+def test_failed_fetch_falls_back_and_is_not_retried(tmp_path, fetches):
+    manager = AssetManager(cache_dir=str(tmp_path))
+    url, fallback = LOTTIE_URLS["add_tool"]
+    for _ in range(3):
+        assert manager.load_url(url, fallback) == manager.load_file(fallback)
+    assert fetches == [url]
+
+
+def test_disk_cache_serves_a_new_process_without_the_network(tmp_path, fetches):
+    url, fallback = LOTTIE_URLS["add_tool"]
+    with open(fallback, "rb") as f:
+        AssetManager(cache_dir=str(tmp_path))._write_cached(url, f.read()) # As an earlier online run would
+    fresh = AssetManager(cache_dir=str(tmp_path))
+    assert fresh.load_url(url) == fresh.load_file(fallback)
+    assert fetches == []
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from core.category_index import CategoryIndex
+
+CATEGORIES = pd.Series(["Marketing|SEO", "SEO", None, "Analytics|Marketing", ""])
+
+
+def test_mask_matches_posting_sets():
+    index = CategoryIndex.build(CATEGORIES)
+    for selected in (["Marketing"], ["Marketing", "SEO"], ["SEO", "Missing"], []):
+        for match in ("any", "all"):
+            expected = sorted(index.rows(selected, match)) if selected else list(range(len(index)))
+            assert np.flatnonzero(index.mask(selected, match)).tolist() == expected
+
+
+def test_set_row_keeps_matrix_current():
+    index = CategoryIndex.build(CATEGORIES)
+    index.matrix()
+    for position, categories in [(5, "Video"), (1, "Marketing"), (6, "SEO|Video"), (0, "")]:
+        index.set_row(position, categories)
+    rebuilt = CategoryIndex.build(pd.Series([row and "|".join(row) for row in index.row_categories]))
+    for selected in (["Marketing"], ["SEO", "Video"], ["Video"]):
+        for match in ("any", "all"):
+            assert index.mask(selected, match).tolist() == rebuilt.mask(selected, match).tolist()
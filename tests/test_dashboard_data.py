@@ -0,0 +1,25 @@
+import datetime
+
+from core import dashboard_data
+from tests.conftest import entry
+
+
+def test_timeline_views_agree(open_catalog):
+    # Total, by-category and by-contributor views put every row in the same bucket
+    store = open_catalog()
+    stats = dashboard_data.open_stats(store)
+    stats.get()
+    records = [entry("New", category="Research"),
+               entry("Old", uploaded_by="Sneha", date_time=datetime.datetime(2024, 1, 5)), # e.g. bulk imported
+               entry("Older", uploaded_by="Sneha", date_time=datetime.datetime(2023, 3, 9))]
+    for record in records:
+        stats.record(store.append(record))
+    stats = stats.get()
+    total, bucket = dashboard_data.timeline(stats)
+    assert total['Cumulative'].iloc[-1] == len(records)
+    assert total['Date'].iloc[0] <= datetime.date(2023, 3, 9) < total['Date'].iloc[1]
+    for by in ('category', 'contributor'):
+        grouped, grouped_bucket = dashboard_data.timeline(stats, by)
+        assert grouped_bucket == bucket
+        assert grouped['Date'].tolist() == total['Date'].tolist()
+        assert grouped.drop(columns='Date').sum(axis=1).tolist() == total['Count'].tolist()
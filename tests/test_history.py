@@ -0,0 +1,38 @@
+import datetime
+import os
+import time
+
+from core import history
+from tests.conftest import entry
+
+
+def test_as_of_and_restore(open_catalog):
+    store = open_catalog()
+    store.append(entry("First"))
+    time.sleep(1.1) # The log keeps whole seconds
+    moment = datetime.datetime.now()
+    time.sleep(1.1)
+    store.append(entry("Second"))
+    assert store.history.as_of(moment)['Name'].tolist() == ["First"]
+    assert sorted(store.history.as_of()['Name']) == ["First", "Second"]
+
+
+def test_as_of_replays_through_thinned_snapshots(open_catalog, monkeypatch):
+    monkeypatch.setattr(history, "KEEP_SNAPSHOTS", 2)
+    monkeypatch.setattr(history, "THIN_EVERY", 3)
+    store = open_catalog()
+    store.history.snapshot_every = 1 # A snapshot after every write
+    for i in range(5):
+        store.append(entry(f"Early {i}"))
+    time.sleep(1.1)
+    moment = datetime.datetime.now()
+    time.sleep(1.1)
+    for i in range(6):
+        store.append(entry(f"Late {i}"))
+    snapshots = store.history._manifest()
+    kept = [s["seq"] for s in snapshots if not s.get("thinned")]
+    assert snapshots[5]["thinned"] # The last one taken by `moment`
+    assert sorted(os.listdir(store.history.directory)) == sorted(
+        [f"{seq:012d}.csv" for seq in kept] + [f"{s['seq']:012d}.log" for s in snapshots[:-1]] + ["snapshots.json"])
+    assert sorted(store.history.as_of(moment)['Name']) == [f"Early {i}" for i in range(5)]
+    assert sorted(store.history.as_of()['Name']) == sorted(store.read()['Name'])
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+from core.notify import ChangeWatcher
+from tests.conftest import entry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WRITER = """
+import sys
+from core import dashboard_data
+from tests.conftest import entry
+dashboard_data.open_dashboard_store(sys.argv[1]).append(entry(sys.argv[2]))
+"""
+
+
+def append_elsewhere(path, name):
+    # One row appended by a separate process (the backend comes from the inherited environment)
+    subprocess.run([sys.executable, "-c", WRITER, path, name], cwd=ROOT, check=True)
+
+
+def test_replica_sees_rows_appended_by_another_process(open_catalog):
+    store = open_catalog()
+    store.append(entry("Local"))
+    watcher, changes = ChangeWatcher(store), []
+    watcher.subscribe("test", lambda before, after: changes.append(after))
+    watcher.poll() # Initial load
+    assert not watcher.poll()
+
+    append_elsewhere(open_catalog.path, "Remote")
+    assert watcher.poll()
+    assert changes[-1] == store.version()
+    assert sorted(store.frame()['Name']) == ["Local", "Remote"]
+    assert not watcher.poll()
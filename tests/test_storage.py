@@ -0,0 +1,13 @@
+from tests.conftest import entry
+
+
+def test_sort_by_category_after_incremental_refresh(open_catalog):
+    store = open_catalog()
+    store.append(entry("A", category="Research"))
+    store.append(entry("B", category="Analytics"))
+    store.frame() # Cached; the next append is read from the tail
+    store.append(entry("C", category="Chatbots"))
+    ascending = store.select(order_by='Category')['Category'].tolist()
+    descending = store.select(order_by='Category', descending=True)['Category'].tolist()
+    assert ascending == ["Analytics", "Chatbots", "Research"]
+    assert descending == ["Research", "Chatbots", "Analytics"]
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from core.urls import PARTS, UrlParts, canonical_urls, split_urls
+
+URLS = pd.Series(["https://www.OpenAI.com/chat/", "platform.openai.com", None, "http://user@bbc.co.uk:8080/news?x=1",
+                  "https://x.github.io/proj", "10.0.0.1/a", ""])
+
+
+def test_split_urls():
+    parts = split_urls(URLS)
+    assert parts['domain'].tolist() == ["openai.com", "openai.com", "", "bbc.co.uk", "x.github.io", "10.0.0.1", ""]
+    assert parts['scheme'].tolist() == ["https", "", "", "http", "https", "", ""]
+    assert parts['canonical'].tolist() == canonical_urls(URLS).fillna("").tolist()
+
+
+def test_incremental_build_matches_full_build():
+    more = pd.concat([URLS, pd.Series(["https://chat.openai.com", "https://new.example.org/x"])], ignore_index=True)
+    incremental = UrlParts.build(more, UrlParts.build(URLS))
+    full = split_urls(more)
+    for part in PARTS:
+        assert incremental.columns[part].astype(str).tolist() == full[part].tolist()
@@ -0,0 +1,36 @@
+import multiprocessing
+import os
+
+from core import app_data, dashboard_data
+from tests.conftest import entry
+
+WRITERS = 4
+ROWS = 10
+
+
+def write_rows(path, app_path, writer_id):
+    # One writer process: appends dashboard rows and upserts app tools, interleaved
+    dashboard = dashboard_data.open_dashboard_store(path)
+    app = app_data.open_tool_store(app_path)
+    for i in range(ROWS):
+        dashboard.append(entry(f"w{writer_id}-{i}"))
+        app.upsert("name", {"name": f"w{writer_id}-{i}", "website": "https://example.com", "categories": "A|B"})
+
+
+def test_concurrent_writers_lose_no_rows(open_catalog):
+    store = open_catalog()
+    app_path = os.path.join(os.path.dirname(open_catalog.path), "tools.csv")
+    app_data.open_tool_store(app_path).initialize()
+    ctx = multiprocessing.get_context("spawn") # Children inherit the backend from the environment
+    procs = [ctx.Process(target=write_rows, args=(open_catalog.path, app_path, w)) for w in range(WRITERS)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(120)
+    assert [p.exitcode for p in procs] == [0] * WRITERS
+
+    rows = store.read()
+    assert len(rows) == WRITERS * ROWS
+    assert rows['Serial_Number'].is_unique
+    assert sorted(rows['Name']) == sorted(f"w{w}-{i}" for w in range(WRITERS) for i in range(ROWS))
+    assert len(app_data.open_tool_store(app_path).read()) == WRITERS * ROWS